@@ -0,0 +1,74 @@
+"""
+Memory held per agent by dicts, Agent dataclasses and the compact AgentStore, measured with tracemalloc.
+
+Usage:
+    python benchmarks/bench_compact.py [number_of_agents]
+"""
+import gc
+import json
+import sys
+import tracemalloc
+
+from bench_projection import make_agent, page
+
+from wazuh_api_client.compact import AgentStore
+from wazuh_api_client.enums import AgentStatus, GroupConfigStatus
+from wazuh_api_client.managers.agents import OS, Agent
+
+
+def as_dicts(items: list) -> list:
+    return items
+
+
+def as_dataclasses(items: list) -> list:
+    return [
+        Agent(
+            **{
+                **item,
+                "os": OS(**item["os"]),
+                "status": AgentStatus(item["status"]),
+                "group_config_status": GroupConfigStatus(item["group_config_status"]),
+            }
+        )
+        for item in items
+    ]
+
+
+def as_store(items: list) -> AgentStore:
+    store = AgentStore()
+    store.extend(items)
+    return store
+
+
+def retained(build, payload: bytes) -> int:
+    """
+    Bytes still allocated once `build` turned the decoded page into its representation.
+    """
+    gc.collect()
+    tracemalloc.start()
+    items = json.loads(payload)["data"]["affected_items"]
+    result = build(items)
+    if result is not items:
+        del items
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    payload = page([make_agent(i) for i in range(count)])
+    print(f"agents: {count}")
+    for name, build in (
+        ("dicts", as_dicts),
+        ("Agent dataclasses", as_dataclasses),
+        ("AgentStore", as_store),
+    ):
+        size = retained(build, payload)
+        print(f"{name:>18}: {size / 1e6:8.1f} MB   {size / count:6.0f} bytes/agent")
+
+
+if __name__ == "__main__":
+    main()
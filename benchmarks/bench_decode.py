@@ -0,0 +1,82 @@
+"""
+Event loop lag while the client decodes large listings, with and without DecodeOffload.
+
+A ticker coroutine sleeping 1 ms measures how late the loop wakes it up while an
+AsyncWazuhClient fetches (from an in-memory transport) and decodes a page of agents.
+
+Usage:
+    python benchmarks/bench_decode.py [number_of_agents] [rounds]
+"""
+import asyncio
+import statistics
+import sys
+import time
+
+import httpx
+from bench_projection import make_agent, page
+
+from wazuh_api_client import AsyncWazuhClient
+from wazuh_api_client.decoding import DecodeOffload
+from wazuh_api_client.managers import AgentsManager
+
+TICK = 0.001
+
+
+async def ticker(lags: list, stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(TICK)
+        lags.append(time.perf_counter() - started - TICK)
+
+
+async def run(body: bytes, offload, rounds: int) -> tuple[float, list]:
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, content=body))
+    client = AsyncWazuhClient("https://manager:55000", "4", "u", "p", decode_offload=offload)
+    client.client = httpx.AsyncClient(base_url=client.base_url, transport=transport)
+    client.authenticated = True
+    agents_manager = AgentsManager(client)
+    await agents_manager.list(limit=10)  # warm up, e.g. the process pool
+
+    lags: list = []
+    stop = asyncio.Event()
+    task = asyncio.ensure_future(ticker(lags, stop))
+    await asyncio.sleep(0.05)
+    lags.clear()
+    started = time.perf_counter()
+    for _ in range(rounds):
+        await agents_manager.list(limit=100000)
+        await asyncio.sleep(0.01)  # let the ticker record the stall
+    elapsed = (time.perf_counter() - started) / rounds - 0.01
+    stop.set()
+    await task
+    await client.close()
+    return elapsed, lags
+
+
+async def main(agents: int, rounds: int) -> None:
+    body = page([make_agent(i) for i in range(agents)])
+    print(f"{agents} agents, {len(body) / 1e6:.1f} MB per page, {rounds} rounds")
+    print(f"{'mode':<10}{'per page':>12}{'max lag':>12}{'p99 lag':>12}{'mean lag':>12}")
+    for name, offload in (
+        ("inline", None),
+        ("thread", DecodeOffload(threshold=1_000_000, executor="thread")),
+        ("process", DecodeOffload(threshold=1_000_000, executor="process")),
+    ):
+        elapsed, lags = await run(body, offload, rounds)
+        if offload is not None:
+            offload.close()
+        lags.sort()
+        p99 = lags[int(len(lags) * 0.99)] if lags else 0.0
+        print(
+            f"{name:<10}{elapsed * 1000:>10.0f}ms{max(lags) * 1000:>10.1f}ms"
+            f"{p99 * 1000:>10.1f}ms{statistics.mean(lags) * 1000:>10.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(
+        main(
+            int(sys.argv[1]) if len(sys.argv) > 1 else 100000,
+            int(sys.argv[2]) if len(sys.argv) > 2 else 3,
+        )
+    )
@@ -0,0 +1,102 @@
+"""
+Payload and decode cost of full agents listings versus projected ones.
+
+Usage:
+    python benchmarks/bench_projection.py [number_of_agents]
+"""
+import json
+import sys
+import time
+
+from wazuh_api_client.managers.agents import OS, Agent, AgentProjection
+
+FIELDS = ["id", "name", "status", "os.platform"]
+
+
+def make_agent(i: int) -> dict:
+    return {
+        "os": {
+            "arch": "x86_64",
+            "minor": "04",
+            "codename": "Jammy Jellyfish",
+            "version": "22.04.3 LTS",
+            "platform": "ubuntu",
+            "uname": f"Linux |host-{i:06}.corp.example.com |5.15.0-91-generic |#101-Ubuntu SMP Tue Nov 14 13:30:08 UTC 2023 |x86_64",
+            "name": "Ubuntu",
+            "major": "22",
+        },
+        "group_config_status": "synced",
+        "lastKeepAlive": "2024-01-12T10:31:08+00:00",
+        "dateAdd": "2023-06-01T08:00:00+00:00",
+        "node_name": "worker-02",
+        "manager": "wazuh-manager-worker-02",
+        "registerIp": "any",
+        "ip": f"10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}",
+        "mergedSum": "9a016508cea1e997ab8569f5cfab30f5",
+        "group": ["default", "linux-servers"],
+        "configSum": "ab73af41699f13fdd81903b5f23d8d00",
+        "status": "active",
+        "name": f"host-{i:06}",
+        "id": f"{i:05}",
+        "version": "Wazuh v4.7.2",
+    }
+
+
+def project(agent: dict) -> dict:
+    return {
+        "id": agent["id"],
+        "name": agent["name"],
+        "status": agent["status"],
+        "os": {"platform": agent["os"]["platform"]},
+    }
+
+
+def page(items: list) -> bytes:
+    body = {
+        "message": "All selected agents information was returned",
+        "error": 0,
+        "data": {
+            "affected_items": items,
+            "total_affected_items": len(items),
+            "total_failed_items": 0,
+            "failed_items": [],
+        },
+    }
+    return json.dumps(body).encode()
+
+
+def decode_full(payload: bytes) -> list:
+    items = json.loads(payload)["data"]["affected_items"]
+    return [Agent(**{**item, "os": OS(**item["os"])}) for item in items]
+
+
+def decode_projected(payload: bytes) -> list:
+    projection = AgentProjection(FIELDS)
+    items = json.loads(payload)["data"]["affected_items"]
+    return [projection.decode(item) for item in items]
+
+
+def best_of(func, payload: bytes, repeat: int = 5) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(payload)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    agents = [make_agent(i) for i in range(count)]
+    full = page(agents)
+    projected = page([project(agent) for agent in agents])
+
+    full_time = best_of(decode_full, full)
+    projected_time = best_of(decode_projected, projected)
+    print(f"agents: {count}, projected fields: {FIELDS}")
+    print(f"payload   full: {len(full) / 1e6:8.2f} MB   projected: {len(projected) / 1e6:8.2f} MB   ({len(projected) / len(full):.0%})")
+    print(f"decode    full: {full_time * 1e3:8.1f} ms   projected: {projected_time * 1e3:8.1f} ms   ({projected_time / full_time:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+import asyncio
+import contextlib
+import io
+import json
+from typing import Any, AsyncIterator
+
+import pytest
+
+from wazuh_api_client import AsyncWazuhClient
+from wazuh_api_client.aggregation import AgentsAggregator, AggregationPlan
+from wazuh_api_client.cassette import Cassette
+from wazuh_api_client.cli import Runner, build_parser
+from wazuh_api_client.enums import AgentStatus
+from wazuh_api_client.export import JsonlExporter, export_agents
+from wazuh_api_client.managers import AgentsManager
+from wazuh_api_client.managers.lists import ListsManager
+from wazuh_api_client.managers.wazuh import WazuhManager
+from wazuh_api_client.restart import RestartWave, RollingRestart
+from wazuh_api_client.simulator import Simulator, SimulatorConfig
+from wazuh_api_client.watcher import DisconnectWatcher
+
+
+@contextlib.asynccontextmanager
+async def simulated(**config: Any) -> AsyncIterator[tuple[Simulator, AsyncWazuhClient]]:
+    config = {"port": 0, "agents": 300, **config}
+    async with Simulator(SimulatorConfig(**config)) as simulator:
+        async with AsyncWazuhClient(simulator.url, "4", "wazuh", "wazuh") as client:
+            yield simulator, client
+
+
+def run(coroutine) -> Any:
+    return asyncio.run(coroutine)
+
+
+@pytest.mark.parametrize("size", [dict(wave_size=0), dict(min_wave_size=0)])
+def test_rolling_restart_rejects_empty_waves(size):
+    with pytest.raises(ValueError):
+        RollingRestart(None, **size)  # type: ignore[arg-type]
+
+
+def test_rolling_restart_never_restarts_without_agents():
+    async def scenario():
+        async with simulated() as (simulator, client):
+            before = {agent["id"]: agent.get("lastKeepAlive") for agent in simulator.fleet.agents}
+            with pytest.raises(ValueError):
+                await RollingRestart(client)._restart_wave(RestartWave(index=0, agents=[]))
+            await asyncio.sleep(0.1)
+            after = {agent["id"]: agent.get("lastKeepAlive") for agent in simulator.fleet.agents}
+            assert after == before
+
+    run(scenario())
+
+
+def test_rolling_restart_recovers_agents():
+    async def scenario():
+        async with simulated(restart_delay=0.05) as (simulator, client):
+            agents = [
+                agent["id"]
+                for agent in simulator.fleet.agents
+                if agent["status"] == "active" and agent["id"] != "000"
+            ][:20]
+            rolling_restart = RollingRestart(
+                client, wave_size=10, poll_interval=0.1, settle_timeout=5
+            )
+            waves = [wave async for wave in rolling_restart.run(agents)]
+            assert [len(wave.recovered) for wave in waves] == [10, 10]
+            assert not any(wave.failed for wave in waves)
+
+    run(scenario())
+
+
+def test_cli_syscheck_results_with_type():
+    out, err = io.StringIO(), io.StringIO()
+
+    async def scenario():
+        async with simulated(agents=5) as (simulator, client):
+            args = build_parser().parse_args(
+                ["--url", simulator.url, "--user", "wazuh", "--password", "wazuh"]
+                + ["syscheck", "results", "001", "--type", "file", "--select", "file"]
+            )
+            runner = Runner(client, out=out, err=err)
+            await args.handler(runner, args)
+            return runner.errors
+
+    assert run(scenario()) == 0
+    assert err.getvalue() == ""
+    assert len(out.getvalue().splitlines()) == 50
+
+
+def test_cassette_records_streamed_list_upload(tmp_path):
+    async def scenario():
+        cassette = Cassette(tmp_path / "lists.jsonl")
+        async with Simulator(SimulatorConfig(port=0, agents=5)) as simulator:
+            async with AsyncWazuhClient(
+                simulator.url, "4", "wazuh", "wazuh", transport=cassette.recorder()
+            ) as client:
+                lists_manager = ListsManager(client, cache_dir=tmp_path / "cache")
+                result = await lists_manager.sync("bad-ips", {"10.0.0.1": "c2", "10.0.0.2": ""})
+            assert simulator.fleet.lists["bad-ips"] == [("10.0.0.1", "c2"), ("10.0.0.2", "")]
+        return cassette, result
+
+    cassette, result = run(scenario())
+    assert result.uploaded and result.added == 2
+    uploads = [i for i in cassette.interactions if i.method == "PUT"]
+    assert [i.request_body for i in uploads] == ["10.0.0.1:c2\n10.0.0.2:\n"]
+
+
+def test_export_agents_includes_not_synced_agents(tmp_path):
+    async def scenario():
+        async with simulated() as (simulator, client):
+            stats = await export_agents(client, JsonlExporter(tmp_path / "agents.jsonl"))
+            return stats, len(simulator.fleet.agents)
+
+    stats, total = run(scenario())
+    assert stats.items == total
+    lines = (tmp_path / "agents.jsonl").read_text().splitlines()
+    assert any(json.loads(line).get("group_config_status") == "not_synced" for line in lines)
+
+
+def test_watcher_reads_flat_status_summary():
+    async def scenario():
+        async with simulated(flat_summary=True) as (simulator, client):
+            watcher = DisconnectWatcher(client)
+            result = await watcher.poll()
+            disconnected = sum(a["status"] == "disconnected" for a in simulator.fleet.agents)
+            assert result.counts["disconnected"] == disconnected
+            assert len(watcher.disconnected or {}) == disconnected
+
+    run(scenario())
+
+
+def test_watcher_keeps_running_after_failed_polls():
+    async def scenario():
+        async with simulated() as (simulator, client):
+            watcher = DisconnectWatcher(client, interval=0.01, max_backoff=0.02)
+            simulator.config.error_rate = 1.0
+            task = asyncio.create_task(watcher.run())
+            await asyncio.sleep(0.2)
+            simulator.config.error_rate = 0.0
+            await asyncio.sleep(0.2)
+            watcher.stop()
+            await task
+            assert watcher.errors > 0
+            assert watcher.counts is not None
+
+    run(scenario())
+
+
+def test_distinct_plan_matches_scan():
+    async def scenario():
+        async with simulated() as (_, client):
+            aggregator = AgentsAggregator(client)
+            fields = ["os.platform", "status"]
+            distinct = await aggregator.group_by(
+                fields, plan=AggregationPlan.DISTINCT, page_size=5
+            )
+            scan = await aggregator.group_by(fields, plan=AggregationPlan.SCAN)
+            assert distinct.counts == scan.counts
+            filtered = await aggregator.group_by(
+                ["os.platform"], status=[AgentStatus.ACTIVE], plan=AggregationPlan.DISTINCT
+            )
+            summary = await AgentsManager(client).summarize_agents_status()
+            assert sum(filtered.counts.values()) == summary.data["connection"]["active"]
+
+    run(scenario())
+
+
+def test_manager_stats_columns():
+    async def scenario():
+        async with simulated(agents=5) as (_, client):
+            wazuh_manager = WazuhManager(client)
+            stats = await wazuh_manager.get_stats(date="2024-01-01")
+            assert list(stats.columns["hour"]) == list(range(24))
+            assert stats.columns["events"].typecode == "d"
+            assert len((await wazuh_manager.get_stats_hour()).columns["averages"]) == 24
+            assert len((await wazuh_manager.get_stats_week()).columns["averages"]) == 7 * 24
+            daemons = await wazuh_manager.get_wazuh_daemon_stats()
+            assert len(daemons.columns["name"]) == 3
+
+    run(scenario())
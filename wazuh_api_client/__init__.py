@@ -1,3 +1,15 @@
-from .client import WazuhClient, AsyncWazuhClient
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .client import WazuhClient, AsyncWazuhClient
 
 __all__ = ["WazuhClient", "AsyncWazuhClient"]
+
+
+def __getattr__(name: str):
+    # Imported on first use so the command line interface starts without the HTTP stack.
+    if name in __all__:
+        from . import client
+
+        return getattr(client, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
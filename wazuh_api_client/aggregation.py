@@ -0,0 +1,215 @@
+from dataclasses import dataclass
+from typing import Any, List, Optional
+
+from .constants import DEFAULT_LIMIT
+from .enums import AgentStatus, AggregationPlan
+from .interfaces import AsyncClientInterface
+from .managers.agents import (
+    AgentsManager,
+    ListAgentsDistinctQueryParams,
+    ListAgentsQueryParams,
+)
+from .pagination import paginate
+
+# Fields holding a list of values, agents are counted once per value so only a scan can answer.
+SCAN_ONLY_FIELDS = {"group"}
+
+
+@dataclass
+class AggregationResult:
+    """
+    Result of a group by over agents.
+
+    `counts` maps a tuple of values (one per field of `fields`) to the number of agents,
+    counts are None when only the distinct values were asked for and the plan does not count.
+    `requests` is the number of API calls the plan needed.
+    """
+
+    plan: AggregationPlan
+    fields: List[str]
+    counts: dict[tuple, Optional[int]]
+    requests: int
+
+    @property
+    def total(self) -> int:
+        return sum(count for count in self.counts.values() if count)
+
+
+def _get_path(item: dict[str, Any], path: str) -> Any:
+    """
+    Return the value of a dot notation `path` (e.g. os.platform) in `item`.
+    """
+    value: Any = item
+    for part in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+def _keys(item: dict[str, Any], fields: List[str]) -> List[tuple]:
+    """
+    Return the group keys of an agent, list values are exploded into one key per value.
+    """
+    keys: List[tuple] = [()]
+    for path in fields:
+        value = _get_path(item, path)
+        values = value if isinstance(value, list) else [value]
+        keys = [key + (v,) for key in keys for v in values]
+    return keys
+
+
+class AgentsAggregator:
+    """
+    Group by/count over agents that prefers server side summaries over listing the whole fleet.
+
+    The cheapest plan able to answer the question is picked:
+        - SUMMARY_STATUS: counts by `status` or `group_config_status` of every agent, one call.
+        - SUMMARY_OS: distinct `os.platform` values of every agent, one call, no counts.
+        - DISTINCT: `/agents/stats/distinct` grouping done by the manager, works with filters.
+        - SCAN: paginated listing selecting only the grouped fields, used for list fields such as `group`.
+
+    Examples:
+        aggregator = AgentsAggregator(client)
+        result = await aggregator.group_by(["os.platform", "os.version"], status=[AgentStatus.ACTIVE])
+        print(result.plan, result.counts)
+    """
+
+    def __init__(self, client: AsyncClientInterface):
+        self.agents_manager = AgentsManager(client)
+
+    def choose_plan(
+        self,
+        fields: List[str],
+        q: Optional[str] = None,
+        status: Optional[List[AgentStatus]] = None,
+        count: bool = True,
+    ) -> AggregationPlan:
+        """
+        Return the plan `group_by` would use for the given question.
+        """
+        if not fields:
+            raise ValueError("At least one field to group by must be provided.")
+        filtered = bool(q or status)
+        if not filtered and fields in (["status"], ["group_config_status"]):
+            return AggregationPlan.SUMMARY_STATUS
+        if not filtered and not count and fields == ["os.platform"]:
+            return AggregationPlan.SUMMARY_OS
+        if SCAN_ONLY_FIELDS.intersection(fields):
+            return AggregationPlan.SCAN
+        return AggregationPlan.DISTINCT
+
+    async def group_by(
+        self,
+        fields: List[str],
+        q: Optional[str] = None,
+        status: Optional[List[AgentStatus]] = None,
+        count: bool = True,
+        plan: Optional[AggregationPlan] = None,
+        page_size: int = DEFAULT_LIMIT,
+    ) -> AggregationResult:
+        """
+        Group agents matching `q` and `status` by `fields` (dot notation for nested fields).
+
+        `plan` forces a plan instead of letting the aggregator choose one.
+        """
+        if plan is None:
+            plan = self.choose_plan(fields, q=q, status=status, count=count)
+
+        if plan == AggregationPlan.SUMMARY_STATUS:
+            result = await self._summary_status(fields)
+            if result is not None:
+                return result
+            # Managers older than 4.4 don't summarize the group configuration status.
+            plan = AggregationPlan.DISTINCT
+        if plan == AggregationPlan.SUMMARY_OS:
+            return await self._summary_os(fields)
+        if plan == AggregationPlan.DISTINCT:
+            return await self._distinct(fields, q, status, page_size)
+        return await self._scan(fields, q, status, page_size)
+
+    async def count_by(self, field: str, **kwargs) -> dict[Any, Optional[int]]:
+        """
+        Shortcut for a group by on a single field, returning a mapping of value to count.
+        """
+        result = await self.group_by([field], **kwargs)
+        return {key[0]: value for key, value in result.counts.items()}
+
+    async def _summary_status(self, fields: List[str]) -> Optional[AggregationResult]:
+        response = await self.agents_manager.summarize_agents_status()
+        data = response.data
+        if fields == ["status"]:
+            # 4.4+ nests the connection counters, older managers return them flat.
+            summary = data.get("connection", data)
+        elif "configuration" in data:
+            summary = data["configuration"]
+        else:
+            return None
+        counts: dict[tuple, Optional[int]] = {
+            (key,): value for key, value in summary.items() if key != "total"
+        }
+        return AggregationResult(
+            plan=AggregationPlan.SUMMARY_STATUS,
+            fields=fields,
+            counts=counts,
+            requests=1,
+        )
+
+    async def _summary_os(self, fields: List[str]) -> AggregationResult:
+        response = await self.agents_manager.summarize_agents_os()
+        counts: dict[tuple, Optional[int]] = {
+            (platform,): None for platform in response.data["affected_items"]
+        }
+        return AggregationResult(
+            plan=AggregationPlan.SUMMARY_OS, fields=fields, counts=counts, requests=1
+        )
+
+    async def _distinct(
+        self,
+        fields: List[str],
+        q: Optional[str],
+        status: Optional[List[AgentStatus]],
+        page_size: int,
+    ) -> AggregationResult:
+        if status:
+            status_q = ",".join(f"status={s}" for s in status)
+            q = f"({q});({status_q})" if q else status_q
+        params = ListAgentsDistinctQueryParams(fields=fields, q=q, limit=page_size)
+        counts: dict[tuple, Optional[int]] = {}
+        requests = 0
+        async for page in paginate(self._list_distinct, params):
+            requests += 1
+            for item in page.data["affected_items"]:
+                key = tuple(_get_path(item, path) for path in fields)
+                counts[key] = (counts.get(key) or 0) + item.get("count", 0)
+        return AggregationResult(
+            plan=AggregationPlan.DISTINCT, fields=fields, counts=counts, requests=requests
+        )
+
+    async def _list_distinct(self, params: ListAgentsDistinctQueryParams):
+        return await self.agents_manager.list_distinct(list_agents_distinct_params=params)
+
+    async def _scan(
+        self,
+        fields: List[str],
+        q: Optional[str],
+        status: Optional[List[AgentStatus]],
+        page_size: int,
+    ) -> AggregationResult:
+        params = ListAgentsQueryParams(
+            select=list(fields),
+            q=q,
+            status=status,
+            group_config_status=None,
+            limit=page_size,
+        )
+        counts: dict[tuple, Optional[int]] = {}
+        requests = 0
+        async for page in paginate(self.agents_manager.list, params):
+            requests += 1
+            for item in page.data["affected_items"]:
+                for key in _keys(item, fields):
+                    counts[key] = (counts.get(key) or 0) + 1
+        return AggregationResult(
+            plan=AggregationPlan.SCAN, fields=fields, counts=counts, requests=requests
+        )
@@ -0,0 +1,324 @@
+import asyncio
+import gzip
+import json
+import threading
+import time
+from collections import defaultdict, deque
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Iterable, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import httpx
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+
+from .exceptions import WazuhError
+
+CASSETTE_VERSION = 1
+REDACTED = "REDACTED"
+# JSON fields replaced by REDACTED in the recorded bodies: JWTs, agent keys and passwords.
+DEFAULT_REDACTED_FIELDS = ("token", "key", "password")
+# Headers worth replaying, anything else (Authorization, cookies, ...) is dropped.
+KEPT_HEADERS = ("content-type",)
+
+
+class CassetteError(WazuhError):
+    """Exception raised when a replayed request has no recorded interaction."""
+    pass
+
+
+@dataclass
+class Interaction:
+    """
+    A request/response pair, `url` is the path and query without the host so a cassette
+    replays against any base URL. `elapsed` is the time to the complete response body, in seconds.
+    """
+
+    method: str
+    url: str
+    status: int
+    body: str
+    elapsed: float
+    headers: Optional[dict[str, str]] = None
+    request_body: Optional[str] = None
+
+
+def _relative_url(url: str) -> str:
+    parts = urlsplit(url)
+    # Sorted so the same query built in another order matches on replay.
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return f"{parts.path}?{query}" if query else parts.path
+
+
+def _redact_value(value: Any, fields: Iterable[str]) -> Any:
+    if isinstance(value, dict):
+        return {
+            k: REDACTED if k in fields else _redact_value(v, fields)
+            for k, v in value.items()
+        }
+    if isinstance(value, list):
+        return [_redact_value(v, fields) for v in value]
+    return value
+
+
+def redact(body: str, fields: Iterable[str] = DEFAULT_REDACTED_FIELDS) -> str:
+    """
+    Replace the value of `fields` anywhere in a JSON body, non JSON bodies are returned as is.
+    """
+    try:
+        data = json.loads(body)
+    except ValueError:
+        return body
+    return json.dumps(_redact_value(data, set(fields)), separators=(",", ":"))
+
+
+class Cassette:
+    """
+    Recorded interactions with a manager, saved as JSON lines (gzip compressed when the path
+    ends with .gz).
+
+    Record with `recorder()` (AsyncWazuhClient) or `adapter_recorder()` (WazuhClient), replay with
+    `player()` or `adapter_player()`. Replayed responses are delayed by their recorded latency
+    times `latency_scale`: 1 reproduces the original timings, 0 replays as fast as possible.
+    Interactions are matched on method, path and query, repeated requests are served in the
+    recorded order and the last one is served again once exhausted.
+
+    Examples:
+        cassette = Cassette("prod.jsonl.gz")
+        async with AsyncWazuhClient(..., transport=cassette.recorder()) as client:
+            ...
+        cassette.save()
+
+        cassette = Cassette.load("prod.jsonl.gz")
+        async with AsyncWazuhClient(..., transport=cassette.player(latency_scale=0.5)) as client:
+            ...
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        redacted_fields: Iterable[str] = DEFAULT_REDACTED_FIELDS,
+    ):
+        self.path = Path(path)
+        self.redacted_fields = tuple(redacted_fields)
+        self.interactions: List[Interaction] = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: str | Path) -> "Cassette":
+        cassette = cls(path)
+        opener = gzip.open if cassette.path.suffix == ".gz" else open
+        with opener(cassette.path, "rt", encoding="utf-8") as f:
+            header = json.loads(f.readline())
+            if header.get("version") != CASSETTE_VERSION:
+                raise CassetteError(
+                    f"Unsupported cassette version: {header.get('version')}"
+                )
+            cassette.interactions = [
+                Interaction(**json.loads(line)) for line in f if line.strip()
+            ]
+        return cassette
+
+    def save(self) -> None:
+        opener = gzip.open if self.path.suffix == ".gz" else open
+        with opener(self.path, "wt", encoding="utf-8") as f:
+            f.write(json.dumps({"version": CASSETTE_VERSION}) + "\n")
+            for interaction in self.interactions:
+                data = {k: v for k, v in asdict(interaction).items() if v is not None}
+                f.write(json.dumps(data, separators=(",", ":")) + "\n")
+
+    def record(
+        self,
+        method: str,
+        url: str,
+        status: int,
+        headers: Any,
+        body: str,
+        elapsed: float,
+        request_body: Optional[str] = None,
+    ) -> None:
+        kept = {name: headers[name] for name in KEPT_HEADERS if name in headers}
+        interaction = Interaction(
+            method=method.upper(),
+            url=_relative_url(url),
+            status=status,
+            body=redact(body, self.redacted_fields),
+            elapsed=round(elapsed, 6),
+            headers=kept or None,
+            request_body=(
+                redact(request_body, self.redacted_fields) if request_body else None
+            ),
+        )
+        with self._lock:
+            self.interactions.append(interaction)
+
+    def recorder(
+        self, transport: Optional[httpx.AsyncBaseTransport] = None, **kwargs
+    ) -> "RecordingTransport":
+        """
+        httpx transport recording into this cassette, `kwargs` configure the default
+        `httpx.AsyncHTTPTransport` (e.g. verify=False).
+        """
+        return RecordingTransport(self, transport or httpx.AsyncHTTPTransport(**kwargs))
+
+    def player(self, latency_scale: float = 1.0) -> "ReplayTransport":
+        return ReplayTransport(self, latency_scale)
+
+    def adapter_recorder(self, adapter: Optional[BaseAdapter] = None) -> "RecordingAdapter":
+        return RecordingAdapter(self, adapter or HTTPAdapter())
+
+    def adapter_player(self, latency_scale: float = 1.0) -> "ReplayAdapter":
+        return ReplayAdapter(self, latency_scale)
+
+
+class _Replayer:
+    def __init__(self, cassette: Cassette, latency_scale: float):
+        self.cassette = cassette
+        self.latency_scale = latency_scale
+        self._queues: dict[tuple[str, str], deque[Interaction]] = defaultdict(deque)
+        for interaction in cassette.interactions:
+            self._queues[(interaction.method, interaction.url)].append(interaction)
+        self._lock = threading.Lock()
+
+    def next(self, method: str, url: str) -> Interaction:
+        key = (method.upper(), _relative_url(url))
+        with self._lock:
+            queue = self._queues.get(key)
+            if not queue:
+                raise CassetteError(f"No recorded interaction for {key[0]} {key[1]}")
+            return queue.popleft() if len(queue) > 1 else queue[0]
+
+    def delay(self, interaction: Interaction) -> float:
+        return interaction.elapsed * self.latency_scale
+
+
+class _RecordedStream(httpx.AsyncByteStream):
+    """
+    Streamed request body keeping a copy of the chunks sent.
+    """
+
+    def __init__(self, stream: Any):
+        self.stream = stream
+        self.chunks: List[bytes] = []
+
+    async def __aiter__(self):
+        async for chunk in self.stream:
+            self.chunks.append(chunk)
+            yield chunk
+
+    async def aclose(self) -> None:
+        if hasattr(self.stream, "aclose"):
+            await self.stream.aclose()
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    def __init__(self, cassette: Cassette, transport: httpx.AsyncBaseTransport):
+        self.cassette = cassette
+        self.transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.perf_counter()
+        recorded = None
+        try:
+            request_content = request.content
+        except httpx.RequestNotRead:
+            # Streamed body (e.g. a list file upload), recorded as it is sent.
+            recorded = request.stream = _RecordedStream(request.stream)
+        response = await self.transport.handle_async_request(request)
+        content = await response.aread()
+        if recorded is not None:
+            request_content = b"".join(recorded.chunks)
+        self.cassette.record(
+            request.method,
+            str(request.url),
+            response.status_code,
+            response.headers,
+            content.decode("utf-8", errors="replace"),
+            time.perf_counter() - started,
+            request_content.decode("utf-8", errors="replace") or None,
+        )
+        # The content is already decoded, drop the headers describing the encoded body.
+        headers = [
+            (name, value)
+            for name, value in response.headers.multi_items()
+            if name not in ("content-encoding", "content-length", "transfer-encoding")
+        ]
+        return httpx.Response(
+            response.status_code,
+            headers=headers,
+            content=content,
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    def __init__(self, cassette: Cassette, latency_scale: float = 1.0):
+        self.replayer = _Replayer(cassette, latency_scale)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        interaction = self.replayer.next(request.method, str(request.url))
+        delay = self.replayer.delay(interaction)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return httpx.Response(
+            interaction.status,
+            headers=interaction.headers or {},
+            content=interaction.body.encode(),
+        )
+
+
+class RecordingAdapter(BaseAdapter):
+    """
+    requests adapter recording into a cassette, mount it with `WazuhClient(..., adapter=...)`.
+    """
+
+    def __init__(self, cassette: Cassette, adapter: BaseAdapter):
+        super().__init__()
+        self.cassette = cassette
+        self.adapter = adapter
+
+    def send(self, request, **kwargs) -> requests.Response:
+        started = time.perf_counter()
+        response = self.adapter.send(request, **kwargs)
+        content = response.content
+        body = request.body.decode() if isinstance(request.body, bytes) else request.body
+        self.cassette.record(
+            request.method,
+            request.url,
+            response.status_code,
+            {k.lower(): v for k, v in response.headers.items()},
+            content.decode("utf-8", errors="replace"),
+            time.perf_counter() - started,
+            body or None,
+        )
+        return response
+
+    def close(self) -> None:
+        self.adapter.close()
+
+
+class ReplayAdapter(BaseAdapter):
+    def __init__(self, cassette: Cassette, latency_scale: float = 1.0):
+        super().__init__()
+        self.replayer = _Replayer(cassette, latency_scale)
+
+    def send(self, request, **kwargs) -> requests.Response:
+        interaction = self.replayer.next(request.method, request.url)
+        delay = self.replayer.delay(interaction)
+        if delay > 0:
+            time.sleep(delay)
+        response = requests.Response()
+        response.status_code = interaction.status
+        response.headers.update(interaction.headers or {})
+        response._content = interaction.body.encode()
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self) -> None:
+        pass
@@ -0,0 +1,160 @@
+import asyncio
+import hashlib
+import json
+from collections import defaultdict
+from typing import Any, Iterable, List, Optional
+
+from .enums import RuleRequirement
+from .interfaces import AsyncClientInterface
+from .managers.rules import ListRulesFilesQueryParams, ListRulesQueryParams, RulesManager
+from .pagination import paginate
+
+# Compliance fields of a rule, named as in the /rules responses.
+REQUIREMENT_FIELDS = {
+    RuleRequirement.PCI_DSS: "pci_dss",
+    RuleRequirement.GDPR: "gdpr",
+    RuleRequirement.HIPAA: "hipaa",
+    RuleRequirement.NIST_800_53: "nist_800_53",
+    RuleRequirement.GPG13: "gpg13",
+    RuleRequirement.TSC: "tsc",
+    RuleRequirement.MITRE: "mitre",
+}
+
+
+def _rule_id(rule_id: int | str) -> int:
+    return int(rule_id)
+
+
+class RuleCatalog:
+    """
+    Local index of the rules of a manager, so looking up a rule never calls the API.
+
+    `refresh()` compares a fingerprint of the rule files with the one of the loaded rules and
+    only pages the whole ruleset when they differ. The fingerprint hashes the listing of the
+    rule files (name, directory and status), one request, plus the content of the files under
+    `content_dirs`, one request per file: the default user rules directory is where rules are
+    edited, the stock ruleset only changes with the listing (manager upgrades).
+
+    Lookups return the rules as listed by /rules, the indexes are swapped at once after a
+    reload so concurrent readers never see a partial catalog.
+
+    Examples:
+        catalog = RuleCatalog(client)
+        await catalog.refresh()
+        rule = catalog.get(alert["rule"]["id"])
+        catalog.by_technique("T1110")
+        catalog.by_requirement(RuleRequirement.PCI_DSS, "10.2.4")
+
+        task = asyncio.create_task(catalog.run(interval=300))
+    """
+
+    def __init__(
+        self,
+        client: AsyncClientInterface,
+        content_dirs: Iterable[str] = ("etc/rules",),
+        page_size: int = 5000,
+    ):
+        self.rules_manager = RulesManager(client)
+        self.content_dirs = tuple(content_dirs)
+        self.page_size = page_size
+        self.fingerprint: Optional[str] = None
+        self.reloads = 0
+        self._rules: dict[int, dict[str, Any]] = {}
+        self._indexes: dict[str, dict[str, List[dict[str, Any]]]] = {}
+        self._stopped: Optional[asyncio.Event] = None
+
+    def __len__(self) -> int:
+        return len(self._rules)
+
+    def __contains__(self, rule_id: int | str) -> bool:
+        return _rule_id(rule_id) in self._rules
+
+    def get(self, rule_id: int | str) -> Optional[dict[str, Any]]:
+        return self._rules.get(_rule_id(rule_id))
+
+    def by_group(self, group: str) -> List[dict[str, Any]]:
+        return self._indexes.get("groups", {}).get(group, [])
+
+    def by_file(self, filename: str) -> List[dict[str, Any]]:
+        return self._indexes.get("filename", {}).get(filename, [])
+
+    def by_technique(self, technique_id: str) -> List[dict[str, Any]]:
+        return self.by_requirement(RuleRequirement.MITRE, technique_id)
+
+    def by_requirement(self, requirement: RuleRequirement, value: str) -> List[dict[str, Any]]:
+        return self._indexes.get(REQUIREMENT_FIELDS[requirement], {}).get(value, [])
+
+    @property
+    def groups(self) -> List[str]:
+        return list(self._indexes.get("groups", {}))
+
+    async def current_fingerprint(self) -> str:
+        digest = hashlib.sha256()
+        files = []
+        async for page in paginate(
+            self.rules_manager.list_files, ListRulesFilesQueryParams(limit=10000)
+        ):
+            files.extend(page.data["affected_items"])
+        files.sort(key=lambda item: (item["relative_dirname"], item["filename"]))
+        for item in files:
+            digest.update(
+                f"{item['relative_dirname']}/{item['filename']}:{item.get('status')}\n".encode()
+            )
+        for item in files:
+            if item["relative_dirname"] in self.content_dirs:
+                response = await self.rules_manager.get_file(
+                    item["filename"], relative_dirname=item["relative_dirname"]
+                )
+                digest.update(json.dumps(response.data, sort_keys=True).encode())
+        return digest.hexdigest()
+
+    async def refresh(self, force: bool = False) -> bool:
+        """
+        Reload the rules if the rule files changed since the last load, return whether it did.
+        """
+        fingerprint = await self.current_fingerprint()
+        if not force and fingerprint == self.fingerprint:
+            return False
+        rules: List[dict[str, Any]] = []
+        async for page in paginate(
+            self.rules_manager.list, ListRulesQueryParams(limit=self.page_size)
+        ):
+            rules.extend(page.data["affected_items"])
+        self.load(rules)
+        self.fingerprint = fingerprint
+        self.reloads += 1
+        return True
+
+    def load(self, rules: Iterable[dict[str, Any]]) -> None:
+        """
+        Replace the catalog with `rules`, as returned by /rules.
+        """
+        by_id: dict[int, dict[str, Any]] = {}
+        indexes: dict[str, dict[str, List[dict[str, Any]]]] = {
+            field: defaultdict(list)
+            for field in ("groups", "filename", *REQUIREMENT_FIELDS.values())
+        }
+        for rule in rules:
+            by_id[_rule_id(rule["id"])] = rule
+            for field, index in indexes.items():
+                values = rule.get(field) or []
+                for value in values if isinstance(values, list) else [values]:
+                    index[value].append(rule)
+        self._rules = by_id
+        self._indexes = {field: dict(index) for field, index in indexes.items()}
+
+    async def run(self, interval: float = 300.0) -> None:
+        """
+        Refresh every `interval` seconds until `stop()` is called.
+        """
+        self._stopped = asyncio.Event()
+        while not self._stopped.is_set():
+            await self.refresh()
+            try:
+                await asyncio.wait_for(self._stopped.wait(), interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def stop(self) -> None:
+        if self._stopped is not None:
+            self._stopped.set()
@@ -0,0 +1,407 @@
+"""
+`wazuh-client` command line interface.
+
+Results are written to stdout as JSON lines, one item per line, errors to stderr. The connection
+settings are read from the WAZUH_URL, WAZUH_USER, WAZUH_PASSWORD and WAZUH_API_VERSION
+environment variables unless given as options.
+
+Examples:
+    wazuh-client agents list --status disconnected --select name,lastKeepAlive
+    wazuh-client agents list --group web --select id | wazuh-client agents restart -
+    wazuh-client --concurrency 16 --rate 20 syscheck results 001 002 003
+    wazuh-client agents summary status
+
+The client modules are imported once the arguments are parsed, so `--help` and usage errors
+answer without loading the HTTP stack.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+from typing import Any, Awaitable, Callable, Iterable, List, Optional, TextIO
+
+EXIT_OK = 0
+EXIT_ERRORS = 1
+EXIT_USAGE = 2
+EXIT_INTERRUPTED = 130
+
+
+class CommandFailed(Exception):
+    """Raised to stop a command at the first error when --fail-fast is set."""
+
+
+def _split(value: str) -> List[str]:
+    return [v for v in value.split(",") if v]
+
+
+def _page_size(value: str) -> int | str:
+    return value if value == "auto" else int(value)
+
+
+def _paging(args: argparse.Namespace) -> tuple[int, Any]:
+    """
+    First page size and page size tuner of the listings, tuned when --page-size is auto.
+    """
+    from .pagination import PageSizeTuner
+
+    if args.page_size == "auto":
+        return 500, PageSizeTuner()
+    return args.page_size, None
+
+
+def _read_ids(values: List[str], stdin: TextIO) -> List[str]:
+    """
+    Agent ids from the command line, `-` reads them from stdin: one per line, either a bare id
+    or a JSON object with an `id`, e.g. the output of `agents list`.
+    """
+    ids: List[str] = []
+    for value in values:
+        if value != "-":
+            ids.extend(_split(value))
+            continue
+        for line in stdin:
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith("{"):
+                ids.append(str(json.loads(line)["id"]))
+            else:
+                ids.append(line)
+    return ids
+
+
+class Runner:
+    """
+    Shared state of a command: the client, the output and the limits applied to every API call.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        concurrency: int = 8,
+        rate: float = 0.0,
+        fail_fast: bool = False,
+        out: TextIO = sys.stdout,
+        err: TextIO = sys.stderr,
+    ):
+        from .utils import RateLimiter
+
+        self.client = client
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.concurrency = concurrency
+        self.limiter = RateLimiter(rate, burst=concurrency) if rate > 0 else None
+        self.fail_fast = fail_fast
+        self.out = out
+        self.err = err
+        self.errors = 0
+
+    def limited(self, method: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        """
+        Wrap a manager method so every call waits for the rate limiter and a concurrency slot.
+        """
+
+        async def call(*args, **kwargs):
+            if self.limiter:
+                await self.limiter.acquire()
+            async with self.semaphore:
+                return await method(*args, **kwargs)
+
+        return call
+
+    def write(self, items: Iterable[Any], **extra: Any) -> None:
+        lines = [json.dumps({**extra, **item} if extra else item) for item in items]
+        if lines:
+            self.out.write("\n".join(lines) + "\n")
+            self.out.flush()
+
+    def error(self, message: str, **context: Any) -> None:
+        self.errors += 1
+        self.err.write(json.dumps({"error": message, **context}) + "\n")
+        self.err.flush()
+        if self.fail_fast:
+            raise CommandFailed(message)
+
+    def check(self, response: Any, **context: Any) -> None:
+        """
+        Report the failed items of a response as errors.
+        """
+        for failed_item in response.data.get("failed_items", []):
+            message = failed_item.get("error", {}).get("message", "failed")
+            self.error(message, ids=failed_item.get("id", []), **context)
+
+    async def for_each(
+        self, items: List[Any], function: Callable[[Any], Awaitable[None]]
+    ) -> None:
+        """
+        Run `function` on every item, `concurrency` at a time. Exceptions are reported as errors.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        for item in items:
+            queue.put_nowait(item)
+
+        async def worker():
+            while not queue.empty():
+                item = queue.get_nowait()
+                try:
+                    await function(item)
+                except CommandFailed:
+                    raise
+                except Exception as e:
+                    self.error(str(e) or repr(e), item=item)
+
+        workers = [
+            asyncio.ensure_future(worker())
+            for _ in range(min(self.concurrency, len(items)))
+        ]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for task in workers:
+                task.cancel()
+
+
+async def agents_list(runner: Runner, args: argparse.Namespace) -> None:
+    from .managers.agents import AgentsManager, ListAgentsQueryParams, OsQueryParameters
+    from .pagination import paginate
+
+    limit, tuner = _paging(args)
+    params = ListAgentsQueryParams(
+        limit=limit,
+        agents_list=args.agents,
+        status=args.status,
+        group=args.group,
+        node_name=args.node,
+        select=args.select,
+        q=args.q,
+        os_query_parameters=(
+            OsQueryParameters(platform=args.os_platform) if args.os_platform else None
+        ),
+        group_config_status=None,
+    )
+    agents_manager = AgentsManager(runner.client)
+    async for page in paginate(runner.limited(agents_manager.list), params, tuner=tuner):
+        runner.write(page.data["affected_items"])
+
+
+async def agents_restart(runner: Runner, args: argparse.Namespace) -> None:
+    from .managers.agents import AgentsManager
+    from .utils import chunks
+
+    agents_manager = AgentsManager(runner.client)
+
+    def report(response: Any) -> None:
+        runner.write(
+            {"id": agent_id, "restarted": True}
+            for agent_id in response.data["affected_items"]
+        )
+        runner.check(response)
+
+    if args.group:
+        report(await runner.limited(agents_manager.restart_agents_in_group)(args.group))
+        return
+    if args.node:
+        report(await runner.limited(agents_manager.restart_agents_in_node)(args.node))
+        return
+
+    agents = _read_ids(args.agents, sys.stdin)
+    if not agents:
+        runner.error("No agents to restart.")
+        return
+
+    async def restart(chunk: List[str]) -> None:
+        report(await runner.limited(agents_manager.restart_agents)(chunk))
+
+    await runner.for_each(chunks(agents, args.chunk_size), restart)
+
+
+async def agents_summary(runner: Runner, args: argparse.Namespace) -> None:
+    from .managers.agents import AgentsManager
+
+    agents_manager = AgentsManager(runner.client)
+    if args.item == "os":
+        response = await runner.limited(agents_manager.summarize_agents_os)()
+        runner.write({"platform": platform} for platform in response.data["affected_items"])
+    else:
+        response = await runner.limited(agents_manager.summarize_agents_status)()
+        runner.write([response.data])
+
+
+async def syscheck_scan(runner: Runner, args: argparse.Namespace) -> None:
+    from .managers.syscheck import SysCheckManager
+    from .utils import chunks
+
+    syscheck_manager = SysCheckManager(runner.client)
+    agents = _read_ids(args.agents, sys.stdin)
+    if not agents:
+        runner.error("No agents to scan.")
+        return
+
+    async def scan(chunk: List[str]) -> None:
+        response = await runner.limited(syscheck_manager.run_scan)(chunk)
+        runner.write(
+            {"id": agent_id, "scan": "started"}
+            for agent_id in response.data["affected_items"]
+        )
+        runner.check(response)
+
+    await runner.for_each(chunks(agents, args.chunk_size), scan)
+
+
+async def syscheck_results(runner: Runner, args: argparse.Namespace) -> None:
+    from .enums import SysCheckScanType
+    from .managers.syscheck import ScanResultParams, SysCheckManager
+    from .pagination import paginate
+
+    syscheck_manager = SysCheckManager(runner.client)
+    limit, tuner = _paging(args)
+    params = ScanResultParams(
+        limit=limit,
+        select=args.select,
+        q=args.q,
+        file=args.file,
+        type=SysCheckScanType(args.type) if args.type else None,
+    )
+    get_results = runner.limited(syscheck_manager.get_results)
+
+    async def results(agent_id: str) -> None:
+        async for page in paginate(get_results, params, agent_id, tuner=tuner):
+            runner.write(page.data["affected_items"], agent_id=agent_id)
+
+    await runner.for_each(_read_ids(args.agents, sys.stdin), results)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    env = os.environ
+    parser = argparse.ArgumentParser(
+        prog="wazuh-client", description="Query and operate a Wazuh manager."
+    )
+    parser.add_argument("--url", default=env.get("WAZUH_URL"), help="API base URL (WAZUH_URL)")
+    parser.add_argument("--user", default=env.get("WAZUH_USER"), help="API user (WAZUH_USER)")
+    parser.add_argument(
+        "--password", default=env.get("WAZUH_PASSWORD"), help="API password (WAZUH_PASSWORD)"
+    )
+    parser.add_argument(
+        "--api-version", default=env.get("WAZUH_API_VERSION", "4"), help="API version (WAZUH_API_VERSION)"
+    )
+    parser.add_argument("--verify", action="store_true", help="verify the TLS certificate")
+    parser.add_argument(
+        "--concurrency", type=int, default=8, help="maximum concurrent API calls (default: 8)"
+    )
+    parser.add_argument(
+        "--rate", type=float, default=0.0, help="maximum API calls per second (default: unlimited)"
+    )
+    parser.add_argument(
+        "--page-size",
+        type=_page_size,
+        default=500,
+        help="items per page of the listings, `auto` tunes it from the latency (default: 500)",
+    )
+    parser.add_argument(
+        "--fail-fast", action="store_true", help="stop at the first error"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    agents = commands.add_parser("agents", help="agents").add_subparsers(
+        dest="action", required=True
+    )
+    list_parser = agents.add_parser("list", help="list agents")
+    list_parser.add_argument("--agents", type=_split, help="comma separated agent ids")
+    list_parser.add_argument(
+        "--status",
+        type=_split,
+        help="comma separated statuses: active, pending, never_connected, disconnected",
+    )
+    list_parser.add_argument("--group")
+    list_parser.add_argument("--node")
+    list_parser.add_argument("--os-platform")
+    list_parser.add_argument("--select", type=_split, help="comma separated fields")
+    list_parser.add_argument("--q", help="query, e.g. 'lastKeepAlive>1d'")
+    list_parser.set_defaults(handler=agents_list)
+
+    restart_parser = agents.add_parser("restart", help="restart agents")
+    target = restart_parser.add_mutually_exclusive_group(required=True)
+    target.add_argument(
+        "agents", nargs="*", default=[], help="agent ids, `-` reads them from stdin"
+    )
+    target.add_argument("--group")
+    target.add_argument("--node")
+    restart_parser.add_argument(
+        "--chunk-size", type=int, default=500, help="agents per API call (default: 500)"
+    )
+    restart_parser.set_defaults(handler=agents_restart)
+
+    summary_parser = agents.add_parser("summary", help="summarize agents")
+    summary_parser.add_argument("item", choices=["status", "os"])
+    summary_parser.set_defaults(handler=agents_summary)
+
+    syscheck = commands.add_parser("syscheck", help="file integrity monitoring").add_subparsers(
+        dest="action", required=True
+    )
+    scan_parser = syscheck.add_parser("scan", help="run a FIM scan")
+    scan_parser.add_argument("agents", nargs="+", help="agent ids, `-` reads them from stdin")
+    scan_parser.add_argument(
+        "--chunk-size", type=int, default=500, help="agents per API call (default: 500)"
+    )
+    scan_parser.set_defaults(handler=syscheck_scan)
+
+    results_parser = syscheck.add_parser("results", help="FIM findings")
+    results_parser.add_argument("agents", nargs="+", help="agent ids, `-` reads them from stdin")
+    results_parser.add_argument("--type", choices=["file", "registry_key", "registry_value"])
+    results_parser.add_argument("--file", help="full path of a file")
+    results_parser.add_argument("--select", type=_split, help="comma separated fields")
+    results_parser.add_argument("--q", help="query, e.g. 'size>1000'")
+    results_parser.set_defaults(handler=syscheck_results)
+    return parser
+
+
+async def run(args: argparse.Namespace) -> int:
+    from .client import AsyncWazuhClient
+
+    async with AsyncWazuhClient(
+        base_url=args.url,
+        version=args.api_version,
+        username=args.user,
+        password=args.password,
+        verify=args.verify,
+    ) as client:
+        runner = Runner(
+            client,
+            concurrency=args.concurrency,
+            rate=args.rate,
+            fail_fast=args.fail_fast,
+        )
+        try:
+            await args.handler(runner, args)
+        except CommandFailed:
+            return EXIT_ERRORS
+    return EXIT_ERRORS if runner.errors else EXIT_OK
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    missing = [name for name in ("url", "user", "password") if not getattr(args, name)]
+    if missing:
+        parser.error(
+            "missing " + ", ".join(f"--{name} (WAZUH_{name.upper()})" for name in missing)
+        )
+    if args.concurrency < 1 or not (args.page_size == "auto" or 0 < args.page_size <= 100000):
+        parser.error("--concurrency must be >= 1 and --page-size auto or between 1 and 100000")
+
+    try:
+        return asyncio.run(run(args))
+    except KeyboardInterrupt:
+        return EXIT_INTERRUPTED
+    except BrokenPipeError:
+        # The reader went away (e.g. `| head`), silence the flush at exit.
+        sys.stdout = open(os.devnull, "w")
+        return EXIT_OK
+    except Exception as e:
+        sys.stderr.write(json.dumps({"error": str(e) or repr(e)}) + "\n")
+        return EXIT_ERRORS
+
+
+if __name__ == "__main__":
+    sys.exit(main())
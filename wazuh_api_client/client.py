@@ -1,11 +1,41 @@
+import asyncio
+import time
 import requests
 
 from ssl import SSLContext
-from httpx import AsyncClient, RequestError
-from typing import Any, Optional
+from httpx import (
+    AsyncBaseTransport,
+    AsyncClient,
+    Limits,
+    RequestError,
+    Response,
+    TimeoutException,
+)
+from contextlib import contextmanager, nullcontext
+from requests.adapters import BaseAdapter
+from typing import Any, Iterator, Optional
 
 from .constants import DEFAULT_TIMEOUT, USER_AGENT
-from .exceptions import WazuhError, WazuhConnectionError
+from .decoding import DecodeOffload
+from .endpoints.endpoints_v4 import V4ApiPaths
+from .exceptions import WazuhError, WazuhConnectionError, WazuhTimeoutError
+from .hedging import HedgePolicy
+from .latency import ClientStats, EndpointStats, LoopLagMonitor
+from .timeouts import (
+    DEFAULT_TIMEOUT_PROFILES,
+    AdaptiveTimeouts,
+    TimeoutProfile,
+    is_wait_for_complete,
+    resolve_profile,
+)
+from .tokens import (
+    TOKEN_REFRESH_MARGIN,
+    TokenStore,
+    async_shared_token,
+    shared_token,
+    token_expiration,
+    token_key,
+)
 from .utils import get_api_paths
 
 from .interfaces import (
@@ -24,16 +54,33 @@ class WazuhClient(ClientInterface):
         username: str,
         password: str,
         verify: bool | None = False,
+        adapter: Optional[BaseAdapter] = None,
+        token_store: Optional[TokenStore] = None,
     ):
+        """
+        `adapter` replaces the requests transport adapter, e.g. to record or replay a cassette
+        (see `cassette.Cassette`). With `token_store`, the clients of the same manager and user
+        reuse the token generated by the first one (see `tokens.FileTokenStore`).
+        """
         self.base_url = base_url.rstrip("/")
         self.session = requests.Session()
         self.session.verify = verify
         self.session.headers.update({"User-Agent": USER_AGENT})
+        if adapter is not None:
+            self.session.mount("http://", adapter)
+            self.session.mount("https://", adapter)
 
         # Detect or set the Wazuh version.
         self.version = version or self._detect_version()
 
-        token = self._generate_token(username, password)
+        if token_store is None:
+            token = self._generate_token(username, password)
+        else:
+            token = shared_token(
+                token_store,
+                token_key(self.base_url, username),
+                lambda: self._generate_token(username, password),
+            )
         self.session.headers.update({"Authorization": f"Bearer {token}"})
 
         try:
@@ -109,7 +156,35 @@ class AsyncWazuhClient(AsyncClientInterface):
         username: str,
         password: str,
         verify: SSLContext | str | bool = False,
+        timeout_profiles: Optional[dict[V4ApiPaths, TimeoutProfile]] = None,
+        adaptive_timeouts: Optional[AdaptiveTimeouts] = None,
+        hedging: Optional[HedgePolicy] = None,
+        transport: Optional[AsyncBaseTransport] = None,
+        token_store: Optional[TokenStore] = None,
+        decode_offload: Optional[DecodeOffload] = None,
+        instrumentation: bool = False,
+        loop_lag_interval: float = 0.05,
+        limits: Optional[Limits] = None,
+        request_semaphore: Optional[asyncio.Semaphore] = None,
     ):
+        """
+        `timeout_profiles` overrides the connect/read/write/pool timeouts of some endpoints,
+        see `timeouts.DEFAULT_TIMEOUT_PROFILES`. With `adaptive_timeouts`, read timeouts are
+        derived from the observed latency of each endpoint.
+        With `hedging`, slow GET requests are duplicated and the first response wins.
+        `transport` replaces the httpx transport, e.g. to record or replay a cassette
+        (see `cassette.Cassette`), `verify` is then up to the transport.
+        With `token_store`, the clients of the same manager and user reuse the token generated by
+        the first one instead of each authenticating (see `tokens.FileTokenStore`).
+        Tokens are renewed shortly before they expire, or once when a request is answered 401.
+        With `decode_offload`, large JSON bodies are decoded out of the event loop.
+        With `instrumentation`, the lag of the event loop is sampled every `loop_lag_interval`
+        seconds and the synchronous time spent in each phase of the requests (build the URL,
+        serialize the query, send: build the httpx request, decode the body) is recorded
+        per endpoint, see `stats()`. With `decode_offload`, decode is the whole offloaded decode.
+        `limits` caps the connection pool, `request_semaphore` bounds the requests in flight and
+        can be shared by several clients (see `registry.ManagerRegistry`).
+        """
         self.base_url = base_url.rstrip("/")
         self.verify = verify
         self.username = username
@@ -118,20 +193,41 @@ class AsyncWazuhClient(AsyncClientInterface):
         self.client: Optional[AsyncClient] = None
         self.authenticated = False
         self.api_paths: dict[str, str] = {}
+        self.timeout_profiles = {**DEFAULT_TIMEOUT_PROFILES, **(timeout_profiles or {})}
+        self.adaptive_timeouts = adaptive_timeouts
+        self.hedging = hedging
+        self.transport = transport
+        self.token_store = token_store
+        self.decode_offload = decode_offload
+        self.instrumentation = instrumentation
+        self.loop_lag_interval = loop_lag_interval
+        self.limits = limits
+        self.request_semaphore = request_semaphore
+        self._token: Optional[str] = None
+        self._token_expiration: Optional[float] = None
+        self._token_lock = asyncio.Lock()
+        self._stats = ClientStats()
 
     async def async_init(self):
+        options: dict[str, Any] = {}
+        if self.limits is not None:
+            options["limits"] = self.limits
         self.client = AsyncClient(
             base_url=self.base_url,
             headers={"User-Agent": USER_AGENT},
             verify=self.verify,
             timeout=DEFAULT_TIMEOUT,
+            transport=self.transport,
+            **options,
         )
+        if self.instrumentation and self._stats.loop_lag is None:
+            self._stats.loop_lag = LoopLagMonitor(self.loop_lag_interval)
+            self._stats.loop_lag.start()
         # Optionally detect version if not provided.
         if not self.version:
             self.version = await self._detect_version()
-        # Generate token and update headers.
-        token = await self._generate_token(self.username, self.password)
-        self.client.headers.update({"Authorization": f"Bearer {token}"})
+        # Generate (or reuse) a token and update headers.
+        await self._renew_token()
 
         try:
             self.api_paths = get_api_paths(self.version)
@@ -144,11 +240,35 @@ class AsyncWazuhClient(AsyncClientInterface):
         if self.client is None:
             raise RuntimeError("Async client is not initialized")
 
-        url = self.build_endpoint("/security/user/authenticate")
-        response = await self.client.post(url, auth=(username, password))
+        url = self.build_endpoint(V4ApiPaths.GENERATE_TOKEN.value)
+        profile = resolve_profile(V4ApiPaths.GENERATE_TOKEN.value, self.timeout_profiles)
+        response = await self.client.post(
+            url, auth=(username, password), timeout=profile.to_httpx()
+        )
         response.raise_for_status()
         return response.json()["data"]["token"]
 
+    async def _renew_token(self, stale: Optional[str] = None) -> None:
+        """
+        Replace the `stale` token, unless a concurrent request already did.
+        """
+        assert self.client is not None
+        async with self._token_lock:
+            if self._token != stale:
+                return
+            if self.token_store is None:
+                token = await self._generate_token(self.username, self.password)
+            else:
+                token = await async_shared_token(
+                    self.token_store,
+                    token_key(self.base_url, self.username),
+                    lambda: self._generate_token(self.username, self.password),
+                    stale,
+                )
+            self._token = token
+            self._token_expiration = token_expiration(token)
+            self.client.headers.update({"Authorization": f"Bearer {token}"})
+
     async def _detect_version(self) -> str:
         if self.client is None:
             raise RuntimeError("Async client is not initialized")
@@ -179,18 +299,148 @@ class AsyncWazuhClient(AsyncClientInterface):
             res += endpoint
         return res
 
-    async def request(self, method: str, endpoint: str, **kwargs):
+    def get_timeout(self, api_path: str, params: Any = None):
+        """
+        Return the httpx timeout of a request to `api_path` (the path template, e.g. /agents/{agent_id}/key).
+        """
+        wait_for_complete = is_wait_for_complete(params)
+        profile = resolve_profile(api_path, self.timeout_profiles, wait_for_complete)
+        read = None
+        # Latencies observed without wait_for_complete don't tell how long the cluster takes.
+        if self.adaptive_timeouts and not wait_for_complete:
+            read = self.adaptive_timeouts.read_timeout(api_path, profile)
+        return profile.to_httpx(read=read)
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Return the statistics of the requests made so far, per endpoint.
+        With `instrumentation`, each endpoint also reports the time spent in its `phases`, and
+        `loop_lag` the sampled lag of the event loop.
+        """
+        return self._stats.snapshot()
+
+    @contextmanager
+    def timed(self, api_path: str, phase: str) -> Iterator[None]:
+        if not self.instrumentation:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._stats.endpoint(api_path).phase(phase).add(time.perf_counter() - started)
+
+    async def request(
+        self, method: str, endpoint: str, api_path: Optional[str] = None, **kwargs
+    ):
+        """
+        Make an HTTP request, `api_path` is the path template of the endpoint,
+        it selects the timeout profile and keys the statistics.
+        """
         if self.client is None:
             raise RuntimeError("Async client is not initialized")
 
+        api_path = api_path or endpoint
+        if "timeout" not in kwargs:
+            kwargs["timeout"] = self.get_timeout(api_path, kwargs.get("params"))
+        stats = self._stats.endpoint(api_path)
+        stats.requests += 1
+        started = time.perf_counter()
         try:
-            response = await self.client.request(method, endpoint, **kwargs)
+            token = self._token
+            if (
+                self._token_expiration is not None
+                and self._token_expiration - time.time() < TOKEN_REFRESH_MARGIN
+            ):
+                await self._renew_token(token)
+                token = self._token
+            response = await self._send(method, endpoint, api_path, stats, kwargs)
+            if response.status_code == 401 and token is not None:
+                # Expired or revoked token, renew it and try once more.
+                await self._renew_token(token)
+                response = await self._send(method, endpoint, api_path, stats, kwargs)
             response.raise_for_status()
-            return response.json()
+            with self.timed(api_path, "decode"):
+                if self.decode_offload is not None:
+                    return await self.decode_offload.decode(response.content)
+                return response.json()
+        except TimeoutException as e:
+            stats.timeouts += 1
+            elapsed = time.perf_counter() - started
+            raise WazuhTimeoutError(f"HTTP request timed out after {elapsed:.2f}s.") from e
         except RequestError as e:
-            raise Exception("HTTP request failed.") from e
+            stats.errors += 1
+            raise WazuhConnectionError("HTTP request failed.") from e
+        except Exception:
+            stats.errors += 1
+            raise
+
+    async def _send(
+        self,
+        method: str,
+        endpoint: str,
+        api_path: str,
+        stats: EndpointStats,
+        kwargs: dict[str, Any],
+    ) -> Response:
+        assert self.client is not None
+        async with self.request_semaphore or nullcontext():
+            started = time.perf_counter()
+            try:
+                if method == "GET" and self.hedging:
+                    return await self._hedged_request(endpoint, stats, kwargs)
+                if self.instrumentation:
+                    with self.timed(api_path, "send"):
+                        request = self.client.build_request(method, endpoint, **kwargs)
+                    return await self.client.send(request)
+                return await self.client.request(method, endpoint, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - started
+                stats.latency.add(elapsed)
+                if self.adaptive_timeouts:
+                    self.adaptive_timeouts.record(api_path, elapsed)
+
+    async def _hedged_request(
+        self, endpoint: str, stats: EndpointStats, kwargs: dict[str, Any]
+    ) -> Response:
+        """
+        Send a GET request, duplicating it if it is slower than usual and the hedging budget allows it.
+        """
+        assert self.client is not None and self.hedging is not None
+        self.hedging.on_request()
+        delay = self.hedging.delay(stats.latency)
+        if delay is None:
+            return await self.client.request("GET", endpoint, **kwargs)
+
+        first = asyncio.ensure_future(self.client.request("GET", endpoint, **kwargs))
+        done, _ = await asyncio.wait({first}, timeout=delay)
+        if done or not self.hedging.try_acquire():
+            return await first
+
+        stats.hedges += 1
+        hedge_url = self.hedging.hedge_url(endpoint, self.base_url)
+        second = asyncio.ensure_future(self.client.request("GET", hedge_url, **kwargs))
+        pending = {first, second}
+        try:
+            while True:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                succeeded = [task for task in done if task.exception() is None]
+                if succeeded:
+                    if second in succeeded and first not in succeeded:
+                        stats.hedge_wins += 1
+                    return succeeded[0].result()
+                # A failed attempt only counts when the other one failed too.
+                if not pending:
+                    return done.pop().result()
+        finally:
+            for task in pending:
+                task.cancel()
 
     async def close(self):
+        if self._stats.loop_lag is not None:
+            await self._stats.loop_lag.stop()
         if self.client:
             await self.client.aclose()
 
@@ -210,28 +460,50 @@ class AsyncRequestMaker(AsyncRequestBuilderInterface):
     def _construct_params(self, params: dict[str, Any]) -> dict[str, Any]:
         """
         Construct a dictionary of params with only not None values.
+        Lists are sent comma separated, as the API expects them.
         """
         res: dict[str, Any] = {}
         for key, value in params.items():
             if value:
+                if isinstance(value, (list, tuple, set)):
+                    value = ",".join(str(v) for v in value)
                 res[key] = value
         return res
 
+    def _prepare(
+        self,
+        endpoint: str,
+        query_params: Any,
+        path_params: Optional[dict[str, str | int]],
+    ) -> tuple[str, Optional[dict[str, Any]]]:
+        """
+        Return the URL and the query params of a request, `query_params` is a dictionary or
+        query params dataclass (anything with a `to_query_dict` method).
+        """
+        params = None
+        with self.client.timed(endpoint, "serialize"):
+            if hasattr(query_params, "to_query_dict"):
+                query_params = query_params.to_query_dict()
+            if query_params:
+                params = self._construct_params(query_params)
+        with self.client.timed(endpoint, "build"):
+            url = self.client.build_endpoint(endpoint, path_params)
+        return url, params
+
     async def get(
         self,
         endpoint: str,
-        query_params: Optional[dict[str, Any]] = None,
+        query_params: Optional[Any] = None,
         path_params: Optional[dict[str, str | int]] = None,
         **kwargs
     ) -> dict[str, Any]:
         """
         Make a get request and return a dictionary representing the result.
         """
-        params = None
-        if query_params:
-            params = self._construct_params(query_params)
-        endpoint = self.client.build_endpoint(endpoint, path_params)
-        res = await self.client.request("GET", endpoint, params=params, **kwargs)
+        url, params = self._prepare(endpoint, query_params, path_params)
+        res = await self.client.request(
+            "GET", url, params=params, api_path=endpoint, **kwargs
+        )
         return res
 
     async def delete(
@@ -244,11 +516,10 @@ class AsyncRequestMaker(AsyncRequestBuilderInterface):
         """
         Make an delete request and return a dictionary representing the result.
         """
-        params = None
-        if query_params:
-            params = self._construct_params(query_params)
-        endpoint = self.client.build_endpoint(endpoint, path_params)
-        res = await self.client.request("DELETE", endpoint, params=params, **kwargs)
+        url, params = self._prepare(endpoint, query_params, path_params)
+        res = await self.client.request(
+            "DELETE", url, params=params, api_path=endpoint, **kwargs
+        )
         return res
 
     async def post(
@@ -262,12 +533,9 @@ class AsyncRequestMaker(AsyncRequestBuilderInterface):
         """
         Make a post request and return a dictionary representing the result.
         """
-        params = None
-        if query_params:
-            params = self._construct_params(query_params)
-        endpoint = self.client.build_endpoint(endpoint, path_params)
+        url, params = self._prepare(endpoint, query_params, path_params)
         res = await self.client.request(
-            "POST", endpoint, params=params, json=body, **kwargs
+            "POST", url, params=params, json=body, api_path=endpoint, **kwargs
         )
         return res
 
@@ -282,11 +550,10 @@ class AsyncRequestMaker(AsyncRequestBuilderInterface):
         """
         Make a put request and return a dictionary representing the result.
         """
-        params = None
-        if query_params:
-            params = self._construct_params(query_params)
-        endpoint = self.client.build_endpoint(endpoint, path_params)
-        res = await self.client.request("PUT", endpoint, params=params, json=body, **kwargs)
+        url, params = self._prepare(endpoint, query_params, path_params)
+        res = await self.client.request(
+            "PUT", url, params=params, json=body, api_path=endpoint, **kwargs
+        )
         return res
 
 
@@ -0,0 +1,199 @@
+import json
+from typing import Any, Hashable, Iterable, Iterator, List, Optional, TypeVar
+
+from .enums import AgentStatus, GroupConfigStatus
+from .managers.agents import OS, Agent
+
+T = TypeVar("T", bound=Hashable)
+
+# Fields kept serialized and only decoded when accessed.
+RARE_FIELDS = ("registerIp", "mergedSum", "configSum", "dateAdd", "status_code")
+RARE_OS_FIELDS = ("uname",)
+
+
+class ValuePool:
+    """
+    Deduplicate equal immutable values (strings, tuples, ...) so they are stored once.
+    """
+
+    def __init__(self):
+        self._values: dict[Any, Any] = {}
+
+    def get(self, value: T) -> T:
+        if value is None:
+            return value
+        return self._values.setdefault(value, value)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+
+class CompactOS:
+    """
+    Slotted OS, shared by every agent running the same OS (the host specific `uname` is kept aside).
+    """
+
+    __slots__ = ("arch", "minor", "codename", "version", "platform", "name", "major")
+
+    def __init__(self, **kwargs):
+        for name in self.__slots__:
+            setattr(self, name, kwargs.get(name))
+
+    def __repr__(self) -> str:
+        return f"CompactOS(platform={self.platform!r}, version={self.version!r})"
+
+
+class CompactAgent:
+    """
+    Slotted agent holding interned values.
+
+    `status` and `group_config_status` are enum members, `os` and `group` are shared with every agent
+    having the same values, the rarely used fields (RARE_FIELDS and `os.uname`) are kept as compact
+    JSON and decoded on access.
+    """
+
+    __slots__ = (
+        "id",
+        "name",
+        "ip",
+        "status",
+        "group_config_status",
+        "node_name",
+        "manager",
+        "version",
+        "lastKeepAlive",
+        "os",
+        "group",
+        "_rare",
+    )
+
+    def __init__(self, store: "AgentStore", item: dict[str, Any]):
+        pool = store.pool
+        self.id = item.get("id")
+        self.name = item.get("name")
+        self.ip = item.get("ip")
+        status = item.get("status")
+        self.status = store.statuses[status] if status else None
+        group_config_status = item.get("group_config_status")
+        self.group_config_status = (
+            store.group_config_statuses[group_config_status]
+            if group_config_status
+            else None
+        )
+        self.node_name = pool.get(item.get("node_name"))
+        self.manager = pool.get(item.get("manager"))
+        self.version = pool.get(item.get("version"))
+        self.lastKeepAlive = item.get("lastKeepAlive")
+        os = item.get("os") or {}
+        self.os = store.os(os) if os else None
+        group = item.get("group")
+        self.group = pool.get(tuple(pool.get(g) for g in group)) if group else None
+
+        rare = {k: item[k] for k in RARE_FIELDS if k in item}
+        rare.update({f"os.{k}": os[k] for k in RARE_OS_FIELDS if k in os})
+        self._rare = json.dumps(rare, separators=(",", ":")).encode() if rare else None
+
+    def rare_fields(self) -> dict[str, Any]:
+        """
+        Decode the rarely used fields.
+        """
+        return json.loads(self._rare) if self._rare else {}
+
+    @property
+    def registerIp(self) -> Optional[str]:
+        return self.rare_fields().get("registerIp")
+
+    @property
+    def mergedSum(self) -> Optional[str]:
+        return self.rare_fields().get("mergedSum")
+
+    @property
+    def configSum(self) -> Optional[str]:
+        return self.rare_fields().get("configSum")
+
+    @property
+    def dateAdd(self) -> Optional[str]:
+        return self.rare_fields().get("dateAdd")
+
+    @property
+    def uname(self) -> Optional[str]:
+        return self.rare_fields().get("os.uname")
+
+    def to_agent(self) -> Agent:
+        """
+        Materialize the full Agent.
+        """
+        rare = self.rare_fields()
+        os = OS(
+            **{name: getattr(self.os, name, None) for name in CompactOS.__slots__},
+            uname=rare.get("os.uname"),
+        )
+        return Agent(
+            os=os,
+            group_config_status=self.group_config_status,
+            lastKeepAlive=self.lastKeepAlive,
+            dateAdd=rare.get("dateAdd"),
+            node_name=self.node_name,
+            manager=self.manager,
+            registerIp=rare.get("registerIp"),
+            ip=self.ip,
+            mergedSum=rare.get("mergedSum"),
+            group=list(self.group or ()),
+            configSum=rare.get("configSum"),
+            status=self.status,
+            name=self.name,
+            id=self.id,
+            version=self.version,
+            status_code=rare.get("status_code", 0),
+        )
+
+    def __repr__(self) -> str:
+        return f"CompactAgent(id={self.id!r}, name={self.name!r}, status={self.status})"
+
+
+class AgentStore:
+    """
+    Memory efficient collection of agents, e.g. to keep a large fleet in memory.
+
+    Examples:
+        store = AgentStore()
+        params = ListAgentsQueryParams(group_config_status=None, limit=10000)
+        async for page in paginate(agents_manager.list, params):
+            store.extend(page.data["affected_items"])
+        active = [agent for agent in store if agent.status is AgentStatus.ACTIVE]
+    """
+
+    def __init__(self):
+        self.pool = ValuePool()
+        self.statuses = {status.value: status for status in AgentStatus}
+        self.group_config_statuses = {status.value: status for status in GroupConfigStatus}
+        self._os: dict[tuple, CompactOS] = {}
+        self._agents: List[CompactAgent] = []
+
+    def os(self, os: dict[str, Any]) -> CompactOS:
+        key = tuple(os.get(name) for name in CompactOS.__slots__)
+        compact_os = self._os.get(key)
+        if compact_os is None:
+            values = {
+                name: self.pool.get(os.get(name)) for name in CompactOS.__slots__
+            }
+            compact_os = self._os[key] = CompactOS(**values)
+        return compact_os
+
+    def add(self, item: dict[str, Any]) -> CompactAgent:
+        agent = CompactAgent(self, item)
+        self._agents.append(agent)
+        return agent
+
+    def extend(self, items: Iterable[dict[str, Any]]) -> None:
+        for item in items:
+            self.add(item)
+
+    def __iter__(self) -> Iterator[CompactAgent]:
+        return iter(self._agents)
+
+    def __len__(self) -> int:
+        return len(self._agents)
+
+    def __getitem__(self, index: int) -> CompactAgent:
+        return self._agents[index]
@@ -2,6 +2,7 @@ import platform
 
 # Client configuration
 DEFAULT_TIMEOUT = 30
+WAIT_FOR_COMPLETE_TIMEOUT = 300
 DEFAULT_API_PORT = 55000
 DEFAULT_PROTOCOL = "https"
 MAX_RETRIES = 3
@@ -20,3 +21,4 @@ USER_AGENT = f"{SDK_NAME}/0.1.0 (Python/{PYTHON_VERSION}; {SYSTEM}/{MACHINE})"
 DEFAULT_LIMIT = 500
 DEFAULT_OFFSET = 0
 MAX_LIMIT = 1000
+MAX_SERVER_LIMIT = 100000  # Largest `limit` accepted by the API
@@ -0,0 +1,100 @@
+import asyncio
+import json
+import pickle
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, List, Literal, Optional
+
+
+def _decode_in_chunks(content: bytes, chunk_size: int) -> tuple[bytes, List[bytes]]:
+    """
+    Decode a response body and pickle it as its envelope plus chunks of its `affected_items`,
+    so the caller can unpickle it piece by piece.
+    """
+    res = json.loads(content)
+    items = None
+    data = res.get("data") if isinstance(res, dict) else None
+    if isinstance(data, dict) and isinstance(data.get("affected_items"), list):
+        items = data["affected_items"]
+        data["affected_items"] = []
+    chunks = []
+    if items is not None:
+        chunks = [
+            pickle.dumps(items[i : i + chunk_size], protocol=pickle.HIGHEST_PROTOCOL)
+            for i in range(0, len(items), chunk_size)
+        ]
+    return pickle.dumps(res, protocol=pickle.HIGHEST_PROTOCOL), chunks
+
+
+class DecodeOffload:
+    """
+    Decode the JSON bodies of at least `threshold` bytes out of the event loop.
+
+    With `executor="process"` (or a ProcessPoolExecutor), the body is decoded by a worker process
+    and sent back as pickled chunks of `chunk_size` affected items, unpickled one at a time by
+    the loop, which runs other coroutines in between. The decode takes longer overall, but the
+    loop is never blocked for more than one chunk.
+
+    With `executor="thread"` (or any other Executor), `json.loads` runs in a thread. CPython's
+    decoder holds the GIL for the whole call, so this doesn't shorten the loop stalls, it only
+    helps with decoders releasing the GIL (e.g. free-threaded builds).
+    See benchmarks/bench_decode.py.
+
+    Examples:
+        offload = DecodeOffload(threshold=1_000_000, executor="process")
+        async with AsyncWazuhClient(..., decode_offload=offload) as client:
+            ...
+        offload.close()
+    """
+
+    def __init__(
+        self,
+        threshold: int = 1_000_000,
+        executor: Literal["thread", "process"] | Executor = "process",
+        max_workers: Optional[int] = None,
+        chunk_size: int = 1000,
+    ):
+        if not isinstance(executor, Executor) and executor not in ("thread", "process"):
+            raise ValueError("`executor` must be one of: thread, process or an Executor")
+        self.threshold = threshold
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self._kind = executor if isinstance(executor, str) else None
+        self._executor: Optional[Executor] = executor if isinstance(executor, Executor) else None
+        self._owned = not isinstance(executor, Executor)
+        self.offloaded = 0
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            if self._kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="wazuh-decode"
+                )
+        return self._executor
+
+    async def decode(self, content: bytes) -> Any:
+        if len(content) < self.threshold:
+            return json.loads(content)
+        self.offloaded += 1
+        loop = asyncio.get_running_loop()
+        executor = self.executor
+        if not isinstance(executor, ProcessPoolExecutor):
+            return await loop.run_in_executor(executor, json.loads, content)
+
+        envelope, chunks = await loop.run_in_executor(
+            executor, _decode_in_chunks, content, self.chunk_size
+        )
+        res = pickle.loads(envelope)
+        if chunks:
+            items = res["data"]["affected_items"]
+            for chunk in chunks:
+                await asyncio.sleep(0)
+                items.extend(pickle.loads(chunk))
+        return res
+
+    def close(self) -> None:
+        if self._owned and self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
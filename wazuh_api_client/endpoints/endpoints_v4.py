@@ -25,6 +25,9 @@ class V4ApiPaths(Enum):
     RESTART_AGENTS = "/agents/restart"
     SUMMARIZE_AGENTS_OS = "/agents/summary/os"
     SUMMARIZE_AGENTS_STATUS = "/agents/summary/status"
+    UPGRADE_AGENTS = "/agents/upgrade"
+    UPGRADE_AGENTS_CUSTOM = "/agents/upgrade_custom"
+    GET_UPGRADE_RESULTS = "/agents/upgrade_result"
 
     # Syscheck endpoints
     RUN_SCAN = "/syscheck"
@@ -44,5 +47,37 @@ class V4ApiPaths(Enum):
     GET_WAZUH_LOGS = "/manager/logs"
     GET_WAZUH_LOGS_SUMMARY = "/manager/logs/summary"
 
+    # Rules endpoints
+    LIST_RULES = "/rules"
+    LIST_RULES_GROUPS = "/rules/groups"
+    LIST_RULES_REQUIREMENT = "/rules/requirement/{requirement}"
+    LIST_RULES_FILES = "/rules/files"
+    GET_RULES_FILE = "/rules/files/{filename}"
+
+    # Decoders endpoints
+    LIST_DECODERS = "/decoders"
+    LIST_DECODERS_FILES = "/decoders/files"
+    GET_DECODERS_FILE = "/decoders/files/{filename}"
+    LIST_DECODERS_PARENTS = "/decoders/parents"
+
+    # Lists endpoints
+    LIST_CDB_LISTS = "/lists"
+    LIST_CDB_LISTS_FILES = "/lists/files"
+    GET_CDB_LIST_FILE = "/lists/files/{filename}"
+    UPDATE_CDB_LIST_FILE = "/lists/files/{filename}"
+    DELETE_CDB_LIST_FILE = "/lists/files/{filename}"
+
+    # Mitre endpoints
+    GET_MITRE_METADATA = "/mitre/metadata"
+    LIST_MITRE_TECHNIQUES = "/mitre/techniques"
+    LIST_MITRE_TACTICS = "/mitre/tactics"
+    LIST_MITRE_GROUPS = "/mitre/groups"
+    LIST_MITRE_MITIGATIONS = "/mitre/mitigations"
+    LIST_MITRE_SOFTWARE = "/mitre/software"
+    LIST_MITRE_REFERENCES = "/mitre/references"
+
+    # Tasks endpoints
+    GET_TASKS_STATUS = "/tasks/status"
+
     # Authentication endpoint
     GENERATE_TOKEN = "/security/user/authenticate"
\ No newline at end of file
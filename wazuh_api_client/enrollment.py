@@ -0,0 +1,288 @@
+import asyncio
+import csv
+import json
+import os
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+import httpx
+
+from .interfaces import AsyncClientInterface
+from .managers.agents import AgentInsertForce, AgentsManager
+from .utils import RateLimiter
+
+# Tolerated clock difference between this host and the manager when matching the
+# registration time of an agent with the time its registration call was sent.
+CLOCK_SKEW = 5.0
+
+
+@dataclass
+class EnrollmentRecord:
+    name: str
+    ip: Optional[str] = None
+    id: Optional[str] = None
+    key: Optional[str] = None
+
+
+@dataclass
+class EnrollmentResult:
+    name: str
+    id: Optional[str] = None
+    key: Optional[str] = None
+    error: Optional[str] = None
+    # The agent was registered by a previous run that crashed before checkpointing it.
+    recovered: bool = False
+
+
+@dataclass
+class EnrollmentSummary:
+    registered: int = 0
+    recovered: int = 0
+    skipped: int = 0
+    failed: int = 0
+
+
+def read_records(path: str | Path) -> Iterator[EnrollmentRecord]:
+    """
+    Stream enrollment records from a CSV (with a header row) or a JSONL file.
+    Only `name` is mandatory, `ip`, `id` and `key` are optional.
+    """
+    path = Path(path)
+    fields = EnrollmentRecord.__dataclass_fields__
+    with path.open(newline="") as f:
+        if path.suffix.lower() == ".csv":
+            rows: Iterable[dict[str, Any]] = csv.DictReader(f)
+        elif path.suffix.lower() in (".jsonl", ".ndjson"):
+            rows = (json.loads(line) for line in f if line.strip())
+        else:
+            raise ValueError(f"Unsupported records file: {path}, expected .csv or .jsonl")
+        for row in rows:
+            yield EnrollmentRecord(
+                **{k: v for k, v in row.items() if k in fields and v not in (None, "")}
+            )
+
+
+def _timestamp(value: str) -> float:
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+
+
+class JsonlSink:
+    """
+    Append enrollment results to a JSONL file as they arrive.
+    """
+
+    def __init__(self, path: str | Path):
+        self._file = open(path, "a")
+
+    def __call__(self, result: EnrollmentResult) -> None:
+        self._file.write(json.dumps(asdict(result)) + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class Checkpoint:
+    """
+    Journal of the enrollment progress, one JSON line per state change of a record.
+
+    A record is marked `started`, with the time in `sent_at`, right before the registration
+    call and `done` once its result was written to the sink, both are flushed to disk before
+    moving on. A `failed` record keeps `sent_at` only when the manager may have processed the
+    call (e.g. a timeout), not when it refused it.
+    """
+
+    STARTED = "started"
+    DONE = "done"
+    FAILED = "failed"
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.states: dict[str, str] = {}
+        self.sent_at: dict[str, Optional[float]] = {}
+        if self.path.exists():
+            with self.path.open() as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self.states[entry["name"]] = entry["state"]
+                        self.sent_at[entry["name"]] = entry.get("sent_at")
+        self._file = self.path.open("a")
+
+    def mark(self, name: str, state: str, sent_at: Optional[float] = None) -> None:
+        self.states[name] = state
+        self.sent_at[name] = sent_at
+        entry: dict[str, Any] = {"name": name, "state": state}
+        if sent_at is not None:
+            entry["sent_at"] = sent_at
+        self._file.write(json.dumps(entry) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class BulkEnrollment:
+    """
+    Register agents concurrently at a bounded rate, resuming from a checkpoint.
+
+    Records with an `id` and a `key` are registered with `add_agent_full`, the others with `add`,
+    both honour `force`. Without `force` nor `ip`, `add_agent_quick` is used.
+
+    Records already `done` in the checkpoint are skipped. Records whose registration call was
+    sent but not answered (left `started` by a crash, or `failed` with a timeout) are looked up
+    first: an agent with the same name and registration IP, added after the call was sent, is
+    the one the call registered and its key is fetched instead of registering it twice. Calls
+    the manager refused (e.g. a name already in use) are never recovered.
+
+    Examples:
+        sink = JsonlSink("keys.jsonl")
+        enrollment = BulkEnrollment(client, "enrollment.checkpoint", sink=sink, rate=50)
+        summary = await enrollment.run(read_records("site.csv"))
+    """
+
+    def __init__(
+        self,
+        client: AsyncClientInterface,
+        checkpoint_path: str | Path,
+        sink: Optional[Callable[[EnrollmentResult], Any]] = None,
+        concurrency: int = 16,
+        rate: float = 50.0,
+        force: Optional[AgentInsertForce] = None,
+    ):
+        self.agents_manager = AgentsManager(client)
+        self.checkpoint_path = checkpoint_path
+        self.sink = sink
+        self.concurrency = concurrency
+        self.rate_limiter = RateLimiter(rate, burst=concurrency)
+        self.force = force
+
+    async def run(self, records: Iterable[EnrollmentRecord]) -> EnrollmentSummary:
+        summary = EnrollmentSummary()
+        checkpoint = Checkpoint(self.checkpoint_path)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        in_flight: set[str] = set()
+        tasks: set[asyncio.Task] = set()
+        errors: list[BaseException] = []
+
+        def task_done(task: asyncio.Task) -> None:
+            tasks.discard(task)
+            if not task.cancelled() and task.exception() is not None:
+                errors.append(task.exception())  # type: ignore[arg-type]
+
+        async def enroll(record: EnrollmentRecord, previous: Optional[str]):
+            registering = False
+            try:
+                result = None
+                sent_at = checkpoint.sent_at.get(record.name)
+                if previous in (Checkpoint.STARTED, Checkpoint.FAILED) and sent_at is not None:
+                    result = await self._recover(record, sent_at)
+                if result is None:
+                    await self.rate_limiter.acquire()
+                    sent_at = time.time()
+                    checkpoint.mark(record.name, Checkpoint.STARTED, sent_at)
+                    registering = True
+                    result = await self._register(record)
+            except Exception as e:
+                if (
+                    registering
+                    and isinstance(e, httpx.HTTPStatusError)
+                    and e.response.status_code < 500
+                ):
+                    # Refused by the manager, nothing was registered.
+                    sent_at = None
+                result = EnrollmentResult(name=record.name, error=str(e) or repr(e))
+            finally:
+                semaphore.release()
+                in_flight.discard(record.name)
+
+            if self.sink:
+                outcome = self.sink(result)
+                if asyncio.iscoroutine(outcome):
+                    await outcome
+            if result.error:
+                summary.failed += 1
+                checkpoint.mark(record.name, Checkpoint.FAILED, sent_at)
+            else:
+                if result.recovered:
+                    summary.recovered += 1
+                else:
+                    summary.registered += 1
+                checkpoint.mark(record.name, Checkpoint.DONE)
+
+        try:
+            for record in records:
+                if errors:
+                    break
+                previous = checkpoint.states.get(record.name)
+                if previous == Checkpoint.DONE or record.name in in_flight:
+                    summary.skipped += 1
+                    continue
+                # Acquire before creating the task so the input is consumed lazily.
+                await semaphore.acquire()
+                in_flight.add(record.name)
+                task = asyncio.create_task(enroll(record, previous))
+                tasks.add(task)
+                task.add_done_callback(task_done)
+            if tasks and not errors:
+                await asyncio.gather(*tasks)
+            if errors:
+                raise errors[0]
+        finally:
+            # A failing sink stops the run, the other tasks must not write a closed checkpoint.
+            pending = list(tasks)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            checkpoint.close()
+        return summary
+
+    async def _recover(
+        self, record: EnrollmentRecord, sent_at: float
+    ) -> Optional[EnrollmentResult]:
+        """
+        Return the result of a record registered by a previous run, None if it was not registered.
+        """
+        await self.rate_limiter.acquire()
+        response = await self.agents_manager.list(
+            name=record.name,
+            select=["id", "name", "registerIP", "dateAdd"],
+            group_config_status=None,
+        )
+        candidates = [
+            item
+            for item in response.data["affected_items"]
+            if item.get("registerIP") == (record.ip or "any")
+            and (not record.id or item["id"] == record.id)
+            and item.get("dateAdd")
+            and _timestamp(item["dateAdd"]) >= sent_at - CLOCK_SKEW
+        ]
+        if not candidates:
+            return None
+        agent_id = max(candidates, key=lambda item: _timestamp(item["dateAdd"]))["id"]
+        await self.rate_limiter.acquire()
+        key_response = await self.agents_manager.get_key(agent_id)
+        key = key_response.data["affected_items"][0]["key"]
+        return EnrollmentResult(name=record.name, id=agent_id, key=key, recovered=True)
+
+    async def _register(self, record: EnrollmentRecord) -> EnrollmentResult:
+        if record.id and record.key:
+            response = await self.agents_manager.add_agent_full(
+                id=record.id,
+                key=record.key,
+                name=record.name,
+                ip=record.ip or "any",
+                force=self.force or AgentInsertForce(enabled=False),
+            )
+        elif record.ip or self.force:
+            response = await self.agents_manager.add(
+                name=record.name, ip=record.ip or "any", force=self.force
+            )
+        else:
+            response = await self.agents_manager.add_agent_quick(record.name)
+        data = response.data
+        return EnrollmentResult(name=record.name, id=data["id"], key=data["key"])
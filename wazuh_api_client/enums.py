@@ -69,6 +69,22 @@ class AgentConfiguration(Enum):
 class DaemonsList(Enum):
     WAZUH_ANALYSISD = "wazuh-analysisd"
     WAZUH_REMOTED = "wazuh-remoted"
+    WAZUH_DB = "wazuh-db"
+
+    def __str__(self):
+        return self.value
+
+
+class LogLevel(Enum):
+    CRITICAL = "critical"
+    DEBUG = "debug"
+    DEBUG2 = "debug2"
+    ERROR = "error"
+    INFO = "info"
+    WARNING = "warning"
+
+    def __str__(self):
+        return self.value
 
 
 class StatsComponent(Enum):
@@ -80,3 +96,48 @@ class SysCheckScanType(Enum):
     FILE = "file"
     REGISTRY_KEY = "registry_key"
     REGISTRY_VALUE = "registry_value"
+
+
+class TaskStatus(Enum):
+    PENDING = "Pending"
+    IN_PROGRESS = "In progress"
+    DONE = "Done"
+    FAILED = "Failed"
+    TIMEOUT = "Timeout"
+    CANCELLED = "Cancelled"
+    LEGACY = "Legacy"
+
+    def __str__(self):
+        return self.value
+
+
+class AggregationPlan(Enum):
+    SUMMARY_STATUS = "summary_status"
+    SUMMARY_OS = "summary_os"
+    DISTINCT = "distinct"
+    SCAN = "scan"
+
+    def __str__(self):
+        return self.value
+
+
+class RulesetStatus(Enum):
+    ENABLED = "enabled"
+    DISABLED = "disabled"
+    ALL = "all"
+
+    def __str__(self):
+        return self.value
+
+
+class RuleRequirement(Enum):
+    PCI_DSS = "pci_dss"
+    GDPR = "gdpr"
+    HIPAA = "hipaa"
+    NIST_800_53 = "nist-800-53"
+    GPG13 = "gpg13"
+    TSC = "tsc"
+    MITRE = "mitre"
+
+    def __str__(self):
+        return self.value
@@ -6,6 +6,10 @@ class WazuhConnectionError(WazuhError):
     """Exception raised for errors in the connection."""
     pass
 
+class WazuhTimeoutError(WazuhConnectionError):
+    """Exception raised when a request times out."""
+    pass
+
 class WazuhAuthenticationError(WazuhError):
     """Exception raised for authentication errors."""
     pass
@@ -0,0 +1,266 @@
+import asyncio
+import csv
+import json
+import struct
+import sys
+from abc import ABC, abstractmethod
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Any, AsyncIterator, Iterator, List, Optional
+
+from .interfaces import AsyncClientInterface
+from .managers.agents import AgentsManager, ListAgentsQueryParams
+from .managers.syscheck import ScanResultParams, SysCheckManager
+from .pagination import paginate
+from .response import APIResponse
+from .utils import _is_number, flatten_dict
+
+COLUMNAR_MAGIC = b"WZCOL\x01"
+NUMBER = "f8"
+STRING = "str"
+
+
+def _cell(value: Any) -> Any:
+    """
+    Scalar representation of a flattened value, lists are joined with commas.
+    """
+    if isinstance(value, list):
+        return ",".join(str(v) for v in value)
+    return value
+
+
+class Exporter(ABC):
+    """
+    Base class of the exporters, pages of items are written with `write_page` and the output is
+    finalized with `close`. `write_page` is blocking, `export` runs it in a worker thread.
+    """
+
+    def __init__(self, output: str | Path | IO, mode: str = "w"):
+        if isinstance(output, (str, Path)):
+            self._file = open(output, mode, **({} if "b" in mode else {"newline": ""}))
+            self._owned = True
+        else:
+            self._file = output
+            self._owned = False
+
+    @abstractmethod
+    def write_page(self, items: List[dict[str, Any]]) -> None:
+        pass
+
+    def close(self) -> None:
+        self._file.flush()
+        if self._owned:
+            self._file.close()
+
+
+class JsonlExporter(Exporter):
+    """
+    One JSON object per line.
+    """
+
+    def write_page(self, items: List[dict[str, Any]]) -> None:
+        self._file.write("".join(json.dumps(item) + "\n" for item in items))
+
+
+class CsvExporter(Exporter):
+    """
+    CSV with a header row, nested fields are flattened with dot notation (e.g. os.platform).
+    Columns are `fields`, or the keys of the first page when not given.
+    """
+
+    def __init__(self, output: str | Path | IO, fields: Optional[List[str]] = None):
+        super().__init__(output)
+        self.fields = fields
+        self._writer: Optional[csv.DictWriter] = None
+
+    def write_page(self, items: List[dict[str, Any]]) -> None:
+        rows = [flatten_dict(item) for item in items]
+        if self._writer is None:
+            if self.fields is None:
+                self.fields = list(dict.fromkeys(key for row in rows for key in row))
+            self._writer = csv.DictWriter(
+                self._file, fieldnames=self.fields, extrasaction="ignore"
+            )
+            self._writer.writeheader()
+        self._writer.writerows(
+            {key: _cell(value) for key, value in row.items()} for row in rows
+        )
+
+
+class ColumnarExporter(Exporter):
+    """
+    Column oriented binary layout, written one batch per page:
+
+        header: magic b"WZCOL\\x01", uint32 length, JSON schema {"columns": [{"name", "type"}]}
+        batch:  b"B", uint32 rows, then for each column:
+                    null mask (one byte per row, 1 when null)
+                    f8 columns:  rows little endian float64
+                    str columns: rows + 1 uint32 offsets then the UTF-8 data
+        end:    b"E"
+
+    Numeric columns can be mapped straight into numpy with `numpy.frombuffer`.
+    The schema comes from `fields` or the first page, use `read_columnar` to read the file back.
+    A later non numeric value in a f8 column is written as null and counted in `mismatches`
+    (per column), check it after the export.
+    """
+
+    def __init__(self, output: str | Path | IO, fields: Optional[List[str]] = None):
+        super().__init__(output, mode="wb")
+        self.fields = fields
+        self.schema: Optional[List[tuple[str, str]]] = None
+        self.mismatches: dict[str, int] = {}
+
+    def _write_schema(self, rows: List[dict[str, Any]]) -> None:
+        fields = self.fields or list(dict.fromkeys(key for row in rows for key in row))
+        schema = []
+        for name in fields:
+            values = [row.get(name) for row in rows if row.get(name) is not None]
+            numeric = bool(values) and all(_is_number(v) for v in values)
+            schema.append((name, NUMBER if numeric else STRING))
+        header = json.dumps(
+            {"columns": [{"name": name, "type": kind} for name, kind in schema]}
+        ).encode()
+        self._file.write(COLUMNAR_MAGIC + struct.pack("<I", len(header)) + header)
+        self.schema = schema
+
+    def write_page(self, items: List[dict[str, Any]]) -> None:
+        rows = [flatten_dict(item) for item in items]
+        if self.schema is None:
+            self._write_schema(rows)
+        assert self.schema is not None
+        chunks = [b"B", struct.pack("<I", len(rows))]
+        for name, kind in self.schema:
+            values = [_cell(row.get(name)) for row in rows]
+            if kind == NUMBER:
+                mismatches = sum(1 for v in values if v is not None and not _is_number(v))
+                if mismatches:
+                    self.mismatches[name] = self.mismatches.get(name, 0) + mismatches
+                values = [v if _is_number(v) else None for v in values]
+            chunks.append(bytes(1 if v is None else 0 for v in values))
+            if kind == NUMBER:
+                # Nulls are NaN in the data, the mask tells them apart.
+                column = array("d", (float("nan") if v is None else float(v) for v in values))
+                if sys.byteorder == "big":
+                    column.byteswap()
+                chunks.append(column.tobytes())
+            else:
+                encoded = [b"" if v is None else str(v).encode() for v in values]
+                offsets = array("I", [0])
+                for data in encoded:
+                    offsets.append(offsets[-1] + len(data))
+                if sys.byteorder == "big":
+                    offsets.byteswap()
+                chunks.append(offsets.tobytes())
+                chunks.append(b"".join(encoded))
+        self._file.write(b"".join(chunks))
+
+    def close(self) -> None:
+        self._file.write(b"E")
+        super().close()
+
+
+def read_columnar(path: str | Path) -> Iterator[dict[str, List[Any]]]:
+    """
+    Read back a file written by ColumnarExporter, yielding one dictionary of columns per batch.
+    """
+    with open(path, "rb") as f:
+        if f.read(len(COLUMNAR_MAGIC)) != COLUMNAR_MAGIC:
+            raise ValueError(f"{path} is not a columnar export")
+        (length,) = struct.unpack("<I", f.read(4))
+        schema = json.loads(f.read(length))["columns"]
+        while f.read(1) == b"B":
+            (rows,) = struct.unpack("<I", f.read(4))
+            batch: dict[str, List[Any]] = {}
+            for column in schema:
+                mask = f.read(rows)
+                if column["type"] == NUMBER:
+                    values: Any = array("d")
+                    values.frombytes(f.read(rows * 8))
+                    if sys.byteorder == "big":
+                        values.byteswap()
+                    values = list(values)
+                else:
+                    offsets = array("I")
+                    offsets.frombytes(f.read((rows + 1) * 4))
+                    if sys.byteorder == "big":
+                        offsets.byteswap()
+                    data = f.read(offsets[-1])
+                    values = [
+                        data[offsets[i] : offsets[i + 1]].decode() for i in range(rows)
+                    ]
+                batch[column["name"]] = [
+                    None if mask[i] else values[i] for i in range(rows)
+                ]
+            yield batch
+
+
+@dataclass
+class ExportStats:
+    pages: int = 0
+    items: int = 0
+
+
+async def export(pages: AsyncIterator[APIResponse], exporter: Exporter) -> ExportStats:
+    """
+    Write every page of `pages` with `exporter`.
+
+    Each page is written in a worker thread while the next one is fetched, at most two pages
+    are held in memory whatever the size of the listing.
+    """
+    stats = ExportStats()
+    writing: Optional[asyncio.Future] = None
+    try:
+        async for page in pages:
+            items = page.data["affected_items"]
+            if writing is not None:
+                await writing
+            writing = asyncio.ensure_future(asyncio.to_thread(exporter.write_page, items))
+            stats.pages += 1
+            stats.items += len(items)
+        if writing is not None:
+            await writing
+    finally:
+        # The worker thread can't be interrupted, let it finish before closing the file.
+        if writing is not None:
+            await asyncio.gather(writing, return_exceptions=True)
+        exporter.close()
+    return stats
+
+
+async def export_agents(
+    client: AsyncClientInterface,
+    exporter: Exporter,
+    params: Optional[ListAgentsQueryParams] = None,
+) -> ExportStats:
+    """
+    Export the agents listing, page by page. By default every agent is exported, whatever
+    its group configuration status.
+
+    Examples:
+        params = ListAgentsQueryParams(
+            select=["name", "status", "os.platform"], group_config_status=None, limit=5000
+        )
+        await export_agents(client, CsvExporter("agents.csv"), params)
+    """
+    agents_manager = AgentsManager(client)
+    return await export(
+        paginate(agents_manager.list, params or ListAgentsQueryParams(group_config_status=None)),
+        exporter,
+    )
+
+
+async def export_syscheck(
+    client: AsyncClientInterface,
+    agent_id: str,
+    exporter: Exporter,
+    params: Optional[ScanResultParams] = None,
+) -> ExportStats:
+    """
+    Export the FIM findings of an agent, page by page.
+    """
+    syscheck_manager = SysCheckManager(client)
+    return await export(
+        paginate(syscheck_manager.get_results, params or ScanResultParams(), agent_id),
+        exporter,
+    )
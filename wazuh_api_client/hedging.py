@@ -0,0 +1,63 @@
+from itertools import cycle
+from typing import List, Optional
+
+from .latency import LatencyWindow
+
+
+class HedgePolicy:
+    """
+    Opt-in hedging of idempotent (GET) requests.
+
+    When a request has not answered within the `percentile` of the recent latencies of its
+    endpoint (at least `min_delay` seconds), a duplicate is sent and the first response wins.
+    The duplicate goes to the next of `base_urls` (other nodes of the cluster) when given,
+    otherwise to another connection of the pool.
+
+    Hedges are paid from a budget earning `max_fraction` of a hedge per request, so they never
+    exceed that fraction of the traffic, with bursts of up to `max_burst` hedges.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 0.95,
+        max_fraction: float = 0.05,
+        min_delay: float = 0.05,
+        min_samples: int = 20,
+        max_burst: float = 10.0,
+        base_urls: Optional[List[str]] = None,
+    ):
+        if not 0 < max_fraction <= 1:
+            raise ValueError("max_fraction must be > 0 and <= 1")
+        self.percentile = percentile
+        self.max_fraction = max_fraction
+        self.min_delay = min_delay
+        self.min_samples = min_samples
+        self.max_burst = max_burst
+        self._budget = 0.0
+        self._base_urls = cycle([url.rstrip("/") for url in base_urls]) if base_urls else None
+
+    def on_request(self) -> None:
+        self._budget = min(self.max_burst, self._budget + self.max_fraction)
+
+    def delay(self, latency: LatencyWindow) -> Optional[float]:
+        """
+        Return how long to wait before hedging, None when there is not enough history to tell.
+        """
+        if len(latency) < self.min_samples:
+            return None
+        observed = latency.percentile(self.percentile) or 0.0
+        return max(self.min_delay, observed)
+
+    def try_acquire(self) -> bool:
+        if self._budget < 1:
+            return False
+        self._budget -= 1
+        return True
+
+    def hedge_url(self, url: str, base_url: str) -> str:
+        """
+        Return the URL the duplicate of a request to `url` is sent to.
+        """
+        if self._base_urls is None or not url.startswith(base_url):
+            return url
+        return next(self._base_urls) + url[len(base_url):]
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from contextlib import AbstractContextManager, nullcontext
 from typing import Coroutine, Any, Optional
 
 
@@ -35,6 +36,12 @@ class AsyncClientInterface(ABC):
         """
         pass
 
+    def timed(self, api_path: str, phase: str) -> AbstractContextManager:
+        """
+        Context manager timing a phase of a request to `api_path`, a no-op unless instrumented.
+        """
+        return nullcontext()
+
 
 class AsyncRequestBuilderInterface(ABC):
     def __init__(self, client: AsyncClientInterface):
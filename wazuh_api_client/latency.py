@@ -0,0 +1,173 @@
+import asyncio
+import math
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+
+class LatencyWindow:
+    """
+    Rolling window of the last `size` observed latencies, in seconds.
+    """
+
+    def __init__(self, size: int = 256):
+        self._samples: deque[float] = deque(maxlen=size)
+
+    def add(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        Return the `q` percentile (0 < q <= 1) of the window, None if it is empty.
+        """
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))
+        return ordered[index]
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+
+# Client side phases of a request, timed with `instrumentation` (see AsyncWazuhClient).
+PHASES = ("build", "serialize", "send", "decode")
+
+
+@dataclass
+class PhaseStats:
+    """
+    Time spent in one phase of the requests to an endpoint, in seconds.
+    """
+
+    calls: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+    def add(self, seconds: float) -> None:
+        self.calls += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def snapshot(self) -> dict[str, Any]:
+        return dict(
+            calls=self.calls,
+            total=self.total,
+            mean=self.total / self.calls if self.calls else None,
+            max=self.max,
+        )
+
+
+@dataclass
+class EndpointStats:
+    requests: int = 0
+    errors: int = 0
+    timeouts: int = 0
+    hedges: int = 0
+    hedge_wins: int = 0
+    latency: LatencyWindow = field(default_factory=LatencyWindow)
+    phases: dict[str, PhaseStats] = field(default_factory=dict)
+
+    def phase(self, name: str) -> PhaseStats:
+        stats = self.phases.get(name)
+        if stats is None:
+            stats = self.phases[name] = PhaseStats()
+        return stats
+
+    def snapshot(self) -> dict[str, Any]:
+        res = dict(
+            requests=self.requests,
+            errors=self.errors,
+            timeouts=self.timeouts,
+            hedges=self.hedges,
+            hedge_wins=self.hedge_wins,
+            p50=self.latency.percentile(0.5),
+            p90=self.latency.percentile(0.9),
+            p99=self.latency.percentile(0.99),
+        )
+        if self.phases:
+            res["phases"] = {
+                name: self.phases[name].snapshot() for name in PHASES if name in self.phases
+            }
+        return res
+
+
+class LoopLagMonitor:
+    """
+    Sample the lag of the running event loop: a task sleeps `interval` seconds and records how
+    late it wakes up. A lag of more than a few milliseconds means some callback blocked the loop.
+
+    Examples:
+        monitor = LoopLagMonitor()
+        monitor.start()
+        ...
+        print(monitor.snapshot())
+        await monitor.stop()
+    """
+
+    def __init__(self, interval: float = 0.05, window: int = 1024):
+        self.interval = interval
+        self.samples = 0
+        self.max = 0.0
+        self.total = 0.0
+        self.lag = LatencyWindow(window)
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.perf_counter() - expected)
+            self.samples += 1
+            self.total += lag
+            self.max = max(self.max, lag)
+            self.lag.add(lag)
+
+    def snapshot(self) -> dict[str, Any]:
+        return dict(
+            samples=self.samples,
+            mean=self.total / self.samples if self.samples else None,
+            p50=self.lag.percentile(0.5),
+            p99=self.lag.percentile(0.99),
+            max=self.max,
+        )
+
+
+class ClientStats:
+    """
+    Per endpoint statistics of a client, keyed by the API path template (e.g. /agents/{agent_id}/key).
+    """
+
+    def __init__(self):
+        self.endpoints: dict[str, EndpointStats] = {}
+        self.loop_lag: Optional[LoopLagMonitor] = None
+
+    def endpoint(self, api_path: str) -> EndpointStats:
+        stats = self.endpoints.get(api_path)
+        if stats is None:
+            stats = self.endpoints[api_path] = EndpointStats()
+        return stats
+
+    def snapshot(self) -> dict[str, Any]:
+        res: dict[str, Any] = {
+            "endpoints": {
+                path: stats.snapshot() for path, stats in self.endpoints.items()
+            }
+        }
+        if self.loop_lag is not None:
+            res["loop_lag"] = self.loop_lag.snapshot()
+        return res
@@ -1,5 +1,19 @@
 from .agents import AgentsManager
+from .decoders import DecodersManager
+from .lists import ListsManager
+from .mitre import MitreManager
+from .rules import RulesManager
 from .syscheck import SysCheckManager
+from .tasks import TasksManager
 from .wazuh import WazuhManager
 
-__all__ = ["AgentsManager", "SysCheckManager", "WazuhManager"]
+__all__ = [
+    "AgentsManager",
+    "DecodersManager",
+    "ListsManager",
+    "MitreManager",
+    "RulesManager",
+    "SysCheckManager",
+    "TasksManager",
+    "WazuhManager",
+]
@@ -1,5 +1,5 @@
 from typing import Optional, Any, List, Literal
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field, replace
 from ..enums import (
     AgentStatus,
     GroupConfigStatus,
@@ -10,7 +10,7 @@ from ..enums import (
 from ..interfaces import AsyncClientInterface, ResourceManagerInterface
 from ..client import AsyncRequestMaker
 from ..endpoints.endpoints_v4 import V4ApiPaths
-from ..query import ToDictDataClass, PaginationQueryParams, CommonQueryParams
+from ..query import ToDictDataClass, PaginationQueryParams, CommonQueryParams, apply_kwargs
 from ..response import APIResponse, AddAgentResponse, AgentConfigurationResponse, ResponseData
 
 
@@ -130,6 +130,7 @@ class AddAgentQueryParams(ToDictDataClass):
 class AddAgentBodyParams(ToDictDataClass):
     name: str
     ip: Optional[str] = None
+    force: Optional["AgentInsertForce"] = None
 
 
 @dataclass(kw_only=True)
@@ -145,6 +146,40 @@ class AgentInsertForce(ToDictDataClass):
     after_registration_time: str = "1h"
 
 
+@dataclass(kw_only=True)
+class AgentsFilterQueryParams(ToDictDataClass):
+    pretty: bool = False
+    wait_for_complete: bool = False
+    q: Optional[str] = None  # Query string (e.g. 'status=active')
+    manager: Optional[str] = None
+    version: Optional[str] = None
+    group: Optional[str] = None
+    node_name: Optional[str] = None
+    name: Optional[str] = None
+    ip: Optional[str] = None
+    registerIP: Optional[str] = None
+
+
+@dataclass(kw_only=True)
+class UpgradeAgentsQueryParams(AgentsFilterQueryParams):
+    wpk_repo: Optional[str] = None  # WPK repository
+    upgrade_version: Optional[str] = None  # Wazuh version to upgrade to
+    use_http: bool = False  # Use protocol http, https is used by default
+    force: bool = False  # Force upgrade
+    package_type: Optional[str] = None  # rpm or deb, by default the manager picks it
+
+
+@dataclass(kw_only=True)
+class UpgradeAgentsCustomQueryParams(AgentsFilterQueryParams):
+    file_path: str  # Full path to the WPK file, it must be in the manager
+    installer: Optional[str] = None  # Installation script
+
+
+@dataclass(kw_only=True)
+class UpgradeResultsQueryParams(AgentsFilterQueryParams):
+    pass
+
+
 @dataclass
 class OS:
     arch: str
@@ -178,6 +213,94 @@ class Agent:
     status_code: int = 0
 
 
+@dataclass
+class PartialOS:
+    arch: Optional[str] = None
+    minor: Optional[str] = None
+    codename: Optional[str] = None
+    version: Optional[str] = None
+    platform: Optional[str] = None
+    uname: Optional[str] = None
+    name: Optional[str] = None
+    major: Optional[str] = None
+
+
+@dataclass
+class PartialAgent:
+    """
+    Agent holding only the fields that were selected, the others are left to None.
+    """
+
+    id: Optional[str] = None
+    name: Optional[str] = None
+    status: Optional[AgentStatus] = None
+    os: Optional[PartialOS] = None
+    group_config_status: Optional[GroupConfigStatus] = None
+    lastKeepAlive: Optional[str] = None
+    dateAdd: Optional[str] = None
+    node_name: Optional[str] = None
+    manager: Optional[str] = None
+    registerIp: Optional[str] = None
+    ip: Optional[str] = None
+    mergedSum: Optional[str] = None
+    group: Optional[List[str]] = None
+    configSum: Optional[str] = None
+    version: Optional[str] = None
+    status_code: Optional[int] = None
+
+
+class AgentProjection:
+    """
+    Project agents listings on a set of fields.
+
+    `select` is the value to send in the `select` query parameter and `decode` builds a
+    PartialAgent out of a listed agent, nested fields use dot notation (e.g. os.platform).
+
+    Examples:
+        projection = AgentProjection(["name", "status", "os.platform"])
+        projection.select  # ['name', 'status', 'os.platform']
+    """
+
+    def __init__(self, fields: List[str]):
+        if not fields:
+            raise ValueError("At least one field must be projected.")
+        for name in fields:
+            parent, _, child = name.partition(".")
+            valid = parent in PartialAgent.__dataclass_fields__ and (
+                not child or (parent == "os" and child in PartialOS.__dataclass_fields__)
+            )
+            if not valid:
+                raise ValueError(
+                    f"Invalid field: {name}, fields must be one of : {list(PartialAgent.__dataclass_fields__.keys())} or os.<{'|'.join(PartialOS.__dataclass_fields__)}>"
+                )
+        self.fields = list(fields)
+        self.select = list(fields)
+        # The id is always returned by the API, whether it is selected or not.
+        self._top_level = list(dict.fromkeys(["id"] + [f.partition(".")[0] for f in fields]))
+
+    def decode(self, item: dict[str, Any]) -> PartialAgent:
+        values: dict[str, Any] = {}
+        for key in self._top_level:
+            value = item.get(key)
+            if value is None:
+                continue
+            if key == "os":
+                value = PartialOS(
+                    **{k: v for k, v in value.items() if k in PartialOS.__dataclass_fields__}
+                )
+            elif key == "status":
+                value = AgentStatus(value)
+            elif key == "group_config_status":
+                value = GroupConfigStatus(value)
+            values[key] = value
+        return PartialAgent(**values)
+
+
+@dataclass
+class ProjectedAgentsResponse(APIResponse):
+    items: List[PartialAgent] = field(default_factory=list)
+
+
 @dataclass
 class AgentResponseData(ResponseData):
     affected_items: List[Agent]
@@ -224,11 +347,40 @@ class AgentsManager(ResourceManagerInterface):
                         f"Invalid parameter: {param}, keywork argument must be one of : {list(ListAgentsQueryParams.__dataclass_fields__.keys())}"
                     )
                 setattr(list_agent_params, param, value)
-        params = list_agent_params.to_query_dict()
-        res = await self.async_request_builder.get(endpoint, params)
+        # Serialized by the request builder, which times it when instrumented.
+        res = await self.async_request_builder.get(endpoint, list_agent_params)
         response = APIResponse(**res)
         return response
 
+    async def list_projected(
+        self,
+        fields: List[str],
+        list_agent_params: Optional[ListAgentsQueryParams] = None,
+        **kwargs,
+    ) -> ProjectedAgentsResponse:
+        """
+        Retrieve a list of agents holding only `fields`, the `select` parameter is set from them.
+
+        This method accepts the same parameters as `list`, the listed agents are available as
+        PartialAgent instances in the `items` attribute of the response.
+
+        Examples:
+            response = await client.list_projected(["name", "os.platform"], status=[AgentStatus.ACTIVE])
+            platforms = [agent.os.platform for agent in response.items]
+        """
+        projection = AgentProjection(fields)
+        if not list_agent_params:
+            list_agent_params = ListAgentsQueryParams()
+        list_agent_params = replace(list_agent_params, select=projection.select)
+        response = await self.list(list_agent_params, **kwargs)
+        projected = ProjectedAgentsResponse(
+            message=response.message, error=response.error, data=response.data
+        )
+        projected.items = [
+            projection.decode(item) for item in response.data["affected_items"]
+        ]
+        return projected
+
     async def list_distinct(
         self,
         fields: Optional[List[str]] = None,
@@ -401,18 +553,23 @@ class AgentsManager(ResourceManagerInterface):
         ip: str,
         pretty: bool = False,
         wait_for_complete: bool = False,
+        force: Optional[AgentInsertForce] = None,
     ) -> AddAgentResponse:
         """
         Add a new agent.
+        If an agent with the same name or the same IP already exists, replace it using the force parameter.
         """
-        add_agent_request_body = AddAgentBodyParams(name=name, ip=ip)
+        add_agent_request_body = AddAgentBodyParams(name=name, ip=ip, force=force)
         add_agent_query_params = AddAgentQueryParams(
             pretty=pretty, wait_for_complete=wait_for_complete
         )
+        body = {
+            k: v for k, v in asdict(add_agent_request_body).items() if v is not None
+        }
         res = await self.async_request_builder.post(
             V4ApiPaths.ADD_AGENT.value,
             query_params=add_agent_query_params,
-            body=add_agent_request_body.to_query_dict(),
+            body=body,
         )
         response = AddAgentResponse(**res)
         return response
@@ -593,11 +750,65 @@ class AgentsManager(ResourceManagerInterface):
         response = APIResponse(**res)
         return response
 
-    def upgrade_agents(self):
-        raise NotImplementedError()
+    async def _upgrade(
+        self,
+        endpoint: str,
+        agents_list: List[str],
+        params: AgentsFilterQueryParams,
+        **kwargs,
+    ) -> APIResponse:
+        params = apply_kwargs(params, kwargs)
+        query_params: dict[str, Any] = params.to_query_dict()
+        query_params["agents_list"] = agents_list
+        res = await self.async_request_builder.put(endpoint, query_params=query_params)
+        response = APIResponse(**res)
+        return response
 
-    def upgrade_agents_custom(self):
-        raise NotImplementedError()
+    async def upgrade_agents(
+        self,
+        agents_list: List[str],
+        upgrade_agents_params: Optional[UpgradeAgentsQueryParams] = None,
+        **kwargs,
+    ) -> APIResponse:
+        """
+        Upgrade agents using a WPK file from an online repository.
+        Each affected item holds the `agent` id and the `task_id` of its upgrade,
+        its progress is tracked with the tasks status or `get_upgrade_results`.
+
+        https://documentation.wazuh.com/current/user-manual/api/reference.html#operation/api.controllers.agent_controller.put_upgrade_agents
+        """
+        if not upgrade_agents_params:
+            upgrade_agents_params = UpgradeAgentsQueryParams()
+        return await self._upgrade(
+            V4ApiPaths.UPGRADE_AGENTS.value, agents_list, upgrade_agents_params, **kwargs
+        )
+
+    async def upgrade_agents_custom(
+        self,
+        agents_list: List[str],
+        file_path: str,
+        installer: Optional[str] = None,
+        upgrade_agents_custom_params: Optional[UpgradeAgentsCustomQueryParams] = None,
+        **kwargs,
+    ) -> APIResponse:
+        """
+        Upgrade agents using a local WPK file.
+
+        https://documentation.wazuh.com/current/user-manual/api/reference.html#operation/api.controllers.agent_controller.put_upgrade_custom_agents
+        """
+        if not upgrade_agents_custom_params:
+            upgrade_agents_custom_params = UpgradeAgentsCustomQueryParams(
+                file_path=file_path
+            )
+        upgrade_agents_custom_params.file_path = file_path
+        if installer:
+            upgrade_agents_custom_params.installer = installer
+        return await self._upgrade(
+            V4ApiPaths.UPGRADE_AGENTS_CUSTOM.value,
+            agents_list,
+            upgrade_agents_custom_params,
+            **kwargs,
+        )
 
     def check_user_permission_to_uninstall_agents(self):
         raise NotImplementedError()
@@ -683,7 +894,7 @@ class AgentsManager(ResourceManagerInterface):
         params: dict[str, bool] = dict(
             pretty=pretty, wait_for_complete=wait_for_complete
         )
-        force_data = force.to_query_dict()
+        force_data = asdict(force)
         body: dict[str, Any] = dict(id=id, key=key, name=name, ip=ip, force=force_data)
         res = await self.async_request_builder.post(
             V4ApiPaths.ADD_AGENT_FULL.value, query_params=params, body=body
@@ -821,10 +1032,25 @@ class AgentsManager(ResourceManagerInterface):
         response = APIResponse(**res)
         return response
 
-    async def get_upgrade_results(self):
+    async def get_upgrade_results(
+        self,
+        agents_list: Optional[List[str]] = None,
+        upgrade_results_params: Optional[UpgradeResultsQueryParams] = None,
+        **kwargs,
+    ) -> APIResponse:
         """
         Return the agents upgrade results
         https://documentation.wazuh.com/current/user-manual/api/reference.html#operation/api.controllers.agent_controller.get_agent_upgrade
         """
-        raise NotImplementedError()
+        upgrade_results_params = apply_kwargs(
+            upgrade_results_params or UpgradeResultsQueryParams(), kwargs
+        )
+        params: dict[str, Any] = upgrade_results_params.to_query_dict()
+        if agents_list:
+            params["agents_list"] = agents_list
+        res = await self.async_request_builder.get(
+            V4ApiPaths.GET_UPGRADE_RESULTS.value, query_params=params
+        )
+        response = APIResponse(**res)
+        return response
 
@@ -0,0 +1,100 @@
+from dataclasses import dataclass
+from typing import List, Optional
+
+from ..client import AsyncRequestMaker
+from ..endpoints.endpoints_v4 import V4ApiPaths
+from ..enums import RulesetStatus
+from ..interfaces import AsyncClientInterface, ResourceManagerInterface
+from ..query import CommonQueryParams, ListQueryParams, PaginationQueryParams, apply_kwargs
+from ..response import APIResponse
+
+
+@dataclass(kw_only=True)
+class ListDecodersQueryParams(CommonQueryParams, PaginationQueryParams):
+    decoder_names: Optional[List[str]] = None
+    status: Optional[RulesetStatus] = None
+    filename: Optional[List[str]] = None
+    relative_dirname: Optional[str] = None
+    distinct: bool = False
+
+
+@dataclass(kw_only=True)
+class ListDecodersFilesQueryParams(CommonQueryParams, PaginationQueryParams):
+    status: Optional[RulesetStatus] = None
+    filename: Optional[List[str]] = None
+    relative_dirname: Optional[str] = None
+    distinct: bool = False
+
+
+class DecodersManager(ResourceManagerInterface):
+    def __init__(self, client: AsyncClientInterface):
+        """
+        Initialize with a reference to the WazuhClient instance.
+        """
+        self.async_request_builder = AsyncRequestMaker(client)
+
+    async def list(
+        self, params: Optional[ListDecodersQueryParams] = None, **kwargs
+    ) -> APIResponse:
+        """
+        Return information about all decoders included in ossec.conf.
+
+        https://documentation.wazuh.com/current/user-manual/api/reference.html#operation/api.controllers.decoder_controller.get_decoders
+        """
+        params = apply_kwargs(params or ListDecodersQueryParams(), kwargs)
+        res = await self.async_request_builder.get(
+            V4ApiPaths.LIST_DECODERS.value, query_params=params
+        )
+        return APIResponse(**res)
+
+    async def list_files(
+        self, params: Optional[ListDecodersFilesQueryParams] = None, **kwargs
+    ) -> APIResponse:
+        """
+        Return a list containing all files used to define decoders and their status.
+
+        https://documentation.wazuh.com/current/user-manual/api/reference.html#operation/api.controllers.decoder_controller.get_decoders_files
+        """
+        params = apply_kwargs(params or ListDecodersFilesQueryParams(), kwargs)
+        res = await self.async_request_builder.get(
+            V4ApiPaths.LIST_DECODERS_FILES.value, query_params=params
+        )
+        return APIResponse(**res)
+
+    async def get_file(
+        self,
+        filename: str,
+        relative_dirname: Optional[str] = None,
+        pretty: bool = False,
+        wait_for_complete: bool = False,
+    ) -> APIResponse:
+        """
+        Return the content of a decoders file, parsed.
+
+        https://documentation.wazuh.com/current/user-manual/api/reference.html#operation/api.controllers.decoder_controller.get_file
+        """
+        params = dict(
+            relative_dirname=relative_dirname,
+            pretty=pretty,
+            wait_for_complete=wait_for_complete,
+        )
+        res = await self.async_request_builder.get(
+            V4ApiPaths.GET_DECODERS_FILE.value,
+            query_params=params,
+            path_params=dict(filename=filename),
+        )
+        return APIResponse(**res)
+
+    async def list_parents(
+        self, params: Optional[ListQueryParams] = None, **kwargs
+    ) -> APIResponse:
+        """
+        Return information about all parent decoders.
+
+        https://documentation.wazuh.com/current/user-manual/api/reference.html#operation/api.controllers.decoder_controller.get_decoders_parents
+        """
+        params = apply_kwargs(params or ListQueryParams(), kwargs)
+        res = await self.async_request_builder.get(
+            V4ApiPaths.LIST_DECODERS_PARENTS.value, query_params=params
+        )
+        return APIResponse(**res)
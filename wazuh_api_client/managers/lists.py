@@ -0,0 +1,404 @@
+import asyncio
+import hashlib
+import heapq
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterator, Iterable, Iterator, List, Mapping, Optional
+
+from ..client import AsyncRequestMaker
+from ..endpoints.endpoints_v4 import V4ApiPaths
+from ..interfaces import AsyncClientInterface, ResourceManagerInterface
+from ..query import CommonQueryParams, PaginationQueryParams, apply_kwargs
+from ..response import APIResponse
+
+UPLOAD_CHUNK_SIZE = 256 * 1024
+# Entries sorted in memory at once by `ListsManager.sync`, larger lists are merged from disk.
+SORT_CHUNK_SIZE = 100_000
+
+
+@dataclass(kw_only=True)
+class ListCdbListsQueryParams(CommonQueryParams, PaginationQueryParams):
+    filename: Optional[List[str]] = None
+    relative_dirname: Optional[str] = None
+
+
+@dataclass(kw_only=True)
+class ListCdbListsFilesQueryParams(CommonQueryParams, PaginationQueryParams):
+    filename: Optional[List[str]] = None
+    relative_dirname: Optional[str] = None
+
+
+@dataclass
+class ListSyncResult:
+    """
+    Outcome of `ListsManager.sync`: the delta with the last uploaded content and, when the
+    list changed, the size and duration of the upload.
+    """
+
+    filename: str
+    entries: int
+    added: int = 0
+    removed: int = 0
+    changed: int = 0
+    uploaded: bool = False
+    bytes: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def bytes_per_second(self) -> Optional[float]:
+        return self.bytes / self.elapsed if self.uploaded and self.elapsed else None
+
+    @property
+    def entries_per_second(self) -> Optional[float]:
+        return self.entries / self.elapsed if self.uploaded and self.elapsed else None
+
+
+def parse_cdb_line(line: str) -> Optional[tuple[str, str]]:
+    """
+    Return the key and value of a CDB list line (`key:value`, keys holding `:` are quoted).
+    """
+    line = line.rstrip("\r\n")
+    if not line:
+        return None
+    if line.startswith('"'):
+        end = line.find('"', 1)
+        if end != -1:
+            return line[1:end], line[end + 2 :] if line[end + 1 : end + 2] == ":" else ""
+    key, _, value = line.partition(":")
+    return key, value
+
+
+def format_cdb_line(key: str, value: str) -> str:
+    if ":" in key:
+        key = f'"{key}"'
+    return f"{key}:{value}\n"
+
+
+Entries = Mapping[str, str] | Iterable[tuple[str, str]] | str | Path
+
+
+def _iter_file(path: str | Path) -> Iterator[tuple[str, str]]:
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            entry = parse_cdb_line(line)
+            if entry is not None:
+                yield entry
+
+
+def _iter_entries(source: Entries) -> Iterator[tuple[str, str]]:
+    if isinstance(source, (str, Path)):
+        yield from _iter_file(source)
+        return
+    pairs = source.items() if isinstance(source, Mapping) else source
+    for key, value in pairs:
+        yield str(key), "" if value is None else str(value)
+
+
+def _write_entries(path: Path, entries: Iterable[tuple[str, str]]) -> None:
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
+        for key, value in entries:
+            f.write(format_cdb_line(key, value))
+
+
+def _merge_runs(runs: List[Iterator[tuple[str, str]]]) -> Iterator[tuple[str, str]]:
+    """
+    Merge sorted runs, for a key present in several runs the value of the last run wins.
+    """
+    def tagged(index: int, run: Iterator[tuple[str, str]]) -> Iterator[tuple[str, int, str]]:
+        for key, value in run:
+            yield key, index, value
+
+    merged = heapq.merge(*(tagged(index, run) for index, run in enumerate(runs)))
+    previous: Optional[tuple[str, int, str]] = None
+    for entry in merged:
+        if previous is not None and previous[0] != entry[0]:
+            yield previous[0], previous[2]
+        previous = entry
+    if previous is not None:
+        yield previous[0], previous[2]
+
+
+def _write_sorted(
+    source: Entries, path: Path, chunk_size: int = SORT_CHUNK_SIZE
+) -> tuple[str, int, int]:
+    """
+    Write `source` sorted by key as a CDB list, return its sha256, size and number of entries.
+
+    At most `chunk_size` entries are held in memory: larger lists are sorted by chunks into
+    temporary run files next to `path`, then merged.
+    """
+    runs: List[Path] = []
+    chunk: dict[str, str] = {}
+    try:
+        for key, value in _iter_entries(source):
+            chunk[key] = value
+            if len(chunk) >= chunk_size:
+                run = path.with_name(f"{path.name}.run{len(runs)}")
+                _write_entries(run, sorted(chunk.items()))
+                runs.append(run)
+                chunk = {}
+        last = iter(sorted(chunk.items()))
+        del chunk
+        entries = _merge_runs([*(_iter_file(run) for run in runs), last]) if runs else last
+
+        digest = hashlib.sha256()
+        size = count = 0
+        with open(path, "w", encoding="utf-8", newline="\n") as f:
+            for key, value in entries:
+                data = format_cdb_line(key, value)
+                encoded = data.encode()
+                digest.update(encoded)
+                size += len(encoded)
+                count += 1
+                f.write(data)
+        return digest.hexdigest(), size, count
+    finally:
+        for run in runs:
+            run.unlink(missing_ok=True)
+
+
+def _diff_sorted(
+    new: Iterable[tuple[str, str]], old: Iterable[tuple[str, str]]
+) -> tuple[int, int, int]:
+    """
+    Count the added, removed and changed keys between two lists sorted by key.
+    """
+    added = removed = changed = 0
+    new_iter, old_iter = iter(new), iter(old)
+    new_entry, old_entry = next(new_iter, None), next(old_iter, None)
+    while new_entry is not None or old_entry is not None:
+        if old_entry is None or (new_entry is not None and new_entry[0] < old_entry[0]):
+            added += 1
+            new_entry = next(new_iter, None)
+        elif new_entry is None or old_entry[0] < new_entry[0]:
+            removed += 1
+            old_entry = next(old_iter, None)
+        else:
+            changed += new_entry[1] != old_entry[1]
+            new_entry, old_entry = next(new_iter, None), next(old_iter, None)
+    return added, removed, changed
+
+
+def _default_cache_dir() -> Path:
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "wazuh-api-client" / "lists"
+
+
+def _check_filename(filename: str) -> None:
+    if (
+        not filename
+        or filename in (".", "..")
+        or "/" in filename
+        or "\\" in filename
+        or "\0" in filename
+    ):
+        raise ValueError(f"Invalid CDB list filename: {filename!r}")
+
+
+class _FileBody:
+    """
+    Request body read from a file by chunks, in a thread. It can be iterated again, so the
+    request can be retried (e.g. after renewing an expired token).
+    """
+
+    def __init__(self, path: Path, chunk_size: int = UPLOAD_CHUNK_SIZE):
+        self.path = path
+        self.chunk_size = chunk_size
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        f = await asyncio.to_thread(open, self.path, "rb")
+        try:
+            while chunk := await asyncio.to_thread(f.read, self.chunk_size):
+                yield chunk
+        finally:
+            f.close()
+
+
+class ListsManager(ResourceManagerInterface):
+    def __init__(
+        self,
+        client: AsyncClientInterface,
+        cache_dir: Optional[str | Path] = None,
+        check_remote: bool = True,
+        sort_chunk_size: int = SORT_CHUNK_SIZE,
+    ):
+        """
+        Initialize with a reference to the WazuhClient instance.
+
+        `sync()` keeps a copy of the last content it uploaded for each list in `cache_dir`
+        (~/.cache/wazuh-api-client/lists when not set, or under $XDG_CACHE_HOME) to compute
+        the delta locally. Without a cached copy and with `check_remote`, the current content
+        is fetched from the manager instead.
+        """
+        self.async_request_builder = AsyncRequestMaker(client)
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else _default_cache_dir()
+        self.check_remote = check_remote
+        self.sort_chunk_size = sort_chunk_size
+
+    async def list(
+        self, params: Optional[ListCdbListsQueryParams] = None, **kwargs
+    ) -> APIResponse:
+        """
+        Return the contents of all CDB lists.
+
+        https://documentation.wazuh.com/current/user-manual/api/reference.html#operation/api.controllers.cdb_list_controller.get_lists
+        """
+        params = apply_kwargs(params or ListCdbListsQueryParams(), kwargs)
+        res = await self.async_request_builder.get(
+            V4ApiPaths.LIST_CDB_LISTS.value, query_params=params
+        )
+        return APIResponse(**res)
+
+    async def list_files(
+        self, params: Optional[ListCdbListsFilesQueryParams] = None, **kwargs
+    ) -> APIResponse:
+        """
+        Return the path from all CDB lists.
+
+        https://documentation.wazuh.com/current/user-manual/api/reference.html#operation/api.controllers.cdb_list_controller.get_lists_files
+        """
+        params = apply_kwargs(params or ListCdbListsFilesQueryParams(), kwargs)
+        res = await self.async_request_builder.get(
+            V4ApiPaths.LIST_CDB_LISTS_FILES.value, query_params=params
+        )
+        return APIResponse(**res)
+
+    async def get_file(
+        self, filename: str, pretty: bool = False, wait_for_complete: bool = False
+    ) -> APIResponse:
+        """
+        Return the content of a CDB list file, as key/value items.
+
+        https://documentation.wazuh.com/current/user-manual/api/reference.html#operation/api.controllers.cdb_list_controller.get_file
+        """
+        params = dict(pretty=pretty, wait_for_complete=wait_for_complete)
+        res = await self.async_request_builder.get(
+            V4ApiPaths.GET_CDB_LIST_FILE.value,
+            query_params=params,
+            path_params=dict(filename=filename),
+        )
+        return APIResponse(**res)
+
+    async def upload_file(
+        self,
+        filename: str,
+        path: str | Path,
+        overwrite: bool = True,
+        pretty: bool = False,
+        wait_for_complete: bool = False,
+    ) -> APIResponse:
+        """
+        Upload the CDB list file at `path` as `filename`, streamed from disk.
+
+        https://documentation.wazuh.com/current/user-manual/api/reference.html#operation/api.controllers.cdb_list_controller.put_file
+        """
+        path = Path(path)
+        params = dict(overwrite=overwrite, pretty=pretty, wait_for_complete=wait_for_complete)
+        res = await self.async_request_builder.put(
+            V4ApiPaths.UPDATE_CDB_LIST_FILE.value,
+            query_params=params,
+            path_params=dict(filename=filename),
+            content=_FileBody(path),
+            headers={
+                "Content-Type": "application/octet-stream",
+                "Content-Length": str(path.stat().st_size),
+            },
+        )
+        return APIResponse(**res)
+
+    async def delete_file(
+        self, filename: str, pretty: bool = False, wait_for_complete: bool = False
+    ) -> APIResponse:
+        """
+        Delete a CDB list file.
+
+        https://documentation.wazuh.com/current/user-manual/api/reference.html#operation/api.controllers.cdb_list_controller.delete_file
+        """
+        params = dict(pretty=pretty, wait_for_complete=wait_for_complete)
+        res = await self.async_request_builder.delete(
+            V4ApiPaths.DELETE_CDB_LIST_FILE.value,
+            query_params=params,
+            path_params=dict(filename=filename),
+        )
+        return APIResponse(**res)
+
+    async def _remote_entries(self, filename: str) -> Optional[List[tuple[str, str]]]:
+        response = await self.list(filename=[filename], limit=1)
+        if not response.data["affected_items"]:
+            return None
+        items = response.data["affected_items"][0].get("items") or []
+        return sorted((item["key"], item.get("value") or "") for item in items)
+
+    def _cache_paths(self, filename: str) -> tuple[Path, Path]:
+        return self.cache_dir / filename, self.cache_dir / f"{filename}.sha256"
+
+    def _cached_digest(self, filename: str) -> Optional[str]:
+        try:
+            return self._cache_paths(filename)[1].read_text().strip()
+        except FileNotFoundError:
+            return None
+
+    def _diff_cached(self, filename: str, path: Path) -> Optional[tuple[int, int, int]]:
+        try:
+            return _diff_sorted(_iter_file(path), _iter_file(self._cache_paths(filename)[0]))
+        except FileNotFoundError:
+            return None
+
+    def _store(self, filename: str, path: Path, digest: str) -> None:
+        content, digest_path = self._cache_paths(filename)
+        os.replace(path, content)
+        digest_path.write_text(digest)
+
+    async def sync(self, filename: str, entries: Entries) -> ListSyncResult:
+        """
+        Make the CDB list `filename` hold `entries` (a mapping, key/value pairs or the path of a
+        CDB list file), uploading it only when it differs from the last uploaded content.
+
+        The API only replaces whole files, so a changed list is uploaded in full: the delta
+        tells whether to upload and what changed. The entries are sorted by key into a file by
+        chunks of `sort_chunk_size`, the delta is a merge of that file with the cached copy of
+        the last upload, and the upload is streamed from disk, so the list is never held in
+        memory as a whole. Without a cached copy, the list fetched from the manager is.
+
+        Examples:
+            lists_manager = ListsManager(client, cache_dir="/var/lib/ti/lists")
+            result = await lists_manager.sync("malicious-ips", feed_pairs)
+            if result.uploaded:
+                print(result.added, result.removed, result.bytes_per_second)
+        """
+        _check_filename(filename)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.cache_dir / f".{filename}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            digest, size, count = await asyncio.to_thread(
+                _write_sorted, entries, tmp, self.sort_chunk_size
+            )
+            result = ListSyncResult(filename=filename, entries=count)
+            if digest == await asyncio.to_thread(self._cached_digest, filename):
+                return result
+
+            delta = await asyncio.to_thread(self._diff_cached, filename, tmp)
+            if delta is None and self.check_remote:
+                # An empty delta base when the manager has no such list: every entry is added.
+                remote = await self._remote_entries(filename) or []
+                delta = await asyncio.to_thread(_diff_sorted, _iter_file(tmp), remote)
+            if delta is not None:
+                result.added, result.removed, result.changed = delta
+                if delta == (0, 0, 0) and count:
+                    # Same content on the manager, only the cache was missing.
+                    await asyncio.to_thread(self._store, filename, tmp, digest)
+                    return result
+
+            started = time.perf_counter()
+            await self.upload_file(filename, tmp)
+            result.elapsed = time.perf_counter() - started
+            result.uploaded = True
+            result.bytes = size
+            await asyncio.to_thread(self._store, filename, tmp, digest)
+            return result
+        finally:
+            if tmp.exists():
+                tmp.unlink()
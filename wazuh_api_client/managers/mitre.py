@@ -0,0 +1,209 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, List, Optional
+
+from ..client import AsyncRequestMaker
+from ..endpoints.endpoints_v4 import V4ApiPaths
+from ..interfaces import AsyncClientInterface, ResourceManagerInterface
+from ..mitre import KINDS, MitreIndex, stamp_from_metadata
+from ..pagination import fetch_all
+from ..query import CommonQueryParams, PaginationQueryParams, apply_kwargs
+from ..response import APIResponse
+
+
+@dataclass(kw_only=True)
+class ListMitreTechniquesQueryParams(CommonQueryParams, PaginationQueryParams):
+    technique_ids: Optional[List[str]] = None
+
+
+@dataclass(kw_only=True)
+class ListMitreTacticsQueryParams(CommonQueryParams, PaginationQueryParams):
+    tactic_ids: Optional[List[str]] = None
+
+
+@dataclass(kw_only=True)
+class ListMitreGroupsQueryParams(CommonQueryParams, PaginationQueryParams):
+    group_ids: Optional[List[str]] = None
+
+
+@dataclass(kw_only=True)
+class ListMitreMitigationsQueryParams(CommonQueryParams, PaginationQueryParams):
+    mitigation_ids: Optional[List[str]] = None
+
+
+@dataclass(kw_only=True)
+class ListMitreSoftwareQueryParams(CommonQueryParams, PaginationQueryParams):
+    software_ids: Optional[List[str]] = None
+
+
+@dataclass(kw_only=True)
+class ListMitreReferencesQueryParams(CommonQueryParams, PaginationQueryParams):
+    reference_ids: Optional[List[str]] = None
+
+
+class MitreManager(ResourceManagerInterface):
+    def __init__(
+        self,
+        client: AsyncClientInterface,
+        cache_path: Optional[str | Path] = None,
+        max_age: float = 24 * 3600,
+        page_size: int = 500,
+        concurrency: int = 4,
+    ):
+        """
+        Initialize with a reference to the WazuhClient instance.
+
+        `index()` builds a local MITRE index on first use and saves it to `cache_path`, if set.
+        A saved index younger than `max_age` seconds is used without any request, an older one
+        is used as long as the version stamp of the manager's MITRE database matches it.
+        The index is loaded `concurrency` pages of `page_size` objects at a time.
+        """
+        self.async_request_builder = AsyncRequestMaker(client)
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.max_age = max_age
+        self.page_size = page_size
+        self.concurrency = concurrency
+        self._index: Optional[MitreIndex] = None
+        self._index_lock = asyncio.Lock()
+
+    async def _list(self, endpoint: V4ApiPaths, params: Any) -> APIResponse:
+        res = await self.async_request_builder.get(endpoint.value, query_params=params)
+        return APIResponse(**res)
+
+    async def get_metadata(
+        self, pretty: bool = False, wait_for_complete: bool = False
+    ) -> APIResponse:
+        """
+        Return the metadata from the MITRE database (e.g. its version).
+
+        https://documentation.wazuh.com/current/user-manual/api/reference.html#operation/api.controllers.mitre_controller.get_metadata
+        """
+        params = dict(pretty=pretty, wait_for_complete=wait_for_complete)
+        res = await self.async_request_builder.get(
+            V4ApiPaths.GET_MITRE_METADATA.value, query_params=params
+        )
+        return APIResponse(**res)
+
+    async def list_techniques(
+        self, params: Optional[ListMitreTechniquesQueryParams] = None, **kwargs
+    ) -> APIResponse:
+        """
+        Return the techniques from the MITRE database.
+
+        https://documentation.wazuh.com/current/user-manual/api/reference.html#operation/api.controllers.mitre_controller.get_techniques
+        """
+        params = apply_kwargs(params or ListMitreTechniquesQueryParams(), kwargs)
+        return await self._list(V4ApiPaths.LIST_MITRE_TECHNIQUES, params)
+
+    async def list_tactics(
+        self, params: Optional[ListMitreTacticsQueryParams] = None, **kwargs
+    ) -> APIResponse:
+        """
+        Return the tactics from the MITRE database.
+
+        https://documentation.wazuh.com/current/user-manual/api/reference.html#operation/api.controllers.mitre_controller.get_tactics
+        """
+        params = apply_kwargs(params or ListMitreTacticsQueryParams(), kwargs)
+        return await self._list(V4ApiPaths.LIST_MITRE_TACTICS, params)
+
+    async def list_groups(
+        self, params: Optional[ListMitreGroupsQueryParams] = None, **kwargs
+    ) -> APIResponse:
+        """
+        Return the groups from the MITRE database.
+
+        https://documentation.wazuh.com/current/user-manual/api/reference.html#operation/api.controllers.mitre_controller.get_groups
+        """
+        params = apply_kwargs(params or ListMitreGroupsQueryParams(), kwargs)
+        return await self._list(V4ApiPaths.LIST_MITRE_GROUPS, params)
+
+    async def list_mitigations(
+        self, params: Optional[ListMitreMitigationsQueryParams] = None, **kwargs
+    ) -> APIResponse:
+        """
+        Return the mitigations from the MITRE database.
+
+        https://documentation.wazuh.com/current/user-manual/api/reference.html#operation/api.controllers.mitre_controller.get_mitigations
+        """
+        params = apply_kwargs(params or ListMitreMitigationsQueryParams(), kwargs)
+        return await self._list(V4ApiPaths.LIST_MITRE_MITIGATIONS, params)
+
+    async def list_software(
+        self, params: Optional[ListMitreSoftwareQueryParams] = None, **kwargs
+    ) -> APIResponse:
+        """
+        Return the software from the MITRE database.
+
+        https://documentation.wazuh.com/current/user-manual/api/reference.html#operation/api.controllers.mitre_controller.get_software
+        """
+        params = apply_kwargs(params or ListMitreSoftwareQueryParams(), kwargs)
+        return await self._list(V4ApiPaths.LIST_MITRE_SOFTWARE, params)
+
+    async def list_references(
+        self, params: Optional[ListMitreReferencesQueryParams] = None, **kwargs
+    ) -> APIResponse:
+        """
+        Return the references from the MITRE database.
+
+        https://documentation.wazuh.com/current/user-manual/api/reference.html#operation/api.controllers.mitre_controller.get_references
+        """
+        params = apply_kwargs(params or ListMitreReferencesQueryParams(), kwargs)
+        return await self._list(V4ApiPaths.LIST_MITRE_REFERENCES, params)
+
+    async def _stamp(self) -> dict[str, Any]:
+        response = await self.get_metadata()
+        return stamp_from_metadata(response.data["affected_items"])
+
+    async def _build_index(self, stamp: dict[str, Any]) -> MitreIndex:
+        methods = {
+            "techniques": (self.list_techniques, ListMitreTechniquesQueryParams),
+            "tactics": (self.list_tactics, ListMitreTacticsQueryParams),
+            "groups": (self.list_groups, ListMitreGroupsQueryParams),
+            "mitigations": (self.list_mitigations, ListMitreMitigationsQueryParams),
+        }
+        listings = await asyncio.gather(
+            *(
+                fetch_all(
+                    method,
+                    params_class(limit=self.page_size, sort="+id"),
+                    concurrency=self.concurrency,
+                )
+                for method, params_class in (methods[kind] for kind in KINDS)
+            )
+        )
+        return MitreIndex(dict(zip(KINDS, listings)), stamp)
+
+    async def index(self, refresh: bool = False) -> MitreIndex:
+        """
+        Return the local MITRE index, loading it on first use (or when `refresh` is set) from
+        `cache_path` if it is still current, from the API otherwise.
+        """
+        if self._index is not None and not refresh:
+            return self._index
+        async with self._index_lock:
+            if self._index is not None and not refresh:
+                return self._index
+            cached = None
+            if self.cache_path:
+                cached = await asyncio.to_thread(MitreIndex.load, self.cache_path)
+            if (
+                cached is not None
+                and not refresh
+                and cached.saved_at is not None
+                and time.time() - cached.saved_at < self.max_age
+            ):
+                self._index = cached
+                return cached
+
+            stamp = await self._stamp()
+            if cached is not None and cached.stamp == stamp:
+                index = cached
+            else:
+                index = await self._build_index(stamp)
+            if self.cache_path:
+                # Saved again when unchanged, to restart the `max_age` period.
+                await asyncio.to_thread(index.save, self.cache_path)
+            self._index = index
+            return index
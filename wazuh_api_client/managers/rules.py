@@ -0,0 +1,135 @@
+from dataclasses import dataclass
+from typing import List, Optional
+
+from ..client import AsyncRequestMaker
+from ..endpoints.endpoints_v4 import V4ApiPaths
+from ..enums import RuleRequirement, RulesetStatus
+from ..interfaces import AsyncClientInterface, ResourceManagerInterface
+from ..query import CommonQueryParams, ListQueryParams, PaginationQueryParams, apply_kwargs
+from ..response import APIResponse
+
+
+@dataclass(kw_only=True)
+class ListRulesQueryParams(CommonQueryParams, PaginationQueryParams):
+    rule_ids: Optional[List[int]] = None
+    status: Optional[RulesetStatus] = None
+    group: Optional[str] = None
+    level: Optional[str] = None  # a level (e.g. 10) or a range (e.g. 10-15)
+    filename: Optional[List[str]] = None
+    relative_dirname: Optional[str] = None
+    pci_dss: Optional[str] = None
+    gdpr: Optional[str] = None
+    gpg13: Optional[str] = None
+    hipaa: Optional[str] = None
+    nist_800_53: Optional[str] = None
+    tsc: Optional[str] = None
+    mitre: Optional[str] = None
+    distinct: bool = False
+
+    def to_query_dict(self):
+        query = super().to_query_dict()
+        if "nist_800_53" in query:
+            query["nist-800-53"] = query.pop("nist_800_53")
+        return query
+
+
+@dataclass(kw_only=True)
+class ListRulesFilesQueryParams(CommonQueryParams, PaginationQueryParams):
+    status: Optional[RulesetStatus] = None
+    filename: Optional[List[str]] = None
+    relative_dirname: Optional[str] = None
+    distinct: bool = False
+
+
+class RulesManager(ResourceManagerInterface):
+    def __init__(self, client: AsyncClientInterface):
+        """
+        Initialize with a reference to the WazuhClient instance.
+        """
+        self.async_request_builder = AsyncRequestMaker(client)
+
+    async def list(
+        self, params: Optional[ListRulesQueryParams] = None, **kwargs
+    ) -> APIResponse:
+        """
+        Return a list containing information about each rule such as file where it's defined,
+        description, rule group, status, etc.
+
+        https://documentation.wazuh.com/current/user-manual/api/reference.html#operation/api.controllers.rule_controller.get_rules
+        """
+        params = apply_kwargs(params or ListRulesQueryParams(), kwargs)
+        res = await self.async_request_builder.get(
+            V4ApiPaths.LIST_RULES.value, query_params=params
+        )
+        return APIResponse(**res)
+
+    async def list_groups(
+        self, params: Optional[ListQueryParams] = None, **kwargs
+    ) -> APIResponse:
+        """
+        Return a list containing all rule groups names.
+
+        https://documentation.wazuh.com/current/user-manual/api/reference.html#operation/api.controllers.rule_controller.get_rules_groups
+        """
+        params = apply_kwargs(params or ListQueryParams(), kwargs)
+        res = await self.async_request_builder.get(
+            V4ApiPaths.LIST_RULES_GROUPS.value, query_params=params
+        )
+        return APIResponse(**res)
+
+    async def list_requirement(
+        self,
+        requirement: RuleRequirement,
+        params: Optional[ListQueryParams] = None,
+        **kwargs,
+    ) -> APIResponse:
+        """
+        Return all specified requirement names defined in the Wazuh ruleset (e.g. the PCI DSS ones).
+
+        https://documentation.wazuh.com/current/user-manual/api/reference.html#operation/api.controllers.rule_controller.get_rules_requirement
+        """
+        params = apply_kwargs(params or ListQueryParams(), kwargs)
+        res = await self.async_request_builder.get(
+            V4ApiPaths.LIST_RULES_REQUIREMENT.value,
+            query_params=params,
+            path_params=dict(requirement=str(requirement)),
+        )
+        return APIResponse(**res)
+
+    async def list_files(
+        self, params: Optional[ListRulesFilesQueryParams] = None, **kwargs
+    ) -> APIResponse:
+        """
+        Return a list containing all files used to define rules and their status.
+
+        https://documentation.wazuh.com/current/user-manual/api/reference.html#operation/api.controllers.rule_controller.get_rules_files
+        """
+        params = apply_kwargs(params or ListRulesFilesQueryParams(), kwargs)
+        res = await self.async_request_builder.get(
+            V4ApiPaths.LIST_RULES_FILES.value, query_params=params
+        )
+        return APIResponse(**res)
+
+    async def get_file(
+        self,
+        filename: str,
+        relative_dirname: Optional[str] = None,
+        pretty: bool = False,
+        wait_for_complete: bool = False,
+    ) -> APIResponse:
+        """
+        Return the content of a rules file, parsed.
+
+        https://documentation.wazuh.com/current/user-manual/api/reference.html#operation/api.controllers.rule_controller.get_file
+        """
+        params = dict(
+            relative_dirname=relative_dirname,
+            pretty=pretty,
+            wait_for_complete=wait_for_complete,
+        )
+        res = await self.async_request_builder.get(
+            V4ApiPaths.GET_RULES_FILE.value,
+            query_params=params,
+            path_params=dict(filename=filename),
+        )
+        return APIResponse(**res)
@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import Optional, List
+from typing import Any, Optional, List
 from ..query import CommonQueryParams, PaginationQueryParams
 from ..enums import SysCheckScanType
 from ..interfaces import AsyncClientInterface
@@ -22,12 +22,10 @@ class ScanResultParams(CommonQueryParams, PaginationQueryParams):
     hash: Optional[str] = None
     distinct: bool = False
 
-    def to_query_dict(self) -> dict[str, str | int | bool]:
-        """ """
-        query: dict[str, str | int | bool] = {}
-        for key, value in vars(self).items():
-            if value and not isinstance(value, bool):
-                query[key] = str(value)
+    def to_query_dict(self) -> dict[str, Any]:
+        query = super().to_query_dict()
+        if self.type is not None:
+            query["type"] = getattr(self.type, "value", self.type)
         return query
 
 
@@ -74,7 +72,7 @@ class SysCheckManager:
                 setattr(params, param, value)
         res = await self.async_request_builder.get(
             V4ApiPaths.GET_SCAN_RESULTS.value,
-            query_params=params.to_query_dict(),
+            query_params=params,
             path_params=path_params,
         )
         response = APIResponse(**res)
@@ -0,0 +1,43 @@
+from dataclasses import dataclass
+from typing import List, Optional
+from ..enums import TaskStatus
+from ..interfaces import AsyncClientInterface, ResourceManagerInterface
+from ..client import AsyncRequestMaker
+from ..endpoints.endpoints_v4 import V4ApiPaths
+from ..query import CommonQueryParams, PaginationQueryParams, apply_kwargs
+from ..response import APIResponse
+
+
+@dataclass(kw_only=True)
+class TasksStatusQueryParams(CommonQueryParams, PaginationQueryParams):
+    tasks_list: Optional[List[int]] = None
+    agents_list: Optional[List[str]] = None
+    command: Optional[str] = None  # e.g. upgrade
+    node: Optional[str] = None
+    module: Optional[str] = None  # e.g. upgrade_module
+    status: Optional[TaskStatus] = None
+
+
+class TasksManager(ResourceManagerInterface):
+    def __init__(self, client: AsyncClientInterface):
+        """
+        Initialize with a reference to the WazuhClient instance.
+        """
+        self.async_request_builder = AsyncRequestMaker(client)
+
+    async def get_status(
+        self, params: Optional[TasksStatusQueryParams] = None, **kwargs
+    ) -> APIResponse:
+        """
+        Return all tasks or a list of them, along with their status.
+
+        This method accepts either a TasksStatusQueryParams object or individual parameters as keyword arguments.
+
+        https://documentation.wazuh.com/current/user-manual/api/reference.html#operation/api.controllers.task_controller.get_tasks_status
+        """
+        params = apply_kwargs(params or TasksStatusQueryParams(), kwargs)
+        res = await self.async_request_builder.get(
+            V4ApiPaths.GET_TASKS_STATUS.value, query_params=params
+        )
+        response = APIResponse(**res)
+        return response
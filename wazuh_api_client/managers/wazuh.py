@@ -1,10 +1,18 @@
-from dataclasses import dataclass, field
+import asyncio
+import time
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timedelta
 from ..interfaces import ResourceManagerInterface, AsyncClientInterface
 from ..client import AsyncRequestMaker
+from ..enums import DaemonsList, LogLevel
+from ..query import CommonQueryParams, PaginationQueryParams, apply_kwargs
 from ..response import APIResponse, ResponseData
-from typing import List
+from ..utils import flatten_dict, to_columns
+from typing import Any, AsyncIterator, List, Optional
 from ..endpoints import V4ApiPaths
 
+WEEK_DAYS = ["Sun", "Mon", "Tue", "Wed", "Thu", "Fri", "Sat"]
+
 
 @dataclass
 class Wazuh:
@@ -21,6 +29,100 @@ class ManagerApiResponse(APIResponse):
     data: ManagerResponseData
 
 
+@dataclass
+class StatsApiResponse(APIResponse):
+    """
+    API response along with a columnar view of its `affected_items`.
+
+    `columns` maps each metric (dot notation for nested metrics) to one sequence,
+    numeric metrics are `array("d")` and all sequences share the same axis
+    (`hour`, `day`/`hour` or daemon `name`).
+    """
+
+    columns: dict[str, Any] = field(default_factory=dict)
+
+
+def _stats_rows(items: List[dict[str, Any]]) -> List[dict[str, Any]]:
+    """
+    Rows of /manager/stats, per-alert details are not numeric metrics and are dropped.
+    """
+    rows = []
+    for item in items:
+        row = {k: v for k, v in item.items() if k != "alerts"}
+        rows.append(flatten_dict(row))
+    return rows
+
+
+def _stats_hour_rows(items: List[dict[str, Any]]) -> List[dict[str, Any]]:
+    """
+    Rows of /manager/stats/hour, one per hour of the day.
+    """
+    rows = []
+    for item in items:
+        for hour, average in enumerate(item.get("averages", [])):
+            rows.append({"hour": hour, "averages": average})
+    return rows
+
+
+def _stats_week_rows(items: List[dict[str, Any]]) -> List[dict[str, Any]]:
+    """
+    Rows of /manager/stats/week, one per (day, hour).
+    """
+    rows = []
+    for item in items:
+        for day in WEEK_DAYS + [d for d in item if d not in WEEK_DAYS]:
+            value = item.get(day)
+            if value is None:
+                continue
+            hours = value.get("hours", []) if isinstance(value, dict) else value
+            for hour, entry in enumerate(hours):
+                row: dict[str, Any] = {"day": day, "hour": hour}
+                if isinstance(entry, dict):
+                    row.update(flatten_dict(entry))
+                else:
+                    row["averages"] = entry
+                rows.append(row)
+    return rows
+
+
+def _daemon_stats_rows(items: List[dict[str, Any]]) -> List[dict[str, Any]]:
+    """
+    Rows of /manager/daemons/stats, one per daemon.
+    """
+    return [flatten_dict(item) for item in items]
+
+
+@dataclass(kw_only=True)
+class LogsQueryParams(CommonQueryParams, PaginationQueryParams):
+    tag: Optional[str] = None  # Wazuh component that logged the event
+    level: Optional[LogLevel] = None
+    distinct: bool = False
+
+
+def _log_key(item: dict[str, Any]) -> tuple:
+    return (
+        item.get("timestamp"),
+        item.get("tag"),
+        item.get("level"),
+        item.get("description"),
+    )
+
+
+def _parse_timestamp(timestamp: str) -> datetime:
+    return datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+
+
+def _format_timestamp(value: datetime, like: str) -> str:
+    """
+    Format `value` the same way as the `like` timestamp returned by the API.
+    """
+    if "T" not in like:
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    if like.endswith("Z"):
+        return value.strftime("%Y-%m-%dT%H:%M:%SZ")
+    return value.isoformat()
+
+
 class WazuhManager(ResourceManagerInterface):
     def __init__(self, client: AsyncClientInterface):
         self.async_request_builder = AsyncRequestMaker(client)
@@ -49,23 +151,206 @@ class WazuhManager(ResourceManagerInterface):
     async def update_wazuh_configuration(self):
         pass
 
-    async def get_wazuh_daemon_stats(self):
-        pass
+    async def _get_stats(
+        self,
+        endpoint: str,
+        rows_builder,
+        params: dict[str, Any],
+    ) -> StatsApiResponse:
+        res = await self.async_request_builder.get(endpoint, query_params=params)
+        response = StatsApiResponse(**res)
+        items = (response.data or {}).get("affected_items", [])
+        response.columns = to_columns(rows_builder(items))
+        return response
 
-    async def get_stats(self):
-        pass
+    async def get_wazuh_daemon_stats(
+        self,
+        daemons_list: Optional[List[DaemonsList]] = None,
+        pretty: bool = False,
+        wait_for_complete: bool = False,
+    ) -> StatsApiResponse:
+        """
+        Return Wazuh statistical information from the specified daemons.
+        Columns are indexed by daemon `name`.
+        """
+        params: dict[str, Any] = dict(
+            pretty=pretty, wait_for_complete=wait_for_complete
+        )
+        if daemons_list:
+            params["daemons_list"] = ",".join(str(d) for d in daemons_list)
+        return await self._get_stats(
+            V4ApiPaths.GET_WAZUH_DAEMON_STATS.value, _daemon_stats_rows, params
+        )
 
-    async def get_stats_hour(self):
-        pass
+    async def get_stats(
+        self,
+        date: Optional[str] = None,
+        pretty: bool = False,
+        wait_for_complete: bool = False,
+    ) -> StatsApiResponse:
+        """
+        Return Wazuh statistical information for the current or specified date (YYYY-MM-DD).
+        Columns are indexed by `hour`.
+        """
+        params: dict[str, Any] = dict(
+            pretty=pretty, wait_for_complete=wait_for_complete, date=date
+        )
+        return await self._get_stats(
+            V4ApiPaths.GET_WAZUH_STATS.value, _stats_rows, params
+        )
 
-    async def get_stats_week(self):
-        pass
+    async def get_stats_hour(
+        self, pretty: bool = False, wait_for_complete: bool = False
+    ) -> StatsApiResponse:
+        """
+        Return Wazuh statistical information per hour, each number in `averages`
+        is the average of alerts per hour.
+        Columns are indexed by `hour`.
+        """
+        params: dict[str, Any] = dict(
+            pretty=pretty, wait_for_complete=wait_for_complete
+        )
+        return await self._get_stats(
+            V4ApiPaths.GET_WAZUH_STATS_HOUR.value, _stats_hour_rows, params
+        )
 
-    async def get_logs(self):
-        pass
+    async def get_stats_week(
+        self, pretty: bool = False, wait_for_complete: bool = False
+    ) -> StatsApiResponse:
+        """
+        Return Wazuh statistical information per week, each number in `averages`
+        is the average of alerts per hour for that specific day.
+        Columns are indexed by `day` and `hour`.
+        """
+        params: dict[str, Any] = dict(
+            pretty=pretty, wait_for_complete=wait_for_complete
+        )
+        return await self._get_stats(
+            V4ApiPaths.GET_WAZUH_STATS_WEEK.value, _stats_week_rows, params
+        )
 
-    async def get_log_summary(self):
-        pass
+    async def get_logs(
+        self, params: Optional[LogsQueryParams] = None, **kwargs
+    ) -> APIResponse:
+        """
+        Return the last 2000 wazuh log entries.
+
+        This method accepts either a LogsQueryParams object or individual parameters as keyword arguments.
+
+        https://documentation.wazuh.com/current/user-manual/api/reference.html#operation/api.controllers.manager_controller.get_log
+        """
+        params = apply_kwargs(params or LogsQueryParams(), kwargs)
+        res = await self.async_request_builder.get(
+            V4ApiPaths.GET_WAZUH_LOGS.value, query_params=params
+        )
+        response = APIResponse(**res)
+        return response
+
+    async def get_log_summary(
+        self, pretty: bool = False, wait_for_complete: bool = False
+    ) -> APIResponse:
+        """
+        Return a summary of the last 2000 wazuh log entries.
+        """
+        params: dict[str, bool] = dict(
+            pretty=pretty, wait_for_complete=wait_for_complete
+        )
+        res = await self.async_request_builder.get(
+            V4ApiPaths.GET_WAZUH_LOGS_SUMMARY.value, query_params=params
+        )
+        response = APIResponse(**res)
+        return response
+
+    async def follow(
+        self,
+        params: Optional[LogsQueryParams] = None,
+        since: Optional[str] = None,
+        min_interval: float = 1.0,
+        max_interval: float = 30.0,
+        overlap: float = 1.0,
+        **kwargs,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """
+        Tail the manager logs, yielding new log entries in chronological order as they are written.
+
+        Each poll asks for entries newer than the last seen `timestamp` minus `overlap` seconds
+        (the API has no ">=" operator and several entries share the same second) and walks them
+        with `offset` in ascending order. Entries already yielded in the overlap window are dropped.
+
+        The poll interval halves (down to `min_interval`) while new entries keep coming and grows
+        (up to `max_interval`) while the log is idle.
+
+        Only one page is fetched at a time and only once the consumer has taken every entry of the
+        previous one, so a slow consumer slows down polling instead of piling up entries in memory.
+
+        Examples:
+            async for entry in manager.follow(level=LogLevel.ERROR):
+                print(entry["timestamp"], entry["description"])
+
+        If `since` is not given, tailing starts from the newest entry.
+        """
+        params = apply_kwargs(params or LogsQueryParams(), kwargs)
+
+        base_q = params.q
+        limit = params.limit or 500
+        cursor = since
+        seen: dict[tuple, datetime] = {}
+        # Entries written before start up are only recorded as seen during the first poll.
+        skip_until: Optional[datetime] = None
+        interval = min_interval
+
+        if cursor is None:
+            newest = await self.get_logs(
+                replace(params, offset=0, limit=1, sort="-timestamp")
+            )
+            items = newest.data["affected_items"]
+            if items:
+                cursor = items[0]["timestamp"]
+                skip_until = _parse_timestamp(cursor)
+
+        while True:
+            started = time.monotonic()
+            offset = 0
+            emitted = 0
+            q = base_q
+            lower: Optional[datetime] = None
+            if cursor:
+                lower = _parse_timestamp(cursor) - timedelta(seconds=overlap)
+                since_q = f"timestamp>{_format_timestamp(lower, cursor)}"
+                q = f"{base_q};{since_q}" if base_q else since_q
+
+            while True:
+                page = await self.get_logs(
+                    replace(params, offset=offset, limit=limit, sort="+timestamp", q=q)
+                )
+                items = page.data["affected_items"]
+                for item in items:
+                    key = _log_key(item)
+                    if key in seen:
+                        continue
+                    timestamp = item["timestamp"]
+                    seen[key] = _parse_timestamp(timestamp)
+                    if not cursor or seen[key] >= _parse_timestamp(cursor):
+                        cursor = timestamp
+                    if skip_until is not None and seen[key] <= skip_until:
+                        continue
+                    emitted += 1
+                    yield item
+                if len(items) < limit:
+                    break
+                offset += len(items)
+
+            if lower is not None:
+                seen = {k: v for k, v in seen.items() if v >= lower}
+            skip_until = None
+
+            if emitted >= limit:
+                interval = min_interval
+            elif emitted:
+                interval = max(min_interval, interval / 2)
+            else:
+                interval = min(max_interval, interval * 1.5)
+            await asyncio.sleep(max(0.0, interval - (time.monotonic() - started)))
 
     async def get_api_config(self):
         pass
@@ -0,0 +1,142 @@
+import gzip
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Iterable, List, Optional
+
+MITRE_INDEX_FORMAT = 1
+# Kinds of MITRE ATT&CK objects indexed, named as the /mitre endpoints and relation fields.
+KINDS = ("techniques", "tactics", "groups", "mitigations")
+
+
+class MitreIndex:
+    """
+    MITRE ATT&CK techniques, tactics, groups and mitigations of a manager, with the relations
+    between them in both directions.
+
+    Objects are looked up by id (e.g. attack-pattern--...) or external id (e.g. T1110).
+    Relations listed on either side (a technique listing its tactics, or a tactic its
+    techniques) are indexed both ways. `stamp` identifies the MITRE database the index was
+    built from, see `MitreManager.index()`.
+
+    Examples:
+        index = await mitre_manager.index()
+        index.technique("T1110")["name"]
+        [tactic["name"] for tactic in index.related("T1110", "tactics")]
+        index.related("TA0006", "techniques")
+    """
+
+    def __init__(
+        self,
+        objects: dict[str, List[dict[str, Any]]],
+        stamp: Optional[dict[str, Any]] = None,
+        saved_at: Optional[float] = None,
+    ):
+        self.objects = {kind: list(objects.get(kind, [])) for kind in KINDS}
+        self.stamp = stamp or {}
+        self.saved_at = saved_at
+        self._by_id: dict[str, tuple[str, dict[str, Any]]] = {}
+        self._aliases: dict[str, str] = {}
+        self._relations: dict[str, set[str]] = defaultdict(set)
+        for kind, items in self.objects.items():
+            for item in items:
+                self._by_id[item["id"]] = (kind, item)
+                if item.get("external_id"):
+                    self._aliases[item["external_id"]] = item["id"]
+        for kind, items in self.objects.items():
+            for item in items:
+                for related_kind in KINDS:
+                    for related in item.get(related_kind) or []:
+                        if related in self._by_id:
+                            self._relations[item["id"]].add(related)
+                            self._relations[related].add(item["id"])
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def _resolve(self, id_or_external_id: str) -> Optional[str]:
+        if id_or_external_id in self._by_id:
+            return id_or_external_id
+        return self._aliases.get(id_or_external_id)
+
+    def get(self, id_or_external_id: str) -> Optional[dict[str, Any]]:
+        id_ = self._resolve(id_or_external_id)
+        return self._by_id[id_][1] if id_ else None
+
+    def _get_kind(self, kind: str, id_or_external_id: str) -> Optional[dict[str, Any]]:
+        id_ = self._resolve(id_or_external_id)
+        if id_ is None or self._by_id[id_][0] != kind:
+            return None
+        return self._by_id[id_][1]
+
+    def technique(self, id_or_external_id: str) -> Optional[dict[str, Any]]:
+        return self._get_kind("techniques", id_or_external_id)
+
+    def tactic(self, id_or_external_id: str) -> Optional[dict[str, Any]]:
+        return self._get_kind("tactics", id_or_external_id)
+
+    def group(self, id_or_external_id: str) -> Optional[dict[str, Any]]:
+        return self._get_kind("groups", id_or_external_id)
+
+    def mitigation(self, id_or_external_id: str) -> Optional[dict[str, Any]]:
+        return self._get_kind("mitigations", id_or_external_id)
+
+    def related(self, id_or_external_id: str, kind: str) -> List[dict[str, Any]]:
+        """
+        Objects of `kind` (one of KINDS) related to an object, e.g. the tactics of a technique
+        or the techniques used by a group.
+        """
+        if kind not in KINDS:
+            raise ValueError(f"`kind` must be one of: {', '.join(KINDS)}")
+        id_ = self._resolve(id_or_external_id)
+        if id_ is None:
+            return []
+        related = (self._by_id[r] for r in self._relations.get(id_, ()))
+        return sorted(
+            (item for related_kind, item in related if related_kind == kind),
+            key=lambda item: item.get("external_id") or item["id"],
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "format": MITRE_INDEX_FORMAT,
+            "stamp": self.stamp,
+            "saved_at": self.saved_at,
+            "objects": self.objects,
+        }
+
+    def save(self, path: str | Path) -> None:
+        """
+        Write the index to `path` (gzip compressed JSON), atomically.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.saved_at = time.time()
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with gzip.open(tmp, "wt", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, separators=(",", ":"))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str | Path) -> Optional["MitreIndex"]:
+        """
+        Read an index saved by `save`, None if there is none or it has another format.
+        """
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.get("format") != MITRE_INDEX_FORMAT:
+            return None
+        return cls(data["objects"], data.get("stamp"), data.get("saved_at"))
+
+
+def stamp_from_metadata(items: Iterable[dict[str, Any]]) -> dict[str, Any]:
+    """
+    Version stamp of the MITRE database from the /mitre/metadata items (key/value pairs).
+    """
+    return {item["key"]: item["value"] for item in items if "key" in item}
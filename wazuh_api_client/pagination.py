@@ -0,0 +1,279 @@
+import asyncio
+import json
+import time
+from dataclasses import replace
+from typing import Any, AsyncIterator, Awaitable, Callable, List, Optional
+
+from .constants import DEFAULT_LIMIT, MAX_SERVER_LIMIT
+from .query import PaginationQueryParams
+from .response import APIResponse
+
+
+class PageSizeTuner:
+    """
+    Choose the `limit` of the next page from the latency and the size of the previous ones.
+
+    The page size is scaled by `target_latency / latency` (at most halved or doubled per page,
+    smoothed by `smoothing`), then capped so a response stays under `max_bytes`, estimated from
+    the JSON size of a sample of the items, and kept within `min_limit` and `max_limit`.
+    The last, partial page of a listing tells nothing about the server and is ignored.
+
+    Examples:
+        tuner = PageSizeTuner(target_latency=0.5)
+        async for page in paginate(agents_manager.list, params, tuner=tuner):
+            ...
+        print(tuner.limit, tuner.bytes_per_item)
+    """
+
+    def __init__(
+        self,
+        target_latency: float = 1.0,
+        min_limit: int = 100,
+        max_limit: int = MAX_SERVER_LIMIT,
+        max_bytes: int = 16 * 1024 * 1024,
+        smoothing: float = 0.5,
+        sample_size: int = 20,
+    ):
+        if not 0 < min_limit <= max_limit <= MAX_SERVER_LIMIT:
+            raise ValueError(
+                f"limits must satisfy 0 < min_limit <= max_limit <= {MAX_SERVER_LIMIT}"
+            )
+        self.target_latency = target_latency
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.max_bytes = max_bytes
+        self.smoothing = smoothing
+        self.sample_size = sample_size
+        self.limit: Optional[int] = None
+        self.bytes_per_item: Optional[float] = None
+        self.history: List[tuple[int, float]] = []  # (limit, latency) of the full pages
+
+    def _clamp(self, limit: float) -> int:
+        if self.bytes_per_item:
+            limit = min(limit, self.max_bytes / self.bytes_per_item)
+        return int(max(self.min_limit, min(self.max_limit, limit)))
+
+    def start(self, limit: int) -> int:
+        if self.limit is None:
+            self.limit = self._clamp(limit)
+        return self.limit
+
+    def observe(self, limit: int, items: List[Any], latency: float) -> int:
+        """
+        Record a page fetched with `limit` in `latency` seconds and return the next limit.
+        """
+        if items:
+            sample = items[: self.sample_size]
+            size = len(json.dumps(sample, separators=(",", ":"))) / len(sample)
+            self.bytes_per_item = (
+                size
+                if self.bytes_per_item is None
+                else self.smoothing * self.bytes_per_item + (1 - self.smoothing) * size
+            )
+        if len(items) < limit or latency <= 0:
+            self.limit = self._clamp(limit)
+            return self.limit
+
+        self.history.append((limit, latency))
+        ratio = max(0.5, min(2.0, self.target_latency / latency))
+        target = limit * ratio
+        self.limit = self._clamp(self.smoothing * limit + (1 - self.smoothing) * target)
+        return self.limit
+
+
+async def paginate(
+    method: Callable[..., Awaitable[APIResponse]],
+    params: PaginationQueryParams,
+    *args: Any,
+    tuner: Optional[PageSizeTuner] = None,
+    checker: Optional["ConsistencyChecker"] = None,
+) -> AsyncIterator[APIResponse]:
+    """
+    Walk a paginated listing page by page, using `offset` and `limit` of `params`.
+
+    `method` is a manager listing method, it is called as `method(*args, page_params)`
+    where `page_params` is a copy of `params` for the requested page.
+    With a `tuner`, `limit` is only the first page size, the next ones are chosen by the tuner.
+    A `checker` drops the items already returned and records the changes of the total, see
+    `paginate_keyset` for walks that stay correct while the listing changes.
+
+    Examples:
+        params = ListAgentsQueryParams(select=["id", "status"])
+        async for page in paginate(agents_manager.list, params):
+            ...
+
+        async for page in paginate(syscheck_manager.get_results, ScanResultParams(), "001"):
+            ...
+    """
+    offset = params.offset or 0
+    limit = params.limit or DEFAULT_LIMIT
+    if tuner is not None:
+        limit = tuner.start(limit)
+    while True:
+        started = time.perf_counter()
+        page = await method(*args, replace(params, offset=offset, limit=limit))
+        latency = time.perf_counter() - started
+        items = page.data["affected_items"]
+        if checker is not None:
+            checker.check_total(checker.first_total, page.data["total_affected_items"])
+            page.data["affected_items"] = checker.dedupe(items)
+        yield page
+        offset += len(items)
+        if not items or offset >= page.data["total_affected_items"]:
+            break
+        if tuner is not None:
+            limit = tuner.observe(limit, items, latency)
+
+
+class ConsistencyChecker:
+    """
+    Watch a paginated walk for changes of the listing: `total_affected_items` not matching the
+    expected count and items seen twice. Duplicates are dropped by `key`.
+
+    Examples:
+        checker = ConsistencyChecker()
+        async for page in paginate(agents_manager.list, params, checker=checker):
+            ...
+        if not checker.consistent:
+            print(checker.report())
+    """
+
+    def __init__(self, key: str = "id"):
+        self.key = key
+        self.seen: set[Any] = set()
+        self.duplicates = 0
+        self.first_total: Optional[int] = None
+        self.changes: List[tuple[int, int]] = []  # (expected, reported) totals
+
+    @property
+    def consistent(self) -> bool:
+        return not self.changes and not self.duplicates
+
+    def check_total(self, expected: Optional[int], reported: int) -> None:
+        if self.first_total is None:
+            self.first_total = reported
+        elif expected is not None and expected != reported:
+            self.changes.append((expected, reported))
+
+    def dedupe(self, items: List[dict[str, Any]]) -> List[dict[str, Any]]:
+        unique = []
+        for item in items:
+            value = item.get(self.key)
+            if value in self.seen:
+                self.duplicates += 1
+                continue
+            self.seen.add(value)
+            unique.append(item)
+        return unique
+
+    def report(self) -> str:
+        changes = ", ".join(f"{expected} -> {reported}" for expected, reported in self.changes)
+        return (
+            f"{len(self.seen)} item(s), {self.duplicates} duplicate(s) dropped, "
+            f"total changed {len(self.changes)} time(s){': ' + changes if changes else ''}."
+        )
+
+
+def _after(q: Optional[str], key: str, last: Any) -> str:
+    value = int(last) if isinstance(last, str) and last.isdigit() else last
+    condition = f"{key}>{value}"
+    if not q:
+        return condition
+    return f"({q});{condition}" if "," in q else f"{q};{condition}"
+
+
+async def paginate_keyset(
+    method: Callable[..., Awaitable[APIResponse]],
+    params: PaginationQueryParams,
+    *args: Any,
+    key: str = "id",
+    tuner: Optional[PageSizeTuner] = None,
+    checker: Optional[ConsistencyChecker] = None,
+) -> AsyncIterator[APIResponse]:
+    """
+    Walk a listing sorted by `key`, each page asking for the items after the last one seen
+    (`q=<key>>last`) instead of an offset.
+
+    Pages cost the same at any depth, and items added or removed during the walk don't shift
+    the next pages: no item present for the whole walk is skipped or returned twice.
+    `params.q` is combined with the keyset condition, `params.sort` must be unset.
+    The `checker` (one is created when not given) drops duplicates and records the changes of
+    `total_affected_items`, which counts the items left after each page.
+
+    Examples:
+        checker = ConsistencyChecker()
+        params = ListAgentsQueryParams(select=["id", "status"], limit=10000)
+        async for page in paginate_keyset(agents_manager.list, params, checker=checker):
+            ...
+    """
+    if params.sort and params.sort.lstrip("+") != key:
+        raise ValueError(f"keyset pagination sorts by {key}, `sort` must be unset")
+    checker = checker or ConsistencyChecker(key)
+    checker.key = key
+    limit = params.limit or DEFAULT_LIMIT
+    if tuner is not None:
+        limit = tuner.start(limit)
+    last: Any = None
+    expected: Optional[int] = None
+    while True:
+        page_params = replace(
+            params,
+            offset=0,
+            limit=limit,
+            sort=f"+{key}",
+            q=params.q if last is None else _after(params.q, key, last),
+        )
+        started = time.perf_counter()
+        page = await method(*args, page_params)
+        latency = time.perf_counter() - started
+        items = page.data["affected_items"]
+        total = page.data["total_affected_items"]
+        checker.check_total(expected, total)
+        expected = total - len(items)
+        if items:
+            last = items[-1][key]
+        page.data["affected_items"] = checker.dedupe(items)
+        yield page
+        if len(items) < limit or expected <= 0:
+            break
+        if tuner is not None:
+            limit = tuner.observe(limit, items, latency)
+
+
+async def fetch_all(
+    method: Callable[..., Awaitable[APIResponse]],
+    params: PaginationQueryParams,
+    *args: Any,
+    concurrency: int = 4,
+) -> List[Any]:
+    """
+    Return every item of a listing. The first page tells the total, the following ones are
+    then fetched `concurrency` at a time, by offset.
+
+    The pages must not shift while they are fetched: use it on listings that don't change
+    during the walk (e.g. the ruleset or the MITRE database) with a stable `sort`.
+
+    Examples:
+        params = ListMitreTechniquesQueryParams(limit=500, sort="+id")
+        techniques = await fetch_all(mitre_manager.list_techniques, params, concurrency=8)
+    """
+    offset = params.offset or 0
+    limit = params.limit or DEFAULT_LIMIT
+    first = await method(*args, replace(params, offset=offset, limit=limit))
+    items = list(first.data["affected_items"])
+    total = first.data["total_affected_items"]
+    if len(items) < limit:
+        return items
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(page_offset: int) -> List[Any]:
+        async with semaphore:
+            page = await method(*args, replace(params, offset=page_offset, limit=limit))
+        return page.data["affected_items"]
+
+    pages = await asyncio.gather(
+        *(fetch(page_offset) for page_offset in range(offset + limit, total, limit))
+    )
+    for page_items in pages:
+        items.extend(page_items)
+    return items
@@ -35,4 +35,22 @@ class PaginationQueryParams(ToDictDataClass):
     )
     search: Optional[str] = None  # string; prepend "-" for complementary search
     select: Optional[List[str]] = None
-    q: Optional[str] = None  # Query string (e.g. 'status=active')
\ No newline at end of file
+    q: Optional[str] = None  # Query string (e.g. 'status=active')
+
+
+@dataclass(kw_only=True)
+class ListQueryParams(CommonQueryParams, PaginationQueryParams):
+    pass
+
+
+def apply_kwargs(params: Any, kwargs: dict[str, Any]) -> Any:
+    """
+    Set the keyword arguments given to a manager method on its query params dataclass.
+    """
+    for param, value in kwargs.items():
+        if not hasattr(type(params), param):
+            raise ValueError(
+                f"Invalid parameter: {param}, keyword argument must be one of : {list(type(params).__dataclass_fields__.keys())}"
+            )
+        setattr(params, param, value)
+    return params
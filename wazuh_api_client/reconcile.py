@@ -0,0 +1,155 @@
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Iterable, List, Mapping
+
+from .interfaces import AsyncClientInterface
+from .managers.agents import AgentsManager, ListAgentsQueryParams
+from .pagination import paginate
+from .utils import chunks
+
+DEFAULT_GROUP = "default"
+
+
+def _sample(agents: List[str], size: int = 10) -> str:
+    more = " ..." if len(agents) > size else ""
+    return f"{len(agents)} agent(s) {', '.join(agents[:size])}{more}"
+
+
+@dataclass
+class GroupMembershipPlan:
+    """
+    Difference between the desired and the current group membership, group by group.
+    """
+
+    additions: dict[str, List[str]] = field(default_factory=dict)
+    removals: dict[str, List[str]] = field(default_factory=dict)
+    unchanged: int = 0
+    unknown_agents: List[str] = field(default_factory=list)
+    chunk_size: int = 500
+
+    @property
+    def calls(self) -> int:
+        """
+        Number of API calls applying the plan takes.
+        """
+        return sum(
+            len(chunks(agents, self.chunk_size))
+            for changes in (self.additions, self.removals)
+            for agents in changes.values()
+        )
+
+    def report(self) -> str:
+        """
+        Human readable summary of the plan, e.g. for a dry run.
+        """
+        lines = [
+            f"{len(self.additions)} group(s) to extend, {len(self.removals)} group(s) to shrink, "
+            f"{self.unchanged} agent(s) unchanged, {self.calls} API call(s)."
+        ]
+        for group, agents in sorted(self.additions.items()):
+            lines.append(f"+ {group}: {_sample(agents)}")
+        for group, agents in sorted(self.removals.items()):
+            lines.append(f"- {group}: {_sample(agents)}")
+        if self.unknown_agents:
+            lines.append(f"! unknown agents: {_sample(self.unknown_agents)}")
+        return "\n".join(lines)
+
+
+@dataclass
+class GroupMembershipResult:
+    plan: GroupMembershipPlan
+    failed_items: List[Any] = field(default_factory=list)
+
+
+class GroupReconciler:
+    """
+    Converge agents group membership to a desired state with the fewest API calls.
+
+    The current membership is read from the `group` field of the listed agents, then for every
+    group the agents to assign and to remove are sent with `assign_agents_to_group` and
+    `remove_agents_from_group`, `chunk_size` agents per call. Assignments are applied before
+    removals so agents never fall back to the default group in between.
+
+    The `default` group is left alone unless `manage_default` is set.
+
+    Examples:
+        reconciler = GroupReconciler(client)
+        plan = await reconciler.plan({"001": ["web", "linux"], "002": ["db"]})
+        print(plan.report())  # dry run
+        result = await reconciler.apply(plan)
+    """
+
+    def __init__(
+        self,
+        client: AsyncClientInterface,
+        chunk_size: int = 500,
+        manage_default: bool = False,
+    ):
+        self.agents_manager = AgentsManager(client)
+        self.chunk_size = chunk_size
+        self.manage_default = manage_default
+
+    async def current_membership(self, agents: List[str]) -> dict[str, set[str]]:
+        membership: dict[str, set[str]] = {}
+        for chunk in chunks(agents, self.chunk_size):
+            params = ListAgentsQueryParams(
+                agents_list=chunk,
+                select=["group"],
+                group_config_status=None,
+                limit=len(chunk),
+            )
+            async for page in paginate(self.agents_manager.list, params):
+                for item in page.data["affected_items"]:
+                    membership[item["id"]] = set(item.get("group") or [])
+        return membership
+
+    async def plan(self, desired: Mapping[str, Iterable[str]]) -> GroupMembershipPlan:
+        current = await self.current_membership(list(desired))
+        additions: dict[str, List[str]] = defaultdict(list)
+        removals: dict[str, List[str]] = defaultdict(list)
+        plan = GroupMembershipPlan(chunk_size=self.chunk_size)
+
+        for agent_id, groups in desired.items():
+            if agent_id not in current:
+                plan.unknown_agents.append(agent_id)
+                continue
+            wanted = set(groups)
+            actual = current[agent_id]
+            if not self.manage_default:
+                wanted.discard(DEFAULT_GROUP)
+                actual = actual - {DEFAULT_GROUP}
+            if wanted == actual:
+                plan.unchanged += 1
+                continue
+            for group in wanted - actual:
+                additions[group].append(agent_id)
+            for group in actual - wanted:
+                removals[group].append(agent_id)
+
+        plan.additions = dict(additions)
+        plan.removals = dict(removals)
+        return plan
+
+    async def apply(self, plan: GroupMembershipPlan) -> GroupMembershipResult:
+        result = GroupMembershipResult(plan=plan)
+        for group, agents in plan.additions.items():
+            for chunk in chunks(agents, plan.chunk_size):
+                response = await self.agents_manager.assign_agents_to_group(
+                    group_id=group, agents_list=chunk
+                )
+                result.failed_items.extend(response.data.get("failed_items", []))
+        for group, agents in plan.removals.items():
+            for chunk in chunks(agents, plan.chunk_size):
+                response = await self.agents_manager.remove_agents_from_group(
+                    agents_list=chunk, group_id=group
+                )
+                result.failed_items.extend(response.data.get("failed_items", []))
+        return result
+
+    async def reconcile(
+        self, desired: Mapping[str, Iterable[str]], dry_run: bool = False
+    ) -> GroupMembershipResult:
+        plan = await self.plan(desired)
+        if dry_run:
+            return GroupMembershipResult(plan=plan)
+        return await self.apply(plan)
@@ -0,0 +1,334 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from ssl import SSLContext
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, List, Optional
+
+from httpx import Limits
+
+from .client import AsyncWazuhClient
+from .exceptions import WazuhError
+from .managers.agents import AgentsManager
+from .tokens import TokenStore
+
+
+@dataclass
+class TenantConfig:
+    """
+    Connection settings of one manager, `options` are passed to AsyncWazuhClient as is.
+    Setting `version` saves the version detection request when the client is initialized.
+    """
+
+    base_url: str
+    username: str
+    password: str
+    version: str = ""
+    verify: SSLContext | str | bool = False
+    timeout: Optional[float] = None
+    options: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class TenantResult:
+    tenant: str
+    value: Any = None
+    error: Optional[BaseException] = None
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class FleetSummary:
+    """
+    Counters summed over the tenants that answered, `tenants` holds the result of each one.
+    """
+
+    totals: dict[str, Any]
+    tenants: dict[str, TenantResult]
+
+    @property
+    def failed(self) -> List[str]:
+        return [name for name, result in self.tenants.items() if not result.ok]
+
+
+def merge_counts(total: dict[str, Any], counts: dict[str, Any]) -> dict[str, Any]:
+    """
+    Add the numbers of `counts` to `total`, recursing into nested dictionaries.
+    """
+    for key, value in counts.items():
+        if isinstance(value, dict):
+            merge_counts(total.setdefault(key, {}), value)
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            total[key] = total.get(key, 0) + value
+    return total
+
+
+class _Tenant:
+    def __init__(self, config: TenantConfig):
+        self.config = config
+        self.client: Optional[AsyncWazuhClient] = None
+        self.lock = asyncio.Lock()
+        self.in_use = 0
+        self.last_used = time.monotonic()
+
+
+class ManagerRegistry:
+    """
+    Clients of many independent managers, created on first use and closed once idle.
+
+    All the clients share a budget of `max_concurrency` requests in flight, each one keeps at
+    most `max_connections` connections. At most `max_clients` clients are open and in use at
+    once, the least recently used idle ones are closed to make room, and clients unused for
+    `idle_timeout` seconds are closed (checked whenever a client is opened, or with `evict_idle()`).
+
+    `run()` calls a function with the client of every tenant concurrently, each tenant bounded by
+    its own timeout (`TenantConfig.timeout`, default `tenant_timeout`) that starts once the
+    tenant got one of the `max_clients` slots and covers the client initialization and the
+    requests. Failures are reported per tenant.
+
+    Examples:
+        registry = ManagerRegistry(max_concurrency=64)
+        for name, url in managers.items():
+            registry.register(name, TenantConfig(url, "wazuh", password, version="4.8.0"))
+        async with registry:
+            summary = await registry.summarize_agents_status()
+            print(summary.totals["connection"], summary.failed)
+    """
+
+    def __init__(
+        self,
+        tenants: Optional[dict[str, TenantConfig]] = None,
+        max_concurrency: int = 64,
+        max_connections: int = 4,
+        max_clients: int = 100,
+        idle_timeout: float = 300.0,
+        tenant_timeout: float = 30.0,
+        token_store: Optional[TokenStore] = None,
+    ):
+        if max_concurrency < 1 or max_connections < 1 or max_clients < 1:
+            raise ValueError("`max_concurrency`, `max_connections` and `max_clients` must be positive")
+        self.max_concurrency = max_concurrency
+        self.max_connections = max_connections
+        self.max_clients = max_clients
+        self.idle_timeout = idle_timeout
+        self.tenant_timeout = tenant_timeout
+        self.token_store = token_store
+        self._tenants: dict[str, _Tenant] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._slot_semaphore: Optional[asyncio.Semaphore] = None
+        for name, config in (tenants or {}).items():
+            self.register(name, config)
+
+    @property
+    def tenants(self) -> List[str]:
+        return list(self._tenants)
+
+    @property
+    def open_clients(self) -> List[str]:
+        return [name for name, tenant in self._tenants.items() if tenant.client is not None]
+
+    def register(self, name: str, config: TenantConfig) -> None:
+        if name in self._tenants:
+            raise ValueError(f"Tenant already registered: {name}")
+        self._tenants[name] = _Tenant(config)
+
+    async def unregister(self, name: str) -> None:
+        tenant = self._tenants.pop(name)
+        await self._close(tenant)
+
+    def _tenant(self, name: str) -> _Tenant:
+        try:
+            return self._tenants[name]
+        except KeyError:
+            raise WazuhError(f"Unknown tenant: {name}") from None
+
+    def _budget(self) -> asyncio.Semaphore:
+        # Created lazily, so it belongs to the running event loop.
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def _open(self, tenant: _Tenant) -> AsyncWazuhClient:
+        config = tenant.config
+        options = dict(config.options)
+        if self.token_store is not None:
+            options.setdefault("token_store", self.token_store)
+        client = AsyncWazuhClient(
+            config.base_url,
+            config.version,
+            config.username,
+            config.password,
+            verify=config.verify,
+            limits=Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections,
+            ),
+            request_semaphore=self._budget(),
+            **options,
+        )
+        try:
+            await client.async_init()
+        except BaseException:
+            await client.close()
+            raise
+        # Later clients of this manager skip the version detection.
+        config.version = client.version
+        return client
+
+    async def _close(self, tenant: _Tenant) -> None:
+        client, tenant.client = tenant.client, None
+        if client is not None:
+            await client.close()
+
+    async def evict_idle(self) -> List[str]:
+        """
+        Close the clients unused for `idle_timeout` seconds and return their tenants.
+        """
+        now = time.monotonic()
+        evicted = [
+            name
+            for name, tenant in self._tenants.items()
+            if tenant.client is not None
+            and not tenant.in_use
+            and now - tenant.last_used > self.idle_timeout
+        ]
+        for name in evicted:
+            await self._close(self._tenants[name])
+        return evicted
+
+    async def _trim(self, room: int = 0) -> None:
+        """
+        Close the least recently used idle clients until `room` more clients fit in `max_clients`.
+        """
+        idle = sorted(
+            (
+                tenant
+                for tenant in self._tenants.values()
+                if tenant.client is not None and not tenant.in_use
+            ),
+            key=lambda tenant: tenant.last_used,
+        )
+        excess = len(self.open_clients) + room - self.max_clients
+        for tenant in idle[: max(0, excess)]:
+            await self._close(tenant)
+
+    async def _client(self, name: str) -> AsyncWazuhClient:
+        """
+        Return the client of `name`, initializing it on first use. Only called through
+        `_borrow`, which marks the tenant in use so `_trim` leaves its client open.
+        """
+        tenant = self._tenant(name)
+        tenant.last_used = time.monotonic()
+        if tenant.client is not None:
+            return tenant.client
+        async with tenant.lock:
+            if tenant.client is None:
+                await self.evict_idle()
+                await self._trim(room=1)
+                tenant.client = await self._open(tenant)
+        return tenant.client
+
+    def _slots(self) -> asyncio.Semaphore:
+        # Created lazily, so it belongs to the running event loop.
+        if self._slot_semaphore is None:
+            self._slot_semaphore = asyncio.Semaphore(self.max_clients)
+        return self._slot_semaphore
+
+    @asynccontextmanager
+    async def _borrow(self, name: str) -> AsyncIterator[AsyncWazuhClient]:
+        tenant = self._tenant(name)
+        tenant.in_use += 1
+        try:
+            yield await self._client(name)
+        finally:
+            tenant.in_use -= 1
+            tenant.last_used = time.monotonic()
+            await self._trim()
+
+    @asynccontextmanager
+    async def use(self, name: str) -> AsyncIterator[AsyncWazuhClient]:
+        """
+        Client of `name`, protected from eviction until the block exits. At most `max_clients`
+        blocks run at once, so the open clients stay within the limit.
+        """
+        async with self._slots():
+            async with self._borrow(name) as client:
+                yield client
+
+    async def _run_one(
+        self,
+        name: str,
+        function: Callable[[AsyncWazuhClient], Awaitable[Any]],
+        timeout: Optional[float],
+    ) -> TenantResult:
+        tenant = self._tenant(name)
+        timeout = timeout if timeout is not None else tenant.config.timeout or self.tenant_timeout
+        result = TenantResult(name)
+
+        async def call() -> Any:
+            async with self._borrow(name) as client:
+                return await function(client)
+
+        # The timeout starts once the tenant has a slot.
+        async with self._slots():
+            started = time.perf_counter()
+            try:
+                result.value = await asyncio.wait_for(call(), timeout)
+            except asyncio.TimeoutError as e:
+                result.error = WazuhError(f"Tenant {name} timed out after {timeout:.2f}s.")
+                result.error.__cause__ = e
+            except Exception as e:
+                result.error = e
+            result.elapsed = time.perf_counter() - started
+        return result
+
+    async def run(
+        self,
+        function: Callable[[AsyncWazuhClient], Awaitable[Any]],
+        tenants: Optional[Iterable[str]] = None,
+        timeout: Optional[float] = None,
+    ) -> dict[str, TenantResult]:
+        """
+        Call `function(client)` for each tenant (all of them by default) concurrently.
+        `timeout` overrides the timeout of every tenant.
+
+        Examples:
+            results = await registry.run(lambda client: AgentsManager(client).list(limit=1))
+        """
+        names = list(tenants) if tenants is not None else self.tenants
+        results = await asyncio.gather(
+            *(self._run_one(name, function, timeout) for name in names)
+        )
+        return {result.tenant: result for result in results}
+
+    async def summarize_agents_status(
+        self, tenants: Optional[Iterable[str]] = None, timeout: Optional[float] = None
+    ) -> FleetSummary:
+        """
+        Agents connection and configuration statuses of every tenant, summed.
+        """
+
+        async def summarize(client: AsyncWazuhClient) -> dict[str, Any]:
+            response = await AgentsManager(client).summarize_agents_status()
+            return response.data
+
+        results = await self.run(summarize, tenants, timeout)
+        totals: dict[str, Any] = {}
+        for result in results.values():
+            if result.ok:
+                merge_counts(totals, result.value)
+        return FleetSummary(totals=totals, tenants=results)
+
+    async def close(self) -> None:
+        for tenant in self._tenants.values():
+            await self._close(tenant)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
@@ -0,0 +1,176 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, List, Literal
+
+from .enums import AgentStatus
+from .exceptions import WazuhError
+from .interfaces import AsyncClientInterface
+from .managers.agents import AgentsManager, ListAgentsQueryParams
+from .pagination import paginate
+from .utils import chunks
+
+
+@dataclass
+class RestartWave:
+    index: int
+    agents: List[str]
+    recovered: List[str] = field(default_factory=list)
+    failed: List[str] = field(default_factory=list)
+    duration: float = 0.0
+
+    @property
+    def failure_rate(self) -> float:
+        return len(self.failed) / len(self.agents) if self.agents else 0.0
+
+
+class RollingRestartAborted(WazuhError):
+    """Exception raised when a restart wave fails more than the allowed threshold."""
+
+    def __init__(self, message: str, wave: RestartWave):
+        super().__init__(message)
+        self.wave = wave
+
+
+class RollingRestart:
+    """
+    Restart agents in waves, waiting for each wave to come back before starting the next one.
+
+    After restarting a wave, its agents are polled every `poll_interval` seconds with a listing
+    selecting only their status, `lastKeepAlive` and `disconnection_time`. An agent is back once it
+    went down after the restart call (seen not active, or with a new `disconnection_time`) and is
+    active again with a newer keep alive. Agents not back after `settle_timeout` seconds are failed.
+
+    When the failure rate of a wave is above `failure_threshold`, the restart either stops
+    (`on_threshold="abort"`, raising RollingRestartAborted) or slows down (`on_threshold="slow_down"`),
+    halving the wave size and doubling the pause between waves. Healthy waves grow them back.
+
+    Examples:
+        rolling_restart = RollingRestart(client, wave_size=200, failure_threshold=0.05)
+        async for wave in rolling_restart.restart_group("web"):
+            print(wave.index, len(wave.recovered), len(wave.failed))
+    """
+
+    def __init__(
+        self,
+        client: AsyncClientInterface,
+        wave_size: int = 100,
+        settle_timeout: float = 300.0,
+        poll_interval: float = 10.0,
+        failure_threshold: float = 0.1,
+        on_threshold: Literal["abort", "slow_down"] = "abort",
+        pause: float = 0.0,
+        min_wave_size: int = 1,
+    ):
+        if on_threshold not in ("abort", "slow_down"):
+            raise ValueError("`on_threshold` must be one of: abort or slow_down")
+        for name, value in (("wave_size", wave_size), ("min_wave_size", min_wave_size)):
+            if value < 1:
+                raise ValueError(f"`{name}` must be a positive integer")
+        self.agents_manager = AgentsManager(client)
+        self.wave_size = wave_size
+        self.settle_timeout = settle_timeout
+        self.poll_interval = poll_interval
+        self.failure_threshold = failure_threshold
+        self.on_threshold = on_threshold
+        self.pause = pause
+        self.min_wave_size = min_wave_size
+
+    async def run(self, agents_list: List[str]) -> AsyncIterator[RestartWave]:
+        wave_size = self.wave_size
+        pause = self.pause
+        remaining = list(agents_list)
+        index = 0
+        while remaining:
+            wave = RestartWave(index=index, agents=remaining[:wave_size])
+            remaining = remaining[wave_size:]
+            await self._restart_wave(wave)
+            yield wave
+
+            if wave.failure_rate > self.failure_threshold:
+                message = (
+                    f"Wave {wave.index}: {len(wave.failed)}/{len(wave.agents)} agents "
+                    f"did not come back (threshold {self.failure_threshold:.0%})."
+                )
+                if self.on_threshold == "abort":
+                    raise RollingRestartAborted(message, wave)
+                wave_size = max(self.min_wave_size, wave_size // 2)
+                pause = max(pause * 2, self.poll_interval)
+            elif wave_size < self.wave_size:
+                wave_size = min(self.wave_size, wave_size * 2)
+                pause = max(self.pause, pause / 2)
+
+            index += 1
+            if remaining and pause:
+                await asyncio.sleep(pause)
+
+    async def restart_group(self, group_id: str) -> AsyncIterator[RestartWave]:
+        async for wave in self.run(await self._list_ids(group=group_id)):
+            yield wave
+
+    async def restart_node(self, node_id: str) -> AsyncIterator[RestartWave]:
+        async for wave in self.run(await self._list_ids(node_name=node_id)):
+            yield wave
+
+    async def _list_ids(self, **filters) -> List[str]:
+        params = ListAgentsQueryParams(
+            select=["id"],
+            status=[AgentStatus.ACTIVE],
+            group_config_status=None,
+            **filters,
+        )
+        ids: List[str] = []
+        async for page in paginate(self.agents_manager.list, params):
+            ids.extend(item["id"] for item in page.data["affected_items"])
+        # The manager itself is listed as agent 000 and cannot be restarted this way.
+        return [agent_id for agent_id in ids if agent_id != "000"]
+
+    async def _states(self, agents_list: List[str]) -> dict[str, dict[str, Any]]:
+        states: dict[str, dict[str, Any]] = {}
+        for chunk in chunks(agents_list, 500):
+            params = ListAgentsQueryParams(
+                agents_list=chunk,
+                select=["status", "lastKeepAlive", "disconnection_time"],
+                group_config_status=None,
+                limit=len(chunk),
+            )
+            async for page in paginate(self.agents_manager.list, params):
+                for item in page.data["affected_items"]:
+                    states[item["id"]] = item
+        return states
+
+    async def _restart_wave(self, wave: RestartWave) -> None:
+        if not wave.agents:
+            # An empty agents_list restarts every agent.
+            raise ValueError("A restart wave needs at least one agent")
+        started = time.monotonic()
+        before = await self._states(wave.agents)
+        response = await self.agents_manager.restart_agents(wave.agents)
+        for failed_item in response.data.get("failed_items", []):
+            wave.failed.extend(str(agent_id) for agent_id in failed_item.get("id", []))
+
+        waiting = [agent_id for agent_id in wave.agents if agent_id not in wave.failed]
+        # Agents known to have gone down since the restart call. A newer keep alive alone
+        # proves nothing: an agent ignoring the restart keeps sending them.
+        went_down: set[str] = set()
+        deadline = started + self.settle_timeout
+        while waiting and time.monotonic() < deadline:
+            await asyncio.sleep(self.poll_interval)
+            states = await self._states(waiting)
+            back = set()
+            for agent_id, state in states.items():
+                previous = before.get(agent_id, {})
+                if state.get("status") != AgentStatus.ACTIVE.value or state.get(
+                    "disconnection_time"
+                ) != previous.get("disconnection_time"):
+                    went_down.add(agent_id)
+                if (
+                    agent_id in went_down
+                    and state.get("status") == AgentStatus.ACTIVE.value
+                    and state.get("lastKeepAlive") != previous.get("lastKeepAlive")
+                ):
+                    back.add(agent_id)
+            wave.recovered.extend(agent_id for agent_id in waiting if agent_id in back)
+            waiting = [agent_id for agent_id in waiting if agent_id not in back]
+        wave.failed.extend(waiting)
+        wave.duration = time.monotonic() - started
@@ -0,0 +1,1024 @@
+"""
+Wazuh manager simulator, a local stand-in to load test the client.
+
+It serves the V4ApiPaths routes the managers use (agents listing, distinct values and summaries,
+restarts, groups, upgrades and tasks, syscheck, CDB lists, manager status, stats and logs) over a
+synthetic fleet, over plain HTTP/1.1
+with keep-alive, and injects the faults of a stressed manager: latency drawn from a log-normal
+distribution (plus a cost per returned item), 429 rate limiting, 5xx errors, requests that never
+get a response, and expiring tokens.
+
+    python -m wazuh_api_client.simulator --agents 50000 --latency-median 0.02 --rate-limit 5000
+
+uvloop is used when installed. The simulator can also run in process:
+
+    async with Simulator(SimulatorConfig(agents=1000, error_rate=0.01)) as simulator:
+        client = AsyncWazuhClient(simulator.url, "4", "wazuh", "wazuh")
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import os
+import random
+import re
+import ssl
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from http import HTTPStatus
+from typing import Any, Awaitable, Callable, List, Optional
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+from .endpoints.endpoints_v4 import V4ApiPaths
+from .utils import flatten_dict
+
+MAX_LIMIT = 100000
+STATUSES = (
+    ("active", 0.80),
+    ("disconnected", 0.15),
+    ("never_connected", 0.03),
+    ("pending", 0.02),
+)
+PLATFORMS = (
+    {
+        "platform": "ubuntu",
+        "name": "Ubuntu",
+        "major": "22",
+        "minor": "04",
+        "version": "22.04.3 LTS",
+        "codename": "Jammy Jellyfish",
+        "arch": "x86_64",
+    },
+    {
+        "platform": "centos",
+        "name": "CentOS Stream",
+        "major": "9",
+        "minor": "",
+        "version": "9",
+        "codename": "",
+        "arch": "x86_64",
+    },
+    {
+        "platform": "windows",
+        "name": "Microsoft Windows Server 2022",
+        "major": "10",
+        "minor": "0",
+        "version": "10.0.20348",
+        "codename": "",
+        "arch": "x86_64",
+    },
+    {
+        "platform": "darwin",
+        "name": "macOS",
+        "major": "14",
+        "minor": "2",
+        "version": "14.2",
+        "codename": "Sonoma",
+        "arch": "arm64",
+    },
+)
+GROUPS = ("web", "db", "linux", "windows", "pci", "dmz")
+AGENT_VERSIONS = ("Wazuh v4.7.2", "Wazuh v4.7.2", "Wazuh v4.6.0", "Wazuh v4.5.4")
+MANAGER_VERSION = "v4.7.2"
+WEEK_DAYS = ("Sun", "Mon", "Tue", "Wed", "Thu", "Fri", "Sat")
+DAEMONS = ("wazuh-analysisd", "wazuh-remoted", "wazuh-db")
+AGENT_FILTERS = (
+    "status",
+    "group",
+    "node_name",
+    "name",
+    "ip",
+    "version",
+    "manager",
+    "os.platform",
+    "group_config_status",
+)
+QUERY_CONDITION = re.compile(r"^([\w.]+)(=|!=|<|>|~)(.*)$")
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S+00:00")
+
+
+def _b64(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+@dataclass
+class SimulatorConfig:
+    host: str = "127.0.0.1"
+    port: int = 55000
+    agents: int = 1000
+    nodes: int = 3
+    fim_files: int = 50  # syscheck findings per agent
+    seed: int = 0
+    username: Optional[str] = None  # any credentials are accepted when not set
+    password: Optional[str] = None
+    token_ttl: float = 900.0
+    latency_median: float = 0.0  # seconds, log-normal
+    latency_sigma: float = 0.5
+    latency_per_item: float = 0.0  # seconds per returned item
+    rate_limit: float = 0.0  # requests per second, 0 disables the 429 responses
+    rate_burst: int = 100
+    error_rate: float = 0.0  # fraction of 500/502/503 responses
+    timeout_rate: float = 0.0  # fraction of requests left without response
+    hang: float = 60.0  # seconds before the connection of an unanswered request is closed
+    restart_delay: float = 2.0  # seconds before a restarted agent reports back
+    restart_failure_rate: float = 0.0  # fraction of restarted agents not coming back
+    upgrade_delay: float = 5.0
+    churn: float = 0.0  # agents flipping between active and disconnected per second
+    flat_summary: bool = False  # flat status counters, as managers older than 4.4
+    certfile: Optional[str] = None
+    keyfile: Optional[str] = None
+
+
+@dataclass
+class SimulatorStats:
+    requests: int = 0
+    statuses: Counter = field(default_factory=Counter)
+    hung: int = 0
+    started: float = field(default_factory=time.monotonic)
+
+    def report(self) -> str:
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        statuses = ", ".join(f"{status}: {n}" for status, n in sorted(self.statuses.items()))
+        return (
+            f"{self.requests} requests ({self.requests / elapsed:.0f}/s), "
+            f"{self.hung} unanswered, statuses {statuses or '-'}"
+        )
+
+
+class Fleet:
+    """
+    Synthetic agents, FIM findings, upgrade tasks and manager logs.
+    """
+
+    def __init__(self, config: SimulatorConfig):
+        self.config = config
+        self.random = random.Random(config.seed)
+        self.agents: List[dict[str, Any]] = [self._manager_agent()]
+        self.agents.extend(self._agent(i) for i in range(1, config.agents + 1))
+        self.by_id = {agent["id"]: agent for agent in self.agents}
+        self.tasks: dict[int, dict[str, Any]] = {}
+        self.logs: List[dict[str, Any]] = []
+        self.lists: dict[str, List[tuple[str, str]]] = {}
+        # Bumped on every change, invalidates the cached listings and summaries.
+        self.version = 0
+
+    def _manager_agent(self) -> dict[str, Any]:
+        now = _now()
+        return {
+            "id": "000",
+            "name": "wazuh-manager",
+            "ip": "127.0.0.1",
+            "registerIP": "127.0.0.1",
+            "status": "active",
+            "status_code": 0,
+            "node_name": "node01",
+            "manager": "wazuh-manager",
+            "version": f"Wazuh {MANAGER_VERSION}",
+            "dateAdd": now,
+            "lastKeepAlive": "9999-12-31T23:59:59+00:00",
+            "os": {**PLATFORMS[0], "uname": "Linux |wazuh-manager |5.15.0 |#1 SMP |x86_64"},
+        }
+
+    def _agent(self, i: int) -> dict[str, Any]:
+        rnd = self.random
+        status = rnd.choices([s for s, _ in STATUSES], [w for _, w in STATUSES])[0]
+        added = datetime.now(timezone.utc) - timedelta(days=rnd.randint(1, 700))
+        name = f"agent-{i:05d}"
+        agent: dict[str, Any] = {
+            "id": f"{i:03d}",
+            "name": name,
+            "ip": f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}",
+            "registerIP": "any",
+            "status": status,
+            "status_code": 0,
+            "dateAdd": added.strftime("%Y-%m-%dT%H:%M:%S+00:00"),
+        }
+        if status == "never_connected":
+            return agent
+        agent_os = dict(rnd.choice(PLATFORMS))
+        agent_os["uname"] = f"{agent_os['name']} |{name} |{agent_os['version']}"
+        last_keep_alive = datetime.now(timezone.utc) - timedelta(
+            seconds=rnd.randint(0, 60) if status == "active" else rnd.randint(600, 864000)
+        )
+        agent.update(
+            {
+                "node_name": f"node{rnd.randint(1, self.config.nodes):02d}",
+                "manager": "wazuh-manager",
+                "version": rnd.choice(AGENT_VERSIONS),
+                "lastKeepAlive": last_keep_alive.strftime("%Y-%m-%dT%H:%M:%S+00:00"),
+                "os": agent_os,
+                "group": ["default"] + rnd.sample(GROUPS, rnd.randint(0, 2)),
+                "group_config_status": "synced" if rnd.random() < 0.95 else "not_synced",
+                "mergedSum": f"{rnd.getrandbits(128):032x}",
+                "configSum": f"{rnd.getrandbits(128):032x}",
+            }
+        )
+        return agent
+
+    def changed(self) -> None:
+        self.version += 1
+
+    def fim(self, agent_id: str) -> List[dict[str, Any]]:
+        rnd = random.Random(f"{self.config.seed}-{agent_id}")
+        return [
+            {
+                "file": f"/etc/app/conf.d/{n:04d}.conf",
+                "type": "file",
+                "size": rnd.randint(100, 100000),
+                "perm": "rw-r--r--",
+                "uid": "0",
+                "gid": "0",
+                "md5": f"{rnd.getrandbits(128):032x}",
+                "sha1": f"{rnd.getrandbits(160):040x}",
+                "sha256": f"{rnd.getrandbits(256):064x}",
+                "mtime": "2024-01-01T00:00:00",
+                "date": "2024-01-02T00:00:00",
+            }
+            for n in range(self.config.fim_files)
+        ]
+
+    def log(self, level: str, tag: str, description: str) -> None:
+        self.logs.append(
+            {
+                "timestamp": _now().replace("+00:00", "Z"),
+                "tag": tag,
+                "level": level,
+                "description": description,
+            }
+        )
+        del self.logs[:-10000]
+
+    def churn(self, count: int) -> None:
+        candidates = [a for a in self.agents[1:] if a["status"] in ("active", "disconnected")]
+        for agent in self.random.sample(candidates, min(count, len(candidates))):
+            if agent["status"] == "active":
+                agent["status"] = "disconnected"
+                self.log("info", "wazuh-remoted", f"Agent '{agent['id']}' disconnected.")
+            else:
+                agent["status"] = "active"
+                agent["lastKeepAlive"] = _now()
+        self.changed()
+
+
+def _matches(value: Any, op: str, expected: str) -> bool:
+    if isinstance(value, list):
+        return any(_matches(v, op, expected) for v in value) if op != "!=" else all(
+            _matches(v, op, expected) for v in value
+        )
+    if value is None:
+        return op == "!="
+    value = str(value)
+    if op == "~":
+        return expected.lower() in value.lower()
+    if op in ("<", ">"):
+        if value.isdigit() and expected.isdigit():
+            left, right = int(value), int(expected)
+            return left < right if op == "<" else left > right
+        return value < expected if op == "<" else value > expected
+    return (value == expected) == (op == "=")
+
+
+def query_filter(q: str) -> Callable[[dict[str, Any]], bool]:
+    """
+    Compile a Wazuh query (`;` is AND, `,` is OR, operators = != < > ~) against flattened items.
+    """
+    groups = []
+    for and_part in q.split(";"):
+        conditions = []
+        for or_part in and_part.strip("()").split(","):
+            match = QUERY_CONDITION.match(or_part.strip())
+            if match:
+                conditions.append(match.groups())
+        groups.append(conditions)
+
+    def check(item: dict[str, Any]) -> bool:
+        return all(
+            any(_matches(item.get(name), op, value) for name, op, value in conditions)
+            for conditions in groups
+            if conditions
+        )
+
+    return check
+
+
+def _select(item: dict[str, Any], fields: List[str]) -> dict[str, Any]:
+    selected: dict[str, Any] = {"id": item["id"]} if "id" in item else {}
+    for name in fields:
+        head, _, rest = name.partition(".")
+        if head not in item:
+            continue
+        if rest and isinstance(item[head], dict):
+            if rest in item[head]:
+                selected.setdefault(head, {})[rest] = item[head][rest]
+        else:
+            selected[head] = item[head]
+    return selected
+
+
+def _sort_key(fields: List[str]) -> Callable[[dict[str, Any]], tuple]:
+    def key(item: dict[str, Any]) -> tuple:
+        values = []
+        for name in fields:
+            value = item.get(name)
+            if isinstance(value, str) and value.isdigit():
+                value = int(value)
+            values.append((value is None, value if isinstance(value, int) else str(value)))
+        return tuple(values)
+
+    return key
+
+
+def listing(
+    items: List[dict[str, Any]], params: dict[str, str], filters: tuple = ()
+) -> tuple[List[dict[str, Any]], int]:
+    """
+    Apply the query, search, sort, select and pagination parameters of a listing.
+    """
+    flat: Optional[List[dict[str, Any]]] = None
+    checks = [query_filter(params["q"])] if params.get("q") else []
+    for name in filters:
+        if params.get(name):
+            values = set(params[name].split(","))
+            checks.append(
+                lambda item, name=name, values=values: bool(
+                    set(item[name] if isinstance(item.get(name), list) else [str(item.get(name))])
+                    & values
+                )
+            )
+    if checks or params.get("search") or params.get("sort"):
+        flat = [flatten_dict(item) for item in items]
+        pairs = [(f, item) for f, item in zip(flat, items) if all(check(f) for check in checks)]
+        if params.get("search"):
+            needle = params["search"].lower()
+            pairs = [p for p in pairs if any(needle in str(v).lower() for v in p[0].values())]
+        for field_name in reversed(params.get("sort", "").split(",")):
+            if not field_name:
+                continue
+            descending = field_name.startswith("-")
+            key = _sort_key([field_name.lstrip("+- ")])
+            pairs.sort(key=lambda p: key(p[0]), reverse=descending)
+        items = [item for _, item in pairs]
+
+    offset = int(params.get("offset") or 0)
+    limit = int(params.get("limit") or 500)
+    page = items[offset : offset + limit]
+    if params.get("select"):
+        fields = params["select"].split(",")
+        page = [_select(item, fields) for item in page]
+    return page, len(items)
+
+
+def _data(
+    affected_items: List[Any],
+    total: Optional[int] = None,
+    failed_items: Optional[List[Any]] = None,
+    message: str = "",
+) -> dict[str, Any]:
+    failed_items = failed_items or []
+    return {
+        "data": {
+            "affected_items": affected_items,
+            "total_affected_items": len(affected_items) if total is None else total,
+            "total_failed_items": sum(len(f["id"]) for f in failed_items),
+            "failed_items": failed_items,
+        },
+        "message": message,
+        "error": 2 if failed_items and affected_items else (1 if failed_items else 0),
+    }
+
+
+def _failed(code: int, message: str, ids: List[str]) -> List[dict[str, Any]]:
+    if not ids:
+        return []
+    return [{"error": {"code": code, "message": message, "remediation": ""}, "id": ids}]
+
+
+def _problem(status: int, detail: str) -> tuple[int, dict[str, Any]]:
+    return status, {"title": HTTPStatus(status).phrase, "detail": detail, "error": status}
+
+
+Handler = Callable[[dict[str, str], dict[str, str], bytes], Awaitable[tuple[int, Any]]]
+
+
+class Simulator:
+    """
+    Asyncio HTTP server simulating a Wazuh manager, see the module documentation.
+    """
+
+    def __init__(self, config: Optional[SimulatorConfig] = None):
+        self.config = config or SimulatorConfig()
+        self.fleet = Fleet(self.config)
+        self.stats = SimulatorStats()
+        self.random = random.Random(self.config.seed)
+        self._tokens = float(self.config.rate_burst)
+        self._updated = time.monotonic()
+        self._server: Optional[asyncio.base_events.Server] = None
+        self._background: List[asyncio.Task] = []
+        self._cache: dict[tuple[str, str, int], tuple[int, bytes, int]] = {}
+        self._next_task_id = 1
+        self._issued: dict[str, float] = {}  # token -> expiration
+        self._routes: List[tuple[str, re.Pattern, Handler]] = []
+        for method, path, handler in (
+            ("POST", V4ApiPaths.GENERATE_TOKEN, self.authenticate),
+            ("GET", V4ApiPaths.LIST_AGENTS, self.list_agents),
+            ("GET", V4ApiPaths.LIST_AGENTS_DISTINCT, self.distinct_agents),
+            ("GET", V4ApiPaths.SUMMARIZE_AGENTS_STATUS, self.summary_status),
+            ("GET", V4ApiPaths.SUMMARIZE_AGENTS_OS, self.summary_os),
+            ("PUT", V4ApiPaths.RESTART_AGENTS, self.restart_agents),
+            ("PUT", V4ApiPaths.FORCE_RECONNECT_AGENTS, self.restart_agents),
+            ("PUT", V4ApiPaths.RESTART_AGENT, self.restart_agents),
+            ("PUT", V4ApiPaths.RESTART_AGENTS_IN_GROUP, self.restart_agents),
+            ("PUT", V4ApiPaths.RESTART_AGENTS_IN_NODE, self.restart_agents),
+            ("PUT", V4ApiPaths.ASSIGN_AGENT_TO_GROUP, self.assign_group),
+            ("DELETE", V4ApiPaths.REMOVE_AGENTS_FROM_GROUP, self.remove_group),
+            ("PUT", V4ApiPaths.UPGRADE_AGENTS, self.upgrade_agents),
+            ("PUT", V4ApiPaths.UPGRADE_AGENTS_CUSTOM, self.upgrade_agents),
+            ("GET", V4ApiPaths.GET_TASKS_STATUS, self.tasks_status),
+            ("PUT", V4ApiPaths.RUN_SCAN, self.run_scan),
+            ("GET", V4ApiPaths.GET_LAST_SCAN_DATETIME, self.last_scan),
+            ("GET", V4ApiPaths.GET_SCAN_RESULTS, self.scan_results),
+            ("DELETE", V4ApiPaths.CLEAR_SCAN_RESULTS, self.clear_scan_results),
+            ("GET", V4ApiPaths.GET_WAZUH_STATUS, self.manager_status),
+            ("GET", V4ApiPaths.GET_WAZUH_INFORMATION, self.manager_information),
+            ("GET", V4ApiPaths.GET_WAZUH_LOGS, self.manager_logs),
+            ("GET", V4ApiPaths.GET_WAZUH_STATS, self.manager_stats),
+            ("GET", V4ApiPaths.GET_WAZUH_STATS_HOUR, self.manager_stats_hour),
+            ("GET", V4ApiPaths.GET_WAZUH_STATS_WEEK, self.manager_stats_week),
+            ("GET", V4ApiPaths.GET_WAZUH_DAEMON_STATS, self.daemon_stats),
+            ("GET", V4ApiPaths.LIST_CDB_LISTS, self.list_lists),
+            ("GET", V4ApiPaths.GET_CDB_LIST_FILE, self.get_list_file),
+            ("PUT", V4ApiPaths.UPDATE_CDB_LIST_FILE, self.put_list_file),
+            ("DELETE", V4ApiPaths.DELETE_CDB_LIST_FILE, self.delete_list_file),
+        ):
+            pattern = re.sub(r"\{(\w+)\}", r"(?P<\1>[^/]+)", path.value)
+            self._routes.append((method, re.compile(f"^{pattern}$"), handler))
+
+    @property
+    def url(self) -> str:
+        scheme = "https" if self.config.certfile else "http"
+        return f"{scheme}://{self.config.host}:{self.config.port}"
+
+    async def start(self) -> None:
+        ssl_context = None
+        if self.config.certfile:
+            ssl_context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+            ssl_context.load_cert_chain(self.config.certfile, self.config.keyfile)
+        self._server = await asyncio.start_server(
+            self._serve, self.config.host, self.config.port, ssl=ssl_context, backlog=4096
+        )
+        if not self.config.port:
+            self.config.port = self._server.sockets[0].getsockname()[1]
+        if self.config.churn:
+            self._background.append(asyncio.ensure_future(self._churn()))
+
+    async def stop(self) -> None:
+        for task in self._background:
+            task.cancel()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def __aenter__(self) -> "Simulator":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.stop()
+
+    async def _churn(self) -> None:
+        carry = 0.0
+        while True:
+            await asyncio.sleep(1.0)
+            carry += self.config.churn
+            if carry >= 1:
+                self.fleet.churn(int(carry))
+                carry -= int(carry)
+
+    # HTTP
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                request_line, *header_lines = head.decode("latin-1").split("\r\n")
+                method, target, _ = request_line.split(" ", 2)
+                headers = {}
+                for line in header_lines:
+                    name, _, value = line.partition(":")
+                    if value:
+                        headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length") or 0)
+                body = await reader.readexactly(length) if length else b""
+
+                response = await self.handle(method, target, headers, body)
+                if response is None:
+                    break
+                status, payload = response
+                writer.write(
+                    (
+                        f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+                        "Content-Type: application/json\r\n"
+                        f"Content-Length: {len(payload)}\r\n"
+                        + ("Retry-After: 1\r\n" if status == 429 else "")
+                        + "\r\n"
+                    ).encode()
+                    + payload
+                )
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def _rate_limited(self) -> bool:
+        if not self.config.rate_limit:
+            return False
+        now = time.monotonic()
+        self._tokens = min(
+            self.config.rate_burst, self._tokens + (now - self._updated) * self.config.rate_limit
+        )
+        self._updated = now
+        if self._tokens < 1:
+            return True
+        self._tokens -= 1
+        return False
+
+    def _authorized(self, headers: dict[str, str]) -> bool:
+        scheme, _, token = headers.get("authorization", "").partition(" ")
+        if scheme.lower() != "bearer":
+            return False
+        exp = self._issued.get(token)
+        return exp is not None and exp > time.time()
+
+    async def handle(
+        self, method: str, target: str, headers: dict[str, str], body: bytes
+    ) -> Optional[tuple[int, bytes]]:
+        """
+        Answer a request, None when the request is left without response.
+        """
+        self.stats.requests += 1
+        config = self.config
+        url = urlsplit(target)
+        params = dict(parse_qsl(url.query, keep_blank_values=True))
+
+        for route_method, pattern, handler in self._routes:
+            match = pattern.match(url.path)
+            if match and route_method == method:
+                break
+        else:
+            status, data = _problem(404, f"{method} {url.path} is not simulated")
+            return self._respond(status, data)
+
+        if self._rate_limited():
+            return self._respond(*_problem(429, "Maximum number of requests per minute reached"))
+        if handler != self.authenticate and not self._authorized(headers):
+            return self._respond(*_problem(401, "Invalid token"))
+        if config.timeout_rate and self.random.random() < config.timeout_rate:
+            self.stats.hung += 1
+            await asyncio.sleep(config.hang)
+            return None
+        if config.error_rate and self.random.random() < config.error_rate:
+            return self._respond(*_problem(self.random.choice((500, 502, 503)), "Injected error"))
+
+        path_params = {k: unquote(v) for k, v in match.groupdict().items()}
+        key = (method, target, self.fleet.version)
+        cached = self._cache.get(key) if method == "GET" else None
+        if cached is None:
+            status, data = await handler({**params, **path_params}, headers, body)
+            payload = json.dumps(data, separators=(",", ":")).encode()
+            items = len(data.get("data", {}).get("affected_items", ()))
+            cached = (status, payload, items)
+            if method == "GET" and status == 200:
+                if len(self._cache) > 1000:
+                    self._cache.clear()
+                self._cache[key] = cached
+        status, payload, items = cached
+
+        if config.latency_median or config.latency_per_item:
+            delay = items * config.latency_per_item
+            if config.latency_median:
+                jitter = self.random.lognormvariate(0, config.latency_sigma)
+                delay += jitter * config.latency_median
+            await asyncio.sleep(delay)
+        self.stats.statuses[status] += 1
+        return status, payload
+
+    def _respond(self, status: int, data: Any) -> tuple[int, bytes]:
+        self.stats.statuses[status] += 1
+        return status, json.dumps(data, separators=(",", ":")).encode()
+
+    # Routes
+
+    async def authenticate(self, params, headers, body) -> tuple[int, Any]:
+        scheme, _, credentials = headers.get("authorization", "").partition(" ")
+        if scheme.lower() != "basic":
+            return _problem(401, "Invalid credentials")
+        username, _, password = base64.b64decode(credentials).decode().partition(":")
+        config = self.config
+        if (config.username and username != config.username) or (
+            config.password and password != config.password
+        ):
+            return _problem(401, "Invalid credentials")
+        now = int(time.time())
+        claims = {
+            "iss": "wazuh-simulator",
+            "sub": username,
+            "nbf": now,
+            "exp": now + int(config.token_ttl),
+            "run_as": False,
+            "rbac_roles": [1],
+            "rbac_mode": "white",
+        }
+        header = _b64(json.dumps({"alg": "none", "typ": "JWT"}).encode())
+        token = f"{header}.{_b64(json.dumps(claims).encode())}.{_b64(os.urandom(16))}"
+        self._issued = {t: exp for t, exp in self._issued.items() if exp > now}
+        self._issued[token] = claims["exp"]
+        return 200, {"data": {"token": token}, "error": 0}
+
+    def _agents(self, params: dict[str, str]) -> List[dict[str, Any]]:
+        agents = self.fleet.agents
+        if params.get("agent_id"):
+            agents = [a for a in agents if a["id"] == params["agent_id"]]
+        if params.get("group_id"):
+            agents = [a for a in agents if params["group_id"] in a.get("group", ())]
+        if params.get("node_id"):
+            agents = [a for a in agents if a.get("node_name") == params["node_id"]]
+        if params.get("agents_list"):
+            ids = params["agents_list"].split(",")
+            agents = [self.fleet.by_id[i] for i in ids if i in self.fleet.by_id]
+        return agents
+
+    async def list_agents(self, params, headers, body) -> tuple[int, Any]:
+        if int(params.get("limit") or 500) > MAX_LIMIT:
+            return _problem(400, f"Invalid limit, the maximum is {MAX_LIMIT}")
+        agents = self._agents(params)
+        page, total = listing(
+            agents,
+            params,
+            AGENT_FILTERS,
+        )
+        return 200, _data(page, total, message="All selected agents information was returned")
+
+    async def distinct_agents(self, params, headers, body) -> tuple[int, Any]:
+        if not params.get("fields"):
+            return _problem(400, "Missing parameter fields")
+        fields = params["fields"].split(",")
+        agents = self._agents(params)
+        everything = {"offset": "0", "limit": str(max(len(agents), 1))}
+        matched, _ = listing(
+            agents,
+            {k: v for k, v in params.items() if k in ("q", "search", *AGENT_FILTERS)} | everything,
+            AGENT_FILTERS,
+        )
+        counts = Counter(
+            tuple(flatten_dict(agent).get(name) for name in fields) for agent in matched
+        )
+        items = []
+        for values, count in counts.items():
+            item: dict[str, Any] = {}
+            for name, value in zip(fields, values):
+                if value is None:
+                    continue
+                head, _, rest = name.partition(".")
+                if rest:
+                    item.setdefault(head, {})[rest] = value
+                else:
+                    item[head] = value
+            item["count"] = count
+            items.append(item)
+        paging = {k: v for k, v in params.items() if k in ("offset", "limit", "sort")}
+        page, total = listing(items, paging)
+        return 200, _data(page, total)
+
+    async def summary_status(self, params, headers, body) -> tuple[int, Any]:
+        connection = Counter(agent["status"] for agent in self.fleet.agents)
+        configuration = Counter(
+            agent.get("group_config_status", "not_synced") for agent in self.fleet.agents
+        )
+        total = len(self.fleet.agents)
+        if self.config.flat_summary:
+            counters = {status: connection.get(status, 0) for status, _ in STATUSES}
+            return 200, {
+                "data": {**counters, "total": total},
+                "message": "Showing the status of all the selected agents",
+                "error": 0,
+            }
+        return 200, {
+            "data": {
+                "connection": {
+                    **{status: connection.get(status, 0) for status, _ in STATUSES},
+                    "total": total,
+                },
+                "configuration": {
+                    "synced": configuration.get("synced", 0),
+                    "not_synced": configuration.get("not_synced", 0),
+                    "total": total,
+                },
+            },
+            "message": "Showing the status of all the selected agents",
+            "error": 0,
+        }
+
+    async def summary_os(self, params, headers, body) -> tuple[int, Any]:
+        platforms = sorted({a["os"]["platform"] for a in self.fleet.agents if "os" in a})
+        return 200, _data(platforms)
+
+    async def restart_agents(self, params, headers, body) -> tuple[int, Any]:
+        affected, inactive, missing = [], [], []
+        ids = params.get("agents_list", "").split(",") if params.get("agents_list") else []
+        agents = self._agents(params)
+        missing = [i for i in ids if i not in self.fleet.by_id]
+        loop = asyncio.get_running_loop()
+        for agent in agents:
+            if agent["id"] == "000" or agent["status"] != "active":
+                inactive.append(agent["id"])
+                continue
+            affected.append(agent["id"])
+            delay = self.config.restart_delay * self.random.uniform(0.5, 1.5)
+            failed = self.random.random() < self.config.restart_failure_rate
+            loop.call_later(delay, self._restarted, agent, failed)
+        failed_items = _failed(1707, "Cannot send request, agent is not active", inactive)
+        failed_items += _failed(1701, "Agent does not exist", missing)
+        return 200, _data(affected, failed_items=failed_items, message="Restart command was sent")
+
+    def _restarted(self, agent: dict[str, Any], failed: bool) -> None:
+        if failed:
+            agent["status"] = "disconnected"
+        else:
+            # Keep alives have a one second resolution, a restart always moves it forward.
+            keep_alive = datetime.fromisoformat(agent["lastKeepAlive"]) + timedelta(seconds=1)
+            now = datetime.now(timezone.utc)
+            agent["lastKeepAlive"] = max(now, keep_alive).strftime("%Y-%m-%dT%H:%M:%S+00:00")
+            # The agent disconnected while restarting.
+            agent["disconnection_time"] = now.strftime("%Y-%m-%dT%H:%M:%S+00:00")
+        self.fleet.log("info", "wazuh-remoted", f"Agent '{agent['id']}' restarted.")
+        self.fleet.changed()
+
+    def _membership(self, params: dict[str, str], add: bool) -> tuple[int, Any]:
+        group = params.get("group_id")
+        if not group:
+            return _problem(400, "Missing parameter group_id")
+        affected, missing = [], []
+        for agent_id in params.get("agents_list", "").split(","):
+            agent = self.fleet.by_id.get(agent_id)
+            if agent is None or agent_id == "000":
+                missing.append(agent_id)
+                continue
+            groups = agent.setdefault("group", [])
+            if add and group not in groups:
+                groups.append(group)
+            elif not add and group in groups:
+                groups.remove(group)
+                if not groups:
+                    groups.append("default")
+            affected.append(agent_id)
+        self.fleet.changed()
+        return 200, _data(affected, failed_items=_failed(1701, "Agent does not exist", missing))
+
+    async def assign_group(self, params, headers, body) -> tuple[int, Any]:
+        return self._membership(params, add=True)
+
+    async def remove_group(self, params, headers, body) -> tuple[int, Any]:
+        return self._membership(params, add=False)
+
+    async def upgrade_agents(self, params, headers, body) -> tuple[int, Any]:
+        affected, inactive = [], []
+        loop = asyncio.get_running_loop()
+        version = params.get("upgrade_version") or MANAGER_VERSION.lstrip("v")
+        for agent in self._agents(params):
+            if agent["id"] == "000" or agent["status"] != "active":
+                inactive.append(agent["id"])
+                continue
+            task_id = self._next_task_id
+            self._next_task_id += 1
+            now = _now()
+            self.fleet.tasks[task_id] = {
+                "task_id": task_id,
+                "agent": agent["id"],
+                "node": agent.get("node_name"),
+                "module": "upgrade_module",
+                "command": "upgrade",
+                "status": "In progress",
+                "error_message": None,
+                "create_time": now,
+                "last_update_time": now,
+            }
+            affected.append({"agent": agent["id"], "task_id": task_id})
+            loop.call_later(
+                self.config.upgrade_delay * self.random.uniform(0.5, 1.5),
+                self._upgraded,
+                task_id,
+                f"Wazuh v{version}",
+            )
+        failed_items = _failed(1707, "Cannot send request, agent is not active", inactive)
+        return 200, _data(affected, failed_items=failed_items)
+
+    def _upgraded(self, task_id: int, version: str) -> None:
+        task = self.fleet.tasks[task_id]
+        task.update(status="Done", last_update_time=_now())
+        self.fleet.by_id[task["agent"]]["version"] = version
+        self.fleet.changed()
+
+    async def tasks_status(self, params, headers, body) -> tuple[int, Any]:
+        tasks = list(self.fleet.tasks.values())
+        if params.get("tasks_list"):
+            ids = {int(i) for i in params["tasks_list"].split(",")}
+            tasks = [t for t in tasks if t["task_id"] in ids]
+        page, total = listing(tasks, params, ("status", "command", "module"))
+        return 200, _data(page, total)
+
+    async def run_scan(self, params, headers, body) -> tuple[int, Any]:
+        agents = self._agents(params)
+        active = [a["id"] for a in agents if a["status"] == "active"]
+        inactive = [a["id"] for a in agents if a["status"] != "active"]
+        failed_items = _failed(1601, "Impossible to run FIM scan, agent is not active", inactive)
+        return 200, _data(active, failed_items=failed_items)
+
+    async def scan_results(self, params, headers, body) -> tuple[int, Any]:
+        if params["agent_id"] not in self.fleet.by_id:
+            failed_items = _failed(1701, "Agent does not exist", [params["agent_id"]])
+            return 200, _data([], failed_items=failed_items)
+        findings = self.fleet.fim(params["agent_id"])
+        page, total = listing(findings, params, ("file", "type", "md5", "sha1", "sha256"))
+        return 200, _data(page, total)
+
+    async def clear_scan_results(self, params, headers, body) -> tuple[int, Any]:
+        return 200, _data([params["agent_id"]])
+
+    async def last_scan(self, params, headers, body) -> tuple[int, Any]:
+        return 200, _data([{"start": "2024-01-02T00:00:00Z", "end": "2024-01-02T00:05:00Z"}])
+
+    async def manager_status(self, params, headers, body) -> tuple[int, Any]:
+        daemons = ("wazuh-analysisd", "wazuh-remoted", "wazuh-db", "wazuh-modulesd", "wazuh-apid")
+        return 200, _data([{daemon: "running" for daemon in daemons}])
+
+    async def manager_information(self, params, headers, body) -> tuple[int, Any]:
+        return 200, _data(
+            [
+                {
+                    "version": MANAGER_VERSION,
+                    "type": "server",
+                    "max_agents": "unlimited",
+                    "path": "/var/ossec",
+                }
+            ]
+        )
+
+    async def manager_logs(self, params, headers, body) -> tuple[int, Any]:
+        page, total = listing(self.fleet.logs, params, ("tag", "level"))
+        return 200, _data(page, total)
+
+    def _stats_random(self, *key: Any) -> random.Random:
+        # The same statistics are returned for the same date, on every call.
+        return random.Random(f"{self.config.seed}|{'|'.join(map(str, key))}")
+
+    async def manager_stats(self, params, headers, body) -> tuple[int, Any]:
+        date = params.get("date") or datetime.now(timezone.utc).strftime("%Y-%m-%d")
+        rnd = self._stats_random("stats", date)
+        items = []
+        for hour in range(24):
+            alerts = [
+                {"sigid": sigid, "level": rnd.randint(0, 12), "times": rnd.randint(1, 50)}
+                for sigid in rnd.sample((502, 503, 5715, 5501, 550, 554), 3)
+            ]
+            items.append(
+                {
+                    "hour": hour,
+                    "alerts": alerts,
+                    "totalAlerts": sum(alert["times"] for alert in alerts),
+                    "events": rnd.randint(1000, 50000),
+                    "syscheck": rnd.randint(0, 500),
+                    "firewall": 0,
+                }
+            )
+        return 200, _data(items)
+
+    async def manager_stats_hour(self, params, headers, body) -> tuple[int, Any]:
+        rnd = self._stats_random("hour")
+        averages = [rnd.randint(0, 2000) for _ in range(24)]
+        return 200, _data([{"averages": averages, "interactions": 0}])
+
+    async def manager_stats_week(self, params, headers, body) -> tuple[int, Any]:
+        rnd = self._stats_random("week")
+        week = {
+            day: {"hours": [rnd.randint(0, 2000) for _ in range(24)], "interactions": 0}
+            for day in WEEK_DAYS
+        }
+        return 200, _data([week])
+
+    async def daemon_stats(self, params, headers, body) -> tuple[int, Any]:
+        daemons = params["daemons_list"].split(",") if params.get("daemons_list") else DAEMONS
+        now = datetime.now(timezone.utc)
+        requests = self.stats.requests
+        items = [
+            {
+                "name": daemon,
+                "timestamp": now.strftime("%Y-%m-%dT%H:%M:%S+00:00"),
+                "uptime": (now - timedelta(days=3)).strftime("%Y-%m-%dT%H:%M:%S+00:00"),
+                "metrics": {
+                    "bytes": {"received": requests * 512, "sent": requests * 128},
+                    "messages": {"received": requests * 4, "sent": requests},
+                    "queues": {"usage": round(self.random.random(), 3)},
+                },
+            }
+            for daemon in daemons
+            if daemon in DAEMONS
+        ]
+        return 200, _data(items)
+
+    def _list_item(self, filename: str) -> dict[str, Any]:
+        return {
+            "items": [{"key": key, "value": value} for key, value in self.fleet.lists[filename]],
+            "filename": filename,
+            "relative_dirname": "etc/lists",
+        }
+
+    async def list_lists(self, params, headers, body) -> tuple[int, Any]:
+        items = [self._list_item(filename) for filename in sorted(self.fleet.lists)]
+        page, total = listing(items, params, ("filename", "relative_dirname"))
+        return 200, _data(page, total)
+
+    async def get_list_file(self, params, headers, body) -> tuple[int, Any]:
+        if params["filename"] not in self.fleet.lists:
+            return _problem(404, "CDB list file does not exist")
+        return 200, _data(self._list_item(params["filename"])["items"])
+
+    async def put_list_file(self, params, headers, body) -> tuple[int, Any]:
+        filename = params["filename"]
+        if filename in self.fleet.lists and params.get("overwrite") != "true":
+            return _problem(400, "CDB list file already exists, use overwrite")
+        entries = []
+        for line in body.decode("utf-8", errors="replace").splitlines():
+            if not line:
+                continue
+            if line.startswith('"') and '":' in line:
+                key, _, value = line[1:].partition('":')
+            else:
+                key, _, value = line.partition(":")
+            entries.append((key, value))
+        self.fleet.lists[filename] = entries
+        self.fleet.changed()
+        return 200, _data([f"etc/lists/{filename}"], message="CDB list file uploaded")
+
+    async def delete_list_file(self, params, headers, body) -> tuple[int, Any]:
+        if self.fleet.lists.pop(params["filename"], None) is None:
+            return _problem(404, "CDB list file does not exist")
+        self.fleet.changed()
+        return 200, _data([f"etc/lists/{params['filename']}"])
+
+
+def build_parser() -> argparse.ArgumentParser:
+    defaults = SimulatorConfig()
+    parser = argparse.ArgumentParser(
+        prog="python -m wazuh_api_client.simulator", description="Simulate a Wazuh manager."
+    )
+    for name, value in vars(defaults).items():
+        option = "--" + name.replace("_", "-")
+        kind = type(value) if value is not None else str
+        parser.add_argument(option, type=kind, default=value, help=f"(default: {value})")
+    parser.add_argument(
+        "--report",
+        type=float,
+        default=10.0,
+        help="seconds between statistics reports, 0 disables them",
+    )
+    return parser
+
+
+async def serve(config: SimulatorConfig, report: float = 10.0) -> None:
+    async with Simulator(config) as simulator:
+        print(f"Simulating {config.agents} agents on {simulator.url}", flush=True)
+        while True:
+            await asyncio.sleep(report or 3600)
+            if report:
+                print(simulator.stats.report(), flush=True)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = vars(build_parser().parse_args(argv))
+    report = args.pop("report")
+    try:
+        import uvloop  # type: ignore
+
+        uvloop.install()
+    except ImportError:
+        pass
+    try:
+        asyncio.run(serve(SimulatorConfig(**args), report))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+from dataclasses import dataclass, replace
+from typing import Any, Optional
+
+from httpx import Timeout
+
+from .constants import DEFAULT_TIMEOUT, WAIT_FOR_COMPLETE_TIMEOUT
+from .endpoints.endpoints_v4 import V4ApiPaths
+from .latency import LatencyWindow
+
+
+@dataclass(frozen=True)
+class TimeoutProfile:
+    """
+    Timeouts in seconds of a request, for each phase:
+        - connect: establishing the connection.
+        - read: waiting for each chunk of the response.
+        - write: sending each chunk of the request.
+        - pool: waiting for a free connection in the pool.
+    """
+
+    connect: float = 5.0
+    read: float = DEFAULT_TIMEOUT
+    write: float = DEFAULT_TIMEOUT
+    pool: float = 10.0
+
+    def to_httpx(self, read: Optional[float] = None) -> Timeout:
+        return Timeout(
+            connect=self.connect,
+            read=self.read if read is None else read,
+            write=self.write,
+            pool=self.pool,
+        )
+
+
+DEFAULT_TIMEOUT_PROFILE = TimeoutProfile()
+# Cheap lookups answered by the master node alone.
+FAST_TIMEOUT_PROFILE = TimeoutProfile(connect=3.0, read=5.0, write=5.0, pool=5.0)
+# Calls fanned out to every node of the cluster or running long operations.
+SLOW_TIMEOUT_PROFILE = TimeoutProfile(read=120.0)
+
+DEFAULT_TIMEOUT_PROFILES: dict[V4ApiPaths, TimeoutProfile] = {
+    V4ApiPaths.GET_KEY: FAST_TIMEOUT_PROFILE,
+    V4ApiPaths.SUMMARIZE_AGENTS_OS: FAST_TIMEOUT_PROFILE,
+    V4ApiPaths.SUMMARIZE_AGENTS_STATUS: FAST_TIMEOUT_PROFILE,
+    V4ApiPaths.GET_WAZUH_STATUS: FAST_TIMEOUT_PROFILE,
+    V4ApiPaths.GET_LAST_SCAN_DATETIME: FAST_TIMEOUT_PROFILE,
+    # Password hashing makes the authentication slow.
+    V4ApiPaths.GENERATE_TOKEN: TimeoutProfile(read=60.0),
+    V4ApiPaths.GET_ACTIVE_CONFIGURATION: SLOW_TIMEOUT_PROFILE,
+    V4ApiPaths.GET_DAEMON_STATS: SLOW_TIMEOUT_PROFILE,
+    V4ApiPaths.GET_WAZUH_DAEMON_STATS: SLOW_TIMEOUT_PROFILE,
+    V4ApiPaths.RESTART_AGENTS_IN_NODE: SLOW_TIMEOUT_PROFILE,
+}
+
+
+class AdaptiveTimeouts:
+    """
+    Derive read deadlines from the observed latency of each endpoint.
+
+    Once `min_samples` latencies were observed, the read timeout becomes the `percentile` of
+    the recent latencies times `multiplier`, kept between `min_read` and the read timeout of
+    the endpoint profile. Stuck calls to an endpoint that usually answers fast fail early
+    while slow endpoints keep the deadline they need.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 0.99,
+        multiplier: float = 3.0,
+        min_read: float = 1.0,
+        min_samples: int = 20,
+        window: int = 256,
+    ):
+        self.percentile = percentile
+        self.multiplier = multiplier
+        self.min_read = min_read
+        self.min_samples = min_samples
+        self.window = window
+        self._latencies: dict[str, LatencyWindow] = {}
+
+    def record(self, api_path: str, seconds: float) -> None:
+        latencies = self._latencies.get(api_path)
+        if latencies is None:
+            latencies = self._latencies[api_path] = LatencyWindow(self.window)
+        latencies.add(seconds)
+
+    def read_timeout(self, api_path: str, profile: TimeoutProfile) -> float:
+        latencies = self._latencies.get(api_path)
+        if latencies is None or len(latencies) < self.min_samples:
+            return profile.read
+        observed = latencies.percentile(self.percentile) or 0.0
+        return min(profile.read, max(self.min_read, observed * self.multiplier))
+
+
+def is_wait_for_complete(params: Any) -> bool:
+    if not isinstance(params, dict):
+        return False
+    return str(params.get("wait_for_complete", "")).lower() == "true"
+
+
+def resolve_profile(
+    api_path: Optional[str],
+    profiles: dict[V4ApiPaths, TimeoutProfile],
+    wait_for_complete: bool = False,
+) -> TimeoutProfile:
+    """
+    Return the profile of `api_path`, a request waiting for the whole cluster to answer
+    (`wait_for_complete`) gets at least WAIT_FOR_COMPLETE_TIMEOUT to read the response.
+    """
+    profile = DEFAULT_TIMEOUT_PROFILE
+    if api_path:
+        try:
+            profile = profiles.get(V4ApiPaths(api_path), DEFAULT_TIMEOUT_PROFILE)
+        except ValueError:
+            pass
+    if wait_for_complete and profile.read < WAIT_FOR_COMPLETE_TIMEOUT:
+        profile = replace(profile, read=WAIT_FOR_COMPLETE_TIMEOUT)
+    return profile
@@ -0,0 +1,252 @@
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import stat
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Awaitable, Callable, Optional
+
+# A token expiring within this many seconds is renewed instead of reused.
+TOKEN_REFRESH_MARGIN = 60
+
+
+def token_expiration(token: str) -> Optional[float]:
+    """
+    Return the `exp` claim of a JWT (not verified, the manager does it), None when unknown.
+    """
+    try:
+        payload = token.split(".")[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        return float(claims["exp"])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+def token_is_usable(
+    token: Optional[str], stale: Optional[str] = None, margin: float = TOKEN_REFRESH_MARGIN
+) -> bool:
+    """
+    Whether `token` can be reused: set, not the `stale` token being replaced and not about to expire.
+    """
+    if not token or token == stale:
+        return False
+    expiration = token_expiration(token)
+    return expiration is None or expiration - time.time() > margin
+
+
+def token_key(base_url: str, username: str) -> str:
+    return hashlib.sha256(f"{base_url.rstrip('/')}|{username}".encode()).hexdigest()[:32]
+
+
+class TokenLock(ABC):
+    @abstractmethod
+    def acquire(self) -> None:
+        pass
+
+    @abstractmethod
+    def release(self) -> None:
+        pass
+
+
+class TokenStore(ABC):
+    """
+    Storage shared by the clients of the same manager and user so they reuse one token,
+    `lock` serializes the renewals.
+    """
+
+    @abstractmethod
+    def load(self, key: str) -> Optional[str]:
+        pass
+
+    @abstractmethod
+    def save(self, key: str, token: str) -> None:
+        pass
+
+    @abstractmethod
+    def lock(self, key: str) -> TokenLock:
+        pass
+
+
+class _ThreadLock(TokenLock):
+    def __init__(self, lock: threading.Lock):
+        self._lock = lock
+
+    def acquire(self) -> None:
+        self._lock.acquire()
+
+    def release(self) -> None:
+        self._lock.release()
+
+
+class MemoryTokenStore(TokenStore):
+    """
+    Tokens shared by the clients of one process.
+    """
+
+    def __init__(self):
+        self._tokens: dict[str, str] = {}
+        self._locks: dict[str, threading.Lock] = {}
+        self._guard = threading.Lock()
+
+    def load(self, key: str) -> Optional[str]:
+        return self._tokens.get(key)
+
+    def save(self, key: str, token: str) -> None:
+        self._tokens[key] = token
+
+    def lock(self, key: str) -> TokenLock:
+        with self._guard:
+            return _ThreadLock(self._locks.setdefault(key, threading.Lock()))
+
+
+class _FileLock(TokenLock):
+    def __init__(self, path: Path):
+        self.path = path
+        self._fd: Optional[int] = None
+
+    def acquire(self) -> None:
+        import fcntl
+
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT | getattr(os, "O_NOFOLLOW", 0), 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        except BaseException:
+            os.close(fd)
+            raise
+        self._fd = fd
+
+    def release(self) -> None:
+        import fcntl
+
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+
+
+class FileTokenStore(TokenStore):
+    """
+    Tokens shared by the processes of a host through files of `directory`, renewals are
+    serialized with `flock` (POSIX only). The files are only readable by their owner, and
+    `directory` must belong to the current user with no access for anyone else (PermissionError
+    otherwise), so other local users can neither read nor plant tokens.
+
+    Use a tmpfs directory such as /dev/shm/wazuh-tokens to keep the tokens in shared memory
+    and off the disk.
+
+    Examples:
+        store = FileTokenStore()
+        async with AsyncWazuhClient(..., token_store=store) as client:
+            ...
+    """
+
+    def __init__(self, directory: Optional[str | Path] = None):
+        if directory is None:
+            uid = os.getuid() if hasattr(os, "getuid") else "user"
+            directory = Path(tempfile.gettempdir()) / f"wazuh-api-client-{uid}"
+        self.directory = Path(directory)
+        self.directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+        self._check_directory()
+
+    def _check_directory(self) -> None:
+        if not hasattr(os, "getuid"):
+            return
+        st = os.lstat(self.directory)
+        if not stat.S_ISDIR(st.st_mode):
+            raise PermissionError(f"Token directory {self.directory} is not a directory")
+        if st.st_uid != os.getuid():
+            raise PermissionError(f"Token directory {self.directory} belongs to another user")
+        if st.st_mode & 0o077:
+            raise PermissionError(
+                f"Token directory {self.directory} is accessible to other users "
+                f"(mode {stat.S_IMODE(st.st_mode):o}, expected 700)"
+            )
+
+    def load(self, key: str) -> Optional[str]:
+        try:
+            return (self.directory / f"{key}.token").read_text().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def save(self, key: str, token: str) -> None:
+        path = self.directory / f"{key}.token"
+        fd, tmp = tempfile.mkstemp(prefix=f".{key}.", suffix=".tmp", dir=self.directory)
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(token)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def lock(self, key: str) -> TokenLock:
+        return _FileLock(self.directory / f"{key}.lock")
+
+
+def shared_token(
+    store: TokenStore, key: str, generate: Callable[[], str], stale: Optional[str] = None
+) -> str:
+    """
+    Return the token of `store` if usable, otherwise generate and store a new one. Only one
+    of the callers waiting on the lock generates it, the others reuse it.
+    """
+    token = store.load(key)
+    if token_is_usable(token, stale):
+        return token  # type: ignore[return-value]
+    lock = store.lock(key)
+    lock.acquire()
+    try:
+        token = store.load(key)
+        if not token_is_usable(token, stale):
+            token = generate()
+            store.save(key, token)
+        return token  # type: ignore[return-value]
+    finally:
+        lock.release()
+
+
+async def _acquire_in_thread(lock: TokenLock) -> None:
+    """
+    Wait for `lock` in a thread. When the waiter is cancelled, the thread keeps waiting and
+    the lock is released as soon as it gets it, instead of being held forever.
+    """
+    acquiring = asyncio.ensure_future(asyncio.to_thread(lock.acquire))
+
+    def release_unused(future: asyncio.Future) -> None:
+        if not future.cancelled() and future.exception() is None:
+            lock.release()
+
+    try:
+        await asyncio.shield(acquiring)
+    except asyncio.CancelledError:
+        acquiring.add_done_callback(release_unused)
+        raise
+
+
+async def async_shared_token(
+    store: TokenStore,
+    key: str,
+    generate: Callable[[], Awaitable[str]],
+    stale: Optional[str] = None,
+) -> str:
+    """
+    `shared_token` for async clients, the lock is waited for in a thread.
+    """
+    token = store.load(key)
+    if token_is_usable(token, stale):
+        return token  # type: ignore[return-value]
+    lock = store.lock(key)
+    await _acquire_in_thread(lock)
+    try:
+        token = store.load(key)
+        if not token_is_usable(token, stale):
+            token = await generate()
+            store.save(key, token)
+        return token  # type: ignore[return-value]
+    finally:
+        lock.release()
@@ -0,0 +1,225 @@
+import asyncio
+import time
+from collections import Counter, defaultdict, deque
+from dataclasses import dataclass
+from typing import AsyncIterator, List, Optional
+
+from .enums import TaskStatus
+from .interfaces import AsyncClientInterface
+from .managers.agents import (
+    AgentsManager,
+    ListAgentsQueryParams,
+    UpgradeAgentsCustomQueryParams,
+    UpgradeAgentsQueryParams,
+)
+from .managers.tasks import TasksManager
+from .pagination import paginate
+from .utils import chunks
+
+FINAL_TASK_STATUSES = {
+    TaskStatus.DONE.value,
+    TaskStatus.FAILED.value,
+    TaskStatus.TIMEOUT.value,
+    TaskStatus.CANCELLED.value,
+    TaskStatus.LEGACY.value,
+}
+
+
+@dataclass
+class UpgradeOutcome:
+    """
+    Final state of the upgrade of one agent, `status` is a TaskStatus value.
+    `task_id` is None when the upgrade could not be submitted.
+    """
+
+    agent_id: str
+    node: Optional[str]
+    task_id: Optional[int]
+    status: str
+    error: Optional[str] = None
+
+
+class UpgradeRunner:
+    """
+    Upgrade agents in waves, tracking the upgrade tasks with batched `/tasks/status` queries.
+
+    Agents are grouped by cluster node, at most `max_per_node` upgrades run at once on a node and
+    each submission holds at most `wave_size` agents. Every `poll_interval` seconds the status of
+    all the running tasks is fetched in batches of `status_batch` task ids, finished tasks free
+    their slot for the next agents of their node.
+
+    Outcomes are yielded as soon as each agent upgrade finishes. Tasks still running after
+    `task_timeout` seconds are reported with the Timeout status.
+
+    Examples:
+        runner = UpgradeRunner(client, wave_size=50, max_per_node=100)
+        async for outcome in runner.run(agent_ids, upgrade_version="4.7.2"):
+            print(outcome.agent_id, outcome.status)
+    """
+
+    def __init__(
+        self,
+        client: AsyncClientInterface,
+        wave_size: int = 100,
+        max_per_node: int = 100,
+        poll_interval: float = 10.0,
+        task_timeout: float = 1800.0,
+        status_batch: int = 500,
+    ):
+        for name, value in (
+            ("wave_size", wave_size),
+            ("max_per_node", max_per_node),
+            ("status_batch", status_batch),
+        ):
+            if value <= 0:
+                raise ValueError(f"`{name}` must be a positive integer")
+        self.agents_manager = AgentsManager(client)
+        self.tasks_manager = TasksManager(client)
+        self.wave_size = wave_size
+        self.max_per_node = max_per_node
+        self.poll_interval = poll_interval
+        self.task_timeout = task_timeout
+        self.status_batch = status_batch
+
+    async def run(
+        self,
+        agents_list: List[str],
+        upgrade_params: Optional[
+            UpgradeAgentsQueryParams | UpgradeAgentsCustomQueryParams
+        ] = None,
+        **kwargs,
+    ) -> AsyncIterator[UpgradeOutcome]:
+        """
+        Upgrade `agents_list`, with `upgrade_params` (or keyword arguments) as the parameters of
+        each upgrade call. An UpgradeAgentsCustomQueryParams switches to custom WPK upgrades.
+        """
+        if upgrade_params is None:
+            upgrade_params = UpgradeAgentsQueryParams(**kwargs)
+
+        agents_list = list(dict.fromkeys(agents_list))
+        nodes = await self._agents_nodes(agents_list)
+        pending: dict[Optional[str], deque[str]] = defaultdict(deque)
+        for agent_id in agents_list:
+            pending[nodes.get(agent_id)].append(agent_id)
+
+        running: dict[int, tuple[str, Optional[str], float]] = {}
+
+        while pending or running:
+            # Counted from the registered tasks, so it never drifts from what is running.
+            running_per_node = Counter(node for _, node, _ in running.values())
+            for node in list(pending):
+                queue = pending[node]
+                free = self.max_per_node - running_per_node[node]
+                batch = [queue.popleft() for _ in range(min(free, len(queue)))]
+                if not queue:
+                    del pending[node]
+                for wave in chunks(batch, self.wave_size):
+                    failed = await self._submit(wave, node, upgrade_params, running)
+                    for outcome in failed:
+                        yield outcome
+
+            if not running:
+                continue
+            await asyncio.sleep(self.poll_interval)
+
+            for outcome in await self._poll(running):
+                yield outcome
+
+    async def _agents_nodes(self, agents_list: List[str]) -> dict[str, Optional[str]]:
+        nodes: dict[str, Optional[str]] = {}
+        for chunk in chunks(agents_list, self.status_batch):
+            params = ListAgentsQueryParams(
+                agents_list=chunk,
+                select=["node_name"],
+                group_config_status=None,
+                limit=len(chunk),
+            )
+            async for page in paginate(self.agents_manager.list, params):
+                for item in page.data["affected_items"]:
+                    nodes[item["id"]] = item.get("node_name")
+        return nodes
+
+    async def _submit(
+        self,
+        wave: List[str],
+        node: Optional[str],
+        upgrade_params: UpgradeAgentsQueryParams | UpgradeAgentsCustomQueryParams,
+        running: dict[int, tuple[str, Optional[str], float]],
+    ) -> List[UpgradeOutcome]:
+        """
+        Submit the upgrade of `wave`, register its tasks in `running` and return the agents that failed.
+        """
+        try:
+            if isinstance(upgrade_params, UpgradeAgentsCustomQueryParams):
+                response = await self.agents_manager.upgrade_agents_custom(
+                    wave,
+                    upgrade_params.file_path,
+                    upgrade_agents_custom_params=upgrade_params,
+                )
+            else:
+                response = await self.agents_manager.upgrade_agents(
+                    wave, upgrade_agents_params=upgrade_params
+                )
+        except Exception as e:
+            return [
+                UpgradeOutcome(
+                    agent_id, node, None, TaskStatus.FAILED.value, str(e) or repr(e)
+                )
+                for agent_id in wave
+            ]
+
+        started = time.monotonic()
+        handled: set[str] = set()
+        for item in response.data["affected_items"]:
+            running[item["task_id"]] = (str(item["agent"]), node, started)
+            handled.add(str(item["agent"]))
+        failed: List[UpgradeOutcome] = []
+        for failed_item in response.data.get("failed_items", []):
+            error = failed_item.get("error", {}).get("message")
+            for agent_id in failed_item.get("id", []):
+                handled.add(str(agent_id))
+                failed.append(
+                    UpgradeOutcome(str(agent_id), node, None, TaskStatus.FAILED.value, error)
+                )
+        failed.extend(
+            UpgradeOutcome(
+                agent_id, node, None, TaskStatus.FAILED.value, "No upgrade task was created"
+            )
+            for agent_id in wave
+            if agent_id not in handled
+        )
+        return failed
+
+    async def _poll(
+        self, running: dict[int, tuple[str, Optional[str], float]]
+    ) -> List[UpgradeOutcome]:
+        outcomes: List[UpgradeOutcome] = []
+        for chunk in chunks(list(running), self.status_batch):
+            response = await self.tasks_manager.get_status(
+                tasks_list=chunk, limit=len(chunk)
+            )
+            for item in response.data["affected_items"]:
+                task_id = item["task_id"]
+                if task_id not in running or item["status"] not in FINAL_TASK_STATUSES:
+                    continue
+                agent_id, node, _ = running.pop(task_id)
+                outcomes.append(
+                    UpgradeOutcome(
+                        agent_id, node, task_id, item["status"], item.get("error_message")
+                    )
+                )
+
+        now = time.monotonic()
+        for task_id, (agent_id, node, started) in list(running.items()):
+            if now - started > self.task_timeout:
+                del running[task_id]
+                outcomes.append(
+                    UpgradeOutcome(
+                        agent_id,
+                        node,
+                        task_id,
+                        TaskStatus.TIMEOUT.value,
+                        "No final status reported by the manager in time.",
+                    )
+                )
+        return outcomes
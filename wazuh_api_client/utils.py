@@ -1,3 +1,9 @@
+import asyncio
+import math
+import time
+from array import array
+from typing import Any, Iterable, List, Sequence, TypeVar
+
 from .endpoints.endpoints_v4 import V4ApiPaths
 
 def get_api_paths(version: str):
@@ -8,3 +14,88 @@ def get_api_paths(version: str):
         return V4ApiPaths.__dict__
     else:
         raise ValueError(f"Unsupported Wazuh version: {version}")
+
+
+T = TypeVar("T")
+
+
+def chunks(items: Sequence[T], size: int) -> List[List[T]]:
+    """
+    Split `items` into lists of at most `size` elements.
+    """
+    return [list(items[i : i + size]) for i in range(0, len(items), size)]
+
+
+def flatten_dict(item: dict[str, Any], prefix: str = "") -> dict[str, Any]:
+    """
+    Flatten nested dictionaries into a single level dictionary using dot notation keys,
+    e.g. {"bytes": {"sent": 1}} becomes {"bytes.sent": 1}.
+    """
+    res: dict[str, Any] = {}
+    for key, value in item.items():
+        name = f"{prefix}.{key}" if prefix else str(key)
+        if isinstance(value, dict):
+            res.update(flatten_dict(value, name))
+        else:
+            res[name] = value
+    return res
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def to_columns(rows: Iterable[dict[str, Any]]) -> dict[str, Any]:
+    """
+    Pivot flat rows into a column-oriented dictionary, one sequence per key.
+
+    Numeric columns are stored as `array("d")` (missing values become NaN), so they can be
+    handed to numpy/pandas without copying. Any other column is kept as a list.
+    """
+    rows = list(rows)
+    keys: dict[str, None] = {}
+    for row in rows:
+        keys.update(dict.fromkeys(row))
+
+    columns: dict[str, Any] = {}
+    for key in keys:
+        values = [row.get(key) for row in rows]
+        present = [v for v in values if v is not None]
+        if present and all(_is_number(v) for v in present):
+            columns[key] = array(
+                "d", (math.nan if v is None else float(v) for v in values)
+            )
+        else:
+            columns[key] = values
+    return columns
+
+
+class RateLimiter:
+    """
+    Token bucket limiting operations to `rate` per second, allowing bursts of up to `burst` operations.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        if rate <= 0:
+            raise ValueError("rate must be > 0")
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """
+        Wait until an operation is allowed.
+        """
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.burst, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
@@ -0,0 +1,156 @@
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Callable, List, Optional
+
+from .enums import AgentStatus
+from .interfaces import AsyncClientInterface
+from .managers.agents import AgentsManager, ListAgentsQueryParams
+from .pagination import paginate
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class WatchResult:
+    """
+    Outcome of one poll: `disconnected` and `reconnected` are the agents (as selected) that
+    flipped since the previous drill down, `requests` the API calls the poll made.
+    """
+
+    counts: dict[str, int]
+    drilled_down: bool
+    disconnected: List[dict[str, Any]] = field(default_factory=list)
+    reconnected: List[str] = field(default_factory=list)
+    requests: int = 1
+
+
+class DisconnectWatcher:
+    """
+    Detect agents getting disconnected by polling the connection counters of
+    `summarize_agents_status`, one small request, and only listing the disconnected agents
+    when the counters changed.
+
+    The first poll lists the disconnected agents to know the initial state, without calling
+    the callbacks. Afterwards `on_disconnect` is called with each newly disconnected agent
+    (the `select` fields) and `on_reconnect` with the id of each agent no longer disconnected,
+    callbacks may be coroutine functions.
+
+    Flips cancelling out between two polls (an agent disconnecting while another one comes back)
+    leave the counters unchanged; with `full_check_every`, every n-th poll drills down anyway.
+
+    `run()` keeps polling when a poll fails: the error is logged and the next poll waits twice
+    as long after each failure in a row, up to `max_backoff` seconds.
+
+    Examples:
+        watcher = DisconnectWatcher(client, interval=60, on_disconnect=alert)
+        task = asyncio.create_task(watcher.run())
+        ...
+        watcher.stop()
+    """
+
+    def __init__(
+        self,
+        client: AsyncClientInterface,
+        interval: float = 60.0,
+        select: Optional[List[str]] = None,
+        on_disconnect: Optional[Callable[[dict[str, Any]], Any]] = None,
+        on_reconnect: Optional[Callable[[str], Any]] = None,
+        full_check_every: int = 0,
+        page_size: int = 10000,
+        max_backoff: float = 600.0,
+    ):
+        self.agents_manager = AgentsManager(client)
+        self.interval = interval
+        self.select = select or ["id", "name", "ip", "lastKeepAlive", "node_name"]
+        if "id" not in self.select:
+            self.select = ["id", *self.select]
+        self.on_disconnect = on_disconnect
+        self.on_reconnect = on_reconnect
+        self.full_check_every = full_check_every
+        self.page_size = page_size
+        self.max_backoff = max_backoff
+        self.counts: Optional[dict[str, int]] = None
+        self.disconnected: Optional[dict[str, dict[str, Any]]] = None
+        self.polls = 0
+        self.requests = 0
+        self.errors = 0
+        self._stopped: Optional[asyncio.Event] = None
+
+    async def _list_disconnected(self) -> tuple[dict[str, dict[str, Any]], int]:
+        params = ListAgentsQueryParams(
+            select=self.select,
+            status=[AgentStatus.DISCONNECTED],
+            group_config_status=None,
+            limit=self.page_size,
+        )
+        agents: dict[str, dict[str, Any]] = {}
+        requests = 0
+        async for page in paginate(self.agents_manager.list, params):
+            requests += 1
+            for agent in page.data["affected_items"]:
+                agents[agent["id"]] = agent
+        return agents, requests
+
+    async def _notify(self, callback: Optional[Callable[[Any], Any]], value: Any) -> None:
+        if callback is None:
+            return
+        outcome = callback(value)
+        if asyncio.iscoroutine(outcome):
+            await outcome
+
+    async def poll(self) -> WatchResult:
+        response = await self.agents_manager.summarize_agents_status()
+        # 4.4+ nests the connection counters, older managers return them flat.
+        counts = response.data.get("connection", response.data)
+        self.polls += 1
+        forced = bool(self.full_check_every) and self.polls % self.full_check_every == 0
+        result = WatchResult(counts=counts, drilled_down=False)
+        if self.disconnected is not None and counts == self.counts and not forced:
+            self.requests += result.requests
+            return result
+
+        agents, requests = await self._list_disconnected()
+        result.drilled_down = True
+        result.requests += requests
+        self.requests += result.requests
+        previous, self.disconnected, self.counts = self.disconnected, agents, counts
+        if previous is None:
+            return result
+
+        result.disconnected = [agent for id_, agent in agents.items() if id_ not in previous]
+        result.reconnected = [id_ for id_ in previous if id_ not in agents]
+        for agent in result.disconnected:
+            await self._notify(self.on_disconnect, agent)
+        for agent_id in result.reconnected:
+            await self._notify(self.on_reconnect, agent_id)
+        return result
+
+    async def run(self) -> None:
+        """
+        Poll every `interval` seconds until `stop()` is called.
+        """
+        self._stopped = asyncio.Event()
+        failures = 0
+        while not self._stopped.is_set():
+            delay = self.interval
+            try:
+                await self.poll()
+                failures = 0
+            except Exception:
+                failures += 1
+                self.errors += 1
+                delay = min(self.interval * 2 ** (failures - 1), self.max_backoff)
+                logger.exception(
+                    "Disconnect watcher poll failed (%d in a row), next poll in %.0fs",
+                    failures,
+                    delay,
+                )
+            try:
+                await asyncio.wait_for(self._stopped.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+
+    def stop(self) -> None:
+        if self._stopped is not None:
+            self._stopped.set()